@@ -0,0 +1,12 @@
+//! Helpers shared by the criterion benchmarks.
+use _lasio_rs::stats::peak_rss_bytes;
+use criterion::Criterion;
+
+/// Print the peak RSS reached by the benchmarks run so far. Listed last in
+/// `criterion_group!` so the figure covers the whole run.
+pub fn report_peak_rss(_: &mut Criterion) {
+    match peak_rss_bytes() {
+        Some(bytes) => println!("peak RSS: {:.1} MiB", bytes as f64 / (1 << 20) as f64),
+        None => println!("peak RSS: not available on this platform"),
+    }
+}
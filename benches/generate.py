@@ -0,0 +1,29 @@
+"""Write a deterministic synthetic LAS file.
+
+The generator is the one used by the benchmark suites, so a file written
+here with the same options is byte-for-byte the file they measure::
+
+    python benches/generate.py big.las --rows 1000000 --curves 50 --null-density 0.05
+"""
+
+import argparse
+
+from lasio_rs._lasio_rs import write_synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="output LAS file")
+    parser.add_argument("--rows", type=int, default=100_000, help="data rows (default 100000)")
+    parser.add_argument("--curves", type=int, default=20, help="curves, depth included (default 20)")
+    parser.add_argument("--wrap", action="store_true", help="write wrapped (WRAP YES) data")
+    parser.add_argument(
+        "--null-density", type=float, default=0.01, help="fraction of NULL values (default 0.01)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="generator seed (default 0)")
+    args = parser.parse_args()
+    write_synthetic(args.path, args.rows, args.curves, args.wrap, args.null_density, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+//! Whole-file parse throughput over deterministic synthetic files.
+//!
+//! Each case is a [`SyntheticSpec`] (rows x curves, wrap mode and null
+//! density); criterion reports MB/s of LAS text, and the peak RSS of the run
+//! is printed at the end. The Python suite in `benches/python` reads files
+//! from the same generator, so both sides measure identical inputs.
+//!
+//! Run with `cargo bench --bench parse`.
+mod common;
+
+use _lasio_rs::reader::{parse_las_from_bytes, parse_las_from_reader};
+use _lasio_rs::synthetic::{synthetic_las, SyntheticSpec};
+use criterion::{black_box, criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
+use std::io::Cursor;
+
+fn cases() -> Vec<(&'static str, SyntheticSpec)> {
+    let base = SyntheticSpec::default();
+    vec![
+        ("100k_x_20", base),
+        ("20k_x_200", SyntheticSpec { rows: 20_000, curves: 200, ..base }),
+        ("100k_x_20_wrapped", SyntheticSpec { wrap: true, ..base }),
+        ("100k_x_20_nulls_25pct", SyntheticSpec { null_density: 0.25, ..base }),
+    ]
+}
+
+fn bench_parse(c: &mut Criterion) {
+    let mut group = c.benchmark_group("parse_las");
+    group.sample_size(20);
+    for (name, spec) in cases() {
+        let bytes = synthetic_las(&spec);
+        group.throughput(Throughput::Bytes(bytes.len() as u64));
+        group.bench_with_input(BenchmarkId::new("from_reader", name), &bytes, |b, bytes| {
+            b.iter(|| black_box(parse_las_from_reader(Cursor::new(bytes)).unwrap()))
+        });
+        group.bench_with_input(BenchmarkId::new("from_bytes", name), &bytes, |b, bytes| {
+            b.iter(|| black_box(parse_las_from_bytes(bytes).unwrap()))
+        });
+    }
+    group.finish();
+}
+
+criterion_group!(benches, bench_parse, common::report_peak_rss);
+criterion_main!(benches);
@@ -0,0 +1,75 @@
+"""Fixtures of the pytest-benchmark suite.
+
+Every benchmark runs once per synthetic case. The files come from the same
+deterministic generator as the criterion benchmarks (``cargo bench``), so
+both suites measure identical inputs.
+"""
+
+import sys
+
+import pytest
+
+from lasio_rs._lasio_rs import write_synthetic
+
+# Keyword arguments of ``write_synthetic`` per case; keep in sync with
+# ``cases()`` in benches/parse.rs.
+CASES = {
+    "100k_x_20": dict(rows=100_000, curves=20),
+    "20k_x_200": dict(rows=20_000, curves=200),
+    "100k_x_20_wrapped": dict(rows=100_000, curves=20, wrap=True),
+    "100k_x_20_nulls_25pct": dict(rows=100_000, curves=20, null_density=0.25),
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-scale",
+        type=float,
+        default=1.0,
+        help="multiply the rows of every synthetic file (e.g. 10 for ~50-400 MB files)",
+    )
+
+
+def peak_rss_mib():
+    """Peak resident set size of this process in MiB, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        # Windows reports the peak working set.
+        return psutil.Process().memory_info().peak_wset / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@pytest.fixture(scope="session", params=sorted(CASES))
+def las_file(request, tmp_path_factory):
+    """Path of the synthetic LAS file of one case."""
+    spec = dict(CASES[request.param])
+    scale = request.config.getoption("--bench-scale")
+    spec["rows"] = max(1, int(spec["rows"] * scale))
+    path = tmp_path_factory.mktemp("las") / f"{request.param}.las"
+    write_synthetic(str(path), **spec)
+    return path
+
+
+@pytest.fixture
+def record(benchmark):
+    """Store the throughput and peak RSS of a finished benchmark.
+
+    Call it with the number of bytes processed per round; the figures are
+    kept in ``extra_info`` and appear in ``--benchmark-json`` output.
+    """
+
+    def record(nbytes):
+        mean = benchmark.stats.stats.mean
+        benchmark.extra_info["mb_per_s"] = round(nbytes / mean / 1e6, 1)
+        rss = peak_rss_mib()
+        if rss is not None:
+            benchmark.extra_info["peak_rss_mib"] = round(rss, 1)
+
+    return record
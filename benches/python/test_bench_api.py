@@ -0,0 +1,47 @@
+"""Throughput of the Python API over synthetic LAS files.
+
+Run with::
+
+    pip install -e .[bench]
+    pytest benches/python --benchmark-only
+
+MB/s figures are bytes of LAS text per second, also for the conversions, so
+every benchmark of a case is on the same scale.
+"""
+
+import pytest
+
+import lasio_rs
+
+
+def test_read(benchmark, record, las_file):
+    benchmark(lasio_rs.read, las_file)
+    record(las_file.stat().st_size)
+
+
+def test_to_df(benchmark, record, las_file):
+    pytest.importorskip("pandas")
+    las = lasio_rs.read(las_file)
+    benchmark(las.to_df)
+    record(las_file.stat().st_size)
+
+
+def test_to_polars(benchmark, record, las_file):
+    pytest.importorskip("polars")
+    las = lasio_rs.read(las_file)
+    benchmark(las.to_polars)
+    record(las_file.stat().st_size)
+
+
+def test_to_las(benchmark, record, las_file, tmp_path):
+    las = lasio_rs.read(las_file)
+    out = tmp_path / "out.las"
+    benchmark(las.to_las, out)
+    record(out.stat().st_size)
+
+
+def test_read_lasio_reference(benchmark, record, las_file):
+    """The pure-Python lasio reader, for comparison (skipped if absent)."""
+    lasio = pytest.importorskip("lasio")
+    benchmark.pedantic(lasio.read, args=(str(las_file),), rounds=3)
+    record(las_file.stat().st_size)
@@ -0,0 +1,59 @@
+//! Values-per-second comparison of the ~ASCII tokenizers.
+//!
+//! `str_parse` is the previous per-row path (`split_whitespace` +
+//! `str::parse::<f64>` into a fresh `Vec` per row); `tokenizer` is
+//! `_lasio_rs::tokenizer` as the reader uses it (`tokens` + `parse_f64`),
+//! writing into one preallocated buffer.
+//!
+//! The data lines come from the shared synthetic generator.
+//!
+//! Run with `cargo bench --bench tokenizer`.
+mod common;
+
+use _lasio_rs::synthetic::{synthetic_las, SyntheticSpec};
+use _lasio_rs::tokenizer::{parse_f64, tokens};
+use criterion::{black_box, criterion_group, criterion_main, Criterion, Throughput};
+
+const ROWS: usize = 20_000;
+const COLS: usize = 20;
+
+fn data_lines() -> Vec<String> {
+    let text = synthetic_las(&SyntheticSpec { rows: ROWS, curves: COLS, ..Default::default() });
+    let text = String::from_utf8(text).unwrap();
+    let data = text.split_once("~A\n").unwrap().1;
+    data.lines().map(str::to_string).collect()
+}
+
+fn bench_tokenizers(c: &mut Criterion) {
+    let lines = data_lines();
+    let mut group = c.benchmark_group("ascii_values");
+    group.throughput(Throughput::Elements((ROWS * COLS) as u64));
+
+    group.bench_function("str_parse", |b| {
+        b.iter(|| {
+            let mut values: Vec<f64> = Vec::with_capacity(ROWS * COLS);
+            for line in &lines {
+                let row: Vec<f64> = line.split_whitespace().filter_map(|s| s.parse::<f64>().ok()).collect();
+                values.extend(row);
+            }
+            black_box(values)
+        })
+    });
+
+    group.bench_function("tokenizer", |b| {
+        b.iter(|| {
+            let mut values = vec![0.0; ROWS * COLS];
+            for (line, row) in lines.iter().zip(values.chunks_exact_mut(COLS)) {
+                for (slot, token) in row.iter_mut().zip(tokens(line.as_bytes())) {
+                    *slot = parse_f64(token).unwrap_or(f64::NAN);
+                }
+            }
+            black_box(values)
+        })
+    });
+
+    group.finish();
+}
+
+criterion_group!(benches, bench_tokenizers, common::report_peak_rss);
+criterion_main!(benches);
@@ -1,8 +1,25 @@
 from ._lasio_rs import read as _rust_read
-import json
+
+import asyncio
+import os
+import time
+import weakref
+
+import numpy as np
 
 try:
     from ._lasio_rs import read as _rust_read
+    from ._lasio_rs import iter_chunks as _rust_iter_chunks
+    from ._lasio_rs import read_bytes as _rust_read_bytes
+    from ._lasio_rs import read_many as _rust_read_many
+    from ._lasio_rs import clear_cache as _rust_clear_cache
+    from ._lasio_rs import spawn_read as _rust_spawn_read
+    from ._lasio_rs import read_header as _rust_read_header
+    from ._lasio_rs import scan_headers as _rust_scan_headers
+    from ._lasio_rs import validate as _rust_validate
+    from ._lasio_rs import align as _rust_align
+    from ._lasio_rs import merge as _rust_merge
+    from ._lasio_rs import CurveItem, HeaderItem, SectionItems
 except ImportError as e:
     # Esto da un error mucho más claro al usuario
     raise ImportError(
@@ -10,110 +27,97 @@ except ImportError as e:
         "Asegúrate de haber instalado el paquete correctamente para tu plataforma."
     ) from e
 
-class SectionItems:
-    def __init__(self, data_dict):
-        # Allow init from dict of HeaderItems or dict of dicts (from json)
-        self._data = {}
-        for k, v in data_dict.items():
-            if isinstance(v, dict):
-                # Check if it is a Curve dict or Header dict
-                self._data[k] = HeaderItem(v)
-            else:
-                self._data[k] = v
+class LASFile:
+    def __init__(self, rust_las):
+        self._rust = rust_las
+        # Per-phase timings, set by read(..., stats=True).
+        self.stats = None
+        # Native views over the Rust header maps; items are built on access.
+        self.version = rust_las.version
+        self.well = rust_las.well
+        self.params = rust_las.params
+        self.curves = rust_las.curves
 
     def __getitem__(self, key):
-        item = self._data.get(key)
-        if item:
-            return item
-        raise KeyError(f"{key} not found")
+        # Access curve data directly by mnemonic
+        if isinstance(key, str):
+            if key in self.curves:
+                return self.curves[key].data
+        raise KeyError(f"Curve {key} not found")
 
     def keys(self):
-        return self._data.keys()
-
-    def values(self):
-        return self._data.values()
-
-    def items(self):
-        return self._data.items()
-
-    def get(self, key, default=None):
-        return self._data.get(key, default)
-
-    def __repr__(self):
-        return f"SectionItems({list(self.keys())})"
-
-
-class HeaderItem:
-    def __init__(self, item_dict):
-        self.mnemonic = item_dict.get("mnemonic")
-        self.unit = item_dict.get("unit")
-        self.value = item_dict.get("value")
-        self.descr = item_dict.get("descr")
-        self.original_mnemonic = self.mnemonic  # Compatibility
+        return self.curves.keys()
 
-    def __repr__(self):
-        return f'HeaderItem(mnemonic="{self.mnemonic}", unit="{self.unit}", value="{self.value}", descr="{self.descr}")'
+    @property
+    def dtypes(self):
+        """Storage type of every curve, by mnemonic.
 
+        Returns:
+            dict: ``"float64"``, ``"float32"``, ``"int64"`` or ``"str"`` per curve.
+        """
+        return dict(self._rust.dtypes)
 
-class CurveItem(HeaderItem):
-    def __init__(self, item_dict, las_file_ref):
-        super().__init__(item_dict)
-        self._las = las_file_ref
-        self._data = None
+    def _is_float64(self):
+        return all(dtype == "float64" for _, dtype in self._rust.dtypes)
 
     @property
     def data(self):
-        if self._data is None:
-            # Lazy load from Rust
-            self._data = self._las._rust.get_curve_data(self.mnemonic)
-            if self._data is None:
-                self._data = []
-        return self._data
-
-    def __getitem__(self, index):
-        return self.data[index]
-
-    def __len__(self):
-        return len(self.data)
-
-    def __repr__(self):
-        return f'CurveItem(mnemonic="{self.mnemonic}", unit="{self.unit}", value="{self.value}", descr="{self.descr}", data.shape=({len(self)},))'
-
+        """All curve data as a 2-D NumPy array (rows x curves), like lasio's ``las.data``.
 
-class LASFile:
-    def __init__(self, rust_las):
-        self._rust = rust_las
+        When every curve is float64 the array is Fortran-ordered and shares
+        memory with the Rust parser; each ``CurveItem.data`` is a view of one
+        of its columns. Files read with other dtypes are assembled into a new
+        array: float64 if every curve is numeric (integer nulls become NaN),
+        otherwise an object array.
+        """
+        if self._is_float64():
+            return self._rust.data
+        columns = [self.curves[mnemonic].data for mnemonic, _ in self._rust.dtypes]
+        if any(dtype == "str" for _, dtype in self._rust.dtypes):
+            stacked = np.empty((len(columns[0]), len(columns)), dtype=object)
+            for i, c in enumerate(columns):
+                stacked[:, i] = c
+                stacked[np.ma.getmaskarray(c), i] = None
+            return stacked
+        return np.column_stack(
+            [np.ma.filled(np.ma.asarray(c, dtype=np.float64), np.nan) for c in columns]
+        )
+
+    def to_numpy(self):
+        """Return the data matrix as a 2-D NumPy array.
 
-        # Hydrate metadata from JSON
-        header_json = rust_las.json_headers
-        header_data = json.loads(header_json)
+        Returns:
+            numpy.ndarray: Same array as :attr:`data`, without copying.
+        """
+        return self.data
 
-        self.version = SectionItems(header_data.get("version", {}))
-        self.well = SectionItems(header_data.get("well", {}))
-        self.params = SectionItems(header_data.get("params", {}))
+    def to_arrow(self):
+        """Convert LAS data to a pyarrow RecordBatch without copying.
 
-        # Curves needs special handling to link back to Rust for data
-        raw_curves = header_data.get("curves", {})
-        self.curves = SectionItems({})
-        # Overwrite with CurveItems
-        curve_dict = {}
-        for k, v in raw_curves.items():
-            curve_dict[k] = CurveItem(v, self)
-        self.curves = SectionItems(curve_dict)
+        Each column shares memory with the Rust data matrix. Curve units,
+        descriptions and API codes are stored in the field metadata under
+        ``unit``, ``description`` and ``value``.
 
-    def __getitem__(self, key):
-        # Access curve data directly by mnemonic
-        if isinstance(key, str):
-            if key in self.curves.keys():
-                return self.curves[key].data
-        raise KeyError(f"Curve {key} not found")
+        Returns:
+            pyarrow.RecordBatch: One float64 column per curve.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for to_arrow(). Install with: pip install pyarrow"
+            )
 
-    def keys(self):
-        return self.curves.keys()
+        return self._rust.to_arrow()
 
-    def to_df(self):
+    def to_df(self, dtype_backend=None):
         """Convert LAS data to a pandas DataFrame.
 
+        Args:
+            dtype_backend: ``None`` (default) builds NumPy-backed columns from
+                the data matrix; ``"pyarrow"`` builds ``pd.ArrowDtype`` columns
+                on top of :meth:`to_arrow`. Neither copies the curve values.
+
         Returns:
             pandas.DataFrame: DataFrame with curve mnemonics as columns.
         """
@@ -124,15 +128,38 @@ class LASFile:
                 "pandas is required for to_df(). Install with: pip install pandas"
             )
 
-        data = {}
-        for mnemonic in self.curves.keys():
-            curve = self.curves[mnemonic]
-            data[mnemonic] = curve.data
-        return pd.DataFrame(data)
+        if dtype_backend == "pyarrow":
+            return self.to_arrow().to_pandas(types_mapper=pd.ArrowDtype)
+        if dtype_backend is not None:
+            raise ValueError(
+                f"dtype_backend must be None or 'pyarrow', got {dtype_backend!r}"
+            )
+
+        if self._is_float64():
+            # One view per curve: the matrix can be wider than the curve list
+            # (duplicate mnemonics, extra data columns).
+            columns = {}
+            for mnemonic in self.curves.keys():
+                values = self.curves[mnemonic].data
+                if values is not None:
+                    columns[mnemonic] = values
+            return pd.DataFrame(columns, copy=False)
+
+        columns = {}
+        for mnemonic, dtype in self._rust.dtypes:
+            values = self.curves[mnemonic].data
+            if dtype == "str":
+                values = pd.Categorical(values)
+            elif isinstance(values, np.ma.MaskedArray):
+                values = pd.arrays.IntegerArray(values.data, np.ma.getmaskarray(values))
+            columns[mnemonic] = values
+        return pd.DataFrame(columns, copy=False)
 
     def to_polars(self):
         """Convert LAS data to a polars DataFrame.
 
+        Built on :meth:`to_arrow`, so the curve values are not copied.
+
         Returns:
             polars.DataFrame: DataFrame with curve mnemonics as columns.
         """
@@ -143,11 +170,7 @@ class LASFile:
                 "polars is required for to_polars(). Install with: pip install polars"
             )
 
-        data = {}
-        for mnemonic in self.curves.keys():
-            curve = self.curves[mnemonic]
-            data[mnemonic] = curve.data
-        return pl.DataFrame(data)
+        return pl.from_arrow(self.to_arrow())
 
     def to_csv(self, path, **kwargs):
         """Export LAS data to CSV file.
@@ -172,64 +195,658 @@ class LASFile:
         df = self.to_df()
         df.to_excel(path, sheet_name=sheet_name, index=False, **kwargs)
 
-    def to_las(self, path, version="2.0"):
+    def resample(self, step, start=None, stop=None, method="linear"):
+        """Resample every curve onto a regular depth grid.
+
+        The whole data matrix is resampled in Rust, in parallel over the
+        curves. NULL values are never interpolated across: a grid depth next
+        to a missing sample, or outside the logged interval, is NaN. Integer
+        and string curves take the nearest sample.
+
+        Args:
+            step: Depth increment. Only its size matters; the grid runs from
+                ``start`` to ``stop``.
+            start: First depth of the grid. Default is the first index value.
+            stop: Last depth of the grid (included when it falls on a step).
+                Default is the last index value.
+            method: ``"linear"`` (default) or ``"nearest"``.
+
+        Returns:
+            LASFile: A new file whose index curve is the grid, with STRT,
+            STOP and STEP updated.
+        """
+        return LASFile(self._rust.resample(step, start, stop, method))
+
+    def to_las(self, path, version="2.0", wrap=False, fmt="%12.6f", null_value=None, parallel=True):
         """Export LAS data to LAS file format.
 
+        Rows are formatted in Rust, in parallel blocks written out in order,
+        with the GIL released.
+
         Args:
             path: Output file path.
             version: LAS version ("2.0" or "3.0"). Default is "2.0".
+            wrap: Write LAS 2.0 wrapped data (index value on its own line,
+                other values on lines of at most 80 characters).
+            fmt: printf-style float format of the data values, e.g. "%.4f".
+            null_value: Value written for NaN and as the ~Well NULL value.
+                Default is the file's own NULL value, or -999.25.
+            parallel: Format blocks of rows on several threads.
         """
-        with open(path, "w") as f:
-            # Version Section
-            f.write("~Version Information\n")
-            f.write(
-                f" VERS.                  {version} : CWLS LOG ASCII STANDARD - VERSION {version}\n"
+        self._rust.write(str(path), str(version), wrap, fmt, null_value, parallel)
+
+
+def _row_window(rows):
+    """Normalise ``rows`` (a slice or ``(start, stop)`` pair) for the parser."""
+    if rows is None:
+        return None
+    if isinstance(rows, slice):
+        if rows.step not in (None, 1):
+            raise ValueError("rows slice must have a step of 1")
+        rows = (rows.start, rows.stop)
+    start, stop = rows
+    start = 0 if start is None else start
+    if start < 0 or (stop is not None and stop < 0):
+        raise ValueError("rows does not support negative indices")
+    return (start, stop)
+
+
+def _null_args(null_policy):
+    """Split ``null_policy`` into the parser's mode and extra null values."""
+    if null_policy is None:
+        return ("keep", None)
+    if isinstance(null_policy, str):
+        return (null_policy, None)
+    return ("header", [float(v) for v in null_policy])
+
+
+def read(
+    file_path,
+    curves=None,
+    depth_range=None,
+    rows=None,
+    index="memory",
+    null_policy="header",
+    errors="nan",
+    dtype="float64",
+    dtypes=None,
+    encoding="auto",
+    cache=None,
+    cache_size=2**30,
+    cache_validate="stat",
+    stats=False,
+):
+    """Read a LAS file.
+
+    Gzip, zstd and zip compressed input (recognised by its content, not its
+    name) is decompressed in Rust without temporary files; for a zip
+    archive, the first ``*.las`` member is read.
+
+    Args:
+        file_path: Path to the LAS file, or its contents as ``bytes``, a
+            ``memoryview``/``bytearray`` or a binary file-like object (such
+            as an object-storage stream or ``zipfile.ZipFile.open``).
+            ``bytes`` are parsed in place without copying.
+        curves: Optional list of mnemonics to load, in the order given. Other
+            columns are skipped by the parser and never stored, which cuts
+            parse time and memory roughly in proportion.
+        depth_range: Optional ``(top, bottom)`` pair; only rows whose index
+            curve (the first column) lies in this interval are parsed.
+        rows: Optional ``slice(a, b)`` (or ``(a, b)``) of data rows to parse.
+        index: Where windowed reads keep the file's sparse depth index:
+            ``"memory"`` (per process, default), ``"sidecar"`` (also saved as
+            ``<file>.lasidx`` next to the file) or ``None`` (rebuild each time).
+            Repeated windows over an indexed file seek straight to their rows.
+        null_policy: Values read as NaN while parsing. ``"header"`` (default)
+            uses the ~Well NULL value; a list of numbers adds those sentinels
+            (e.g. ``[-9999, 9999]``) to it; ``None`` keeps sentinels as they are.
+        errors: Tokens that are not numbers are read as NaN with ``"nan"``
+            (default) or make the read fail with ``ValueError`` with
+            ``"raise"``.
+        dtype: Storage type of the curves, ``"float64"`` (default) or
+            ``"float32"`` (half the memory).
+        dtypes: Optional ``{mnemonic: dtype}`` overrides, where dtype is one
+            of ``"float64"``, ``"float32"``, ``"int64"`` or ``"str"``. LAS 3.0
+            curves declared with a ``{S}`` or ``{I}`` format are read as
+            strings or integers unless overridden here.
+        encoding: Text encoding of the file. ``"auto"`` (default) honours a
+            byte order mark (UTF-8 or UTF-16) and otherwise reads UTF-8,
+            falling back to Windows-1252 (Latin-1) when the headers are not
+            valid UTF-8. Any WHATWG label (``"latin1"``, ``"cp1252"``,
+            ``"utf-16le"``) or Windows code page number also works. Only
+            header lines and string values are decoded; numeric data is
+            parsed from the raw bytes.
+        cache: Optional directory of a persistent parse cache. A file read
+            again with the same options while unchanged is loaded from its
+            binary cache entry instead of being parsed. Paths only.
+        cache_size: Size budget of the cache directory in bytes (default
+            1 GiB); the least recently used entries are removed beyond it.
+        cache_validate: ``"stat"`` (default) trusts a cache entry while the
+            file keeps its size and modification time; ``"hash"`` also
+            compares a hash of the file contents.
+        stats: Collect the wall time, bytes and rows of every phase of the
+            read into ``las.stats``: a dict with ``phases`` (``open``,
+            ``decompress``, ``decode``, ``headers``, ``split``, ``parse``,
+            ``assemble``, ... in order), their total ``seconds``, the
+            rayon ``chunks`` and ``threads`` of the data parse, the process
+            ``peak_rss_bytes`` (Linux) and ``total_seconds``, the wall time
+            of the whole call as seen from Python. The same phases are
+            logged at DEBUG level to the ``lasio_rs.stats`` logger whenever
+            it is enabled.
+
+    Returns:
+        LASFile: The parsed file.
+    """
+    start = time.perf_counter()
+    args = _read_args(
+        curves, depth_range, rows, index, null_policy, errors, dtype, dtypes,
+        encoding, cache, cache_size, cache_validate,
+    )
+    data = _buffer(file_path)
+    if data is None:
+        return _with_stats(_rust_read(os.fspath(file_path), *args, stats=stats), stats, start)
+    if cache is not None:
+        raise ValueError("cache requires a file path")
+    kwargs = _bytes_kwargs(curves, depth_range, rows, null_policy, errors, dtype, dtypes, encoding)
+    return _with_stats(_rust_read_bytes(data, **kwargs, stats=stats), stats, start)
+
+
+def _with_stats(result, stats, start):
+    """Wrap a native read result, attaching its stats if collected."""
+    if not stats:
+        return LASFile(result)
+    rust_las, info = result
+    las = LASFile(rust_las)
+    info["total_seconds"] = time.perf_counter() - start
+    las.stats = info
+    return las
+
+
+def _buffer(source):
+    """``bytes`` holding the contents of ``source``, or None for a path."""
+    if isinstance(source, (str, os.PathLike)):
+        return None
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, memoryview):
+        whole = isinstance(source.obj, bytes) and source.nbytes == len(source.obj)
+        if whole and source.c_contiguous:
+            return source.obj
+    if isinstance(source, (bytearray, memoryview)):
+        # Mutable buffers are copied so they cannot change mid-parse.
+        return bytes(source)
+    if hasattr(source, "read"):
+        data = source.read()
+        return data.encode("utf-8") if isinstance(data, str) else _buffer(data)
+    raise TypeError(
+        f"expected a path, bytes-like or file-like object, got {type(source).__name__}"
+    )
+
+
+def _bytes_kwargs(curves, depth_range, rows, null_policy, errors, dtype, dtypes, encoding):
+    """Keyword options of an in-memory read, which has no index or cache."""
+    if depth_range is not None and rows is not None:
+        raise ValueError("depth_range and rows cannot be combined")
+    nulls, null_values = _null_args(null_policy)
+    return {
+        "curves": curves,
+        "depth_range": None if depth_range is None else tuple(depth_range),
+        "rows": _row_window(rows),
+        "nulls": nulls,
+        "null_values": null_values,
+        "errors": errors,
+        "dtype": dtype,
+        "dtypes": None if dtypes is None else {k: str(v) for k, v in dtypes.items()},
+        "encoding": "auto" if encoding is None else encoding,
+    }
+
+
+def _read_args(
+    curves, depth_range, rows, index, null_policy, errors, dtype, dtypes,
+    encoding, cache, cache_size, cache_validate,
+):
+    """Positional read options shared by :func:`read` and :func:`read_many`."""
+    kwargs = _bytes_kwargs(curves, depth_range, rows, null_policy, errors, dtype, dtypes, encoding)
+    return (
+        kwargs["curves"],
+        kwargs["depth_range"],
+        kwargs["rows"],
+        "off" if index is None else index,
+        kwargs["nulls"],
+        kwargs["null_values"],
+        kwargs["errors"],
+        kwargs["dtype"],
+        kwargs["dtypes"],
+        kwargs["encoding"],
+        None if cache is None else os.path.expanduser(cache),
+        int(cache_size),
+        cache_validate,
+    )
+
+
+def _batch_item(item):
+    return item if isinstance(item, BaseException) else LASFile(item)
+
+
+def read_many(
+    paths,
+    workers=None,
+    ordered=True,
+    curves=None,
+    depth_range=None,
+    rows=None,
+    index="memory",
+    null_policy="header",
+    errors="nan",
+    dtype="float64",
+    dtypes=None,
+    encoding="auto",
+    cache=None,
+    cache_size=2**30,
+    cache_validate="stat",
+):
+    """Read many LAS files in parallel.
+
+    The files are parsed on a pool of Rust threads with the GIL released. A
+    file that fails does not abort the batch: its slot holds the exception
+    instance (``OSError``, ``KeyError`` or ``ValueError``) instead of a
+    ``LASFile``.
+
+    Args:
+        paths: Iterable of file paths.
+        workers: Number of threads; defaults to one per core.
+        ordered: If True (default), return a list in input order. If False,
+            return an iterator of ``(index, item)`` pairs as files complete.
+        curves, depth_range, rows, index, null_policy, errors, dtype, dtypes,
+        encoding, cache, cache_size, cache_validate: As in :func:`read`,
+            applied to every file.
+
+    Returns:
+        list or iterator: ``LASFile`` objects or exception instances.
+    """
+    paths = [str(p) for p in paths]
+    args = _read_args(
+        curves, depth_range, rows, index, null_policy, errors, dtype, dtypes,
+        encoding, cache, cache_size, cache_validate,
+    )
+    if ordered:
+        return [_batch_item(item) for item in _rust_read_many(paths, workers, True, *args)]
+    return (
+        (i, _batch_item(item)) for i, item in _rust_read_many(paths, workers, False, *args)
+    )
+
+
+_async_limit = os.cpu_count() or 4
+_async_slots = weakref.WeakKeyDictionary()
+
+
+def set_async_limit(limit):
+    """Set how many :func:`read_async` parses may run at once.
+
+    The limit applies per event loop to every ``read_async`` and
+    ``read_many_async`` call; further reads wait for a free slot before
+    they start, so a burst of requests never holds more than ``limit``
+    files in memory mid-parse. Default: one per core.
+
+    Args:
+        limit: Maximum number of concurrent parses (at least 1).
+    """
+    global _async_limit
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    _async_limit = int(limit)
+    _async_slots.clear()
+
+
+def _async_slot():
+    loop = asyncio.get_running_loop()
+    slot = _async_slots.get(loop)
+    if slot is None:
+        slot = _async_slots[loop] = asyncio.Semaphore(_async_limit)
+    return slot
+
+
+def _resolve(future, slot, item):
+    # The slot is freed when the parse ends, not when its waiter does: a
+    # cancelled read keeps its slot until Rust is done with the file.
+    slot.release()
+    if not future.done():
+        future.set_result(item)
+
+
+def _read_buffer(source, kwargs):
+    """Native result of reading an in-memory source, or the exception."""
+    try:
+        return _rust_read_bytes(_buffer(source), **kwargs)
+    except Exception as e:
+        return e
+
+
+async def _read_item(source, args, kwargs=None):
+    """``LASFile`` or exception instance for one file, parsed off the loop.
+
+    Paths are parsed on the Rust thread pool with ``args``; other sources
+    (see :func:`read`) are read and parsed on the loop's default executor
+    with ``kwargs``.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    slot = _async_slot()
+
+    def done(item):
+        # Called from a Rust worker thread.
+        try:
+            loop.call_soon_threadsafe(_resolve, future, slot, item)
+        except RuntimeError:
+            pass  # the loop is closed
+
+    await slot.acquire()
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            _rust_spawn_read(os.fspath(source), done, *args)
+        else:
+            work = loop.run_in_executor(None, _read_buffer, source, kwargs)
+            work.add_done_callback(lambda work: _resolve(future, slot, work.result()))
+    except BaseException:
+        slot.release()
+        raise
+    return _batch_item(await future)
+
+
+async def read_async(
+    file_path,
+    curves=None,
+    depth_range=None,
+    rows=None,
+    index="memory",
+    null_policy="header",
+    errors="nan",
+    dtype="float64",
+    dtypes=None,
+    encoding="auto",
+    cache=None,
+    cache_size=2**30,
+    cache_validate="stat",
+):
+    """Read a LAS file without blocking the running event loop.
+
+    A path is parsed on the Rust thread pool, and any other source accepted
+    by :func:`read` is read and parsed on the loop's default executor;
+    either way the coroutine waits for a free slot (see
+    :func:`set_async_limit`) and then for the parse to finish. Cancelling
+    it stops the wait, not a parse already running; that parse keeps its
+    slot until it ends.
+
+    Args:
+        file_path, curves, depth_range, rows, index, null_policy, errors,
+        dtype, dtypes, encoding, cache, cache_size, cache_validate: As in
+            :func:`read`.
+
+    Returns:
+        LASFile: The parsed file.
+    """
+    args = _read_args(
+        curves, depth_range, rows, index, null_policy, errors, dtype, dtypes,
+        encoding, cache, cache_size, cache_validate,
+    )
+    kwargs = None
+    if not isinstance(file_path, (str, os.PathLike)):
+        if cache is not None:
+            raise ValueError("cache requires a file path")
+        kwargs = _bytes_kwargs(curves, depth_range, rows, null_policy, errors, dtype, dtypes, encoding)
+    item = await _read_item(file_path, args, kwargs)
+    if isinstance(item, BaseException):
+        raise item
+    return item
+
+
+async def read_many_async(
+    paths,
+    curves=None,
+    depth_range=None,
+    rows=None,
+    index="memory",
+    null_policy="header",
+    errors="nan",
+    dtype="float64",
+    dtypes=None,
+    encoding="auto",
+    cache=None,
+    cache_size=2**30,
+    cache_validate="stat",
+):
+    """Read many LAS files without blocking the running event loop.
+
+    Like :func:`read_many`, a file that fails does not abort the batch: its
+    slot holds the exception instance. At most :func:`set_async_limit`
+    files are parsed at once.
+
+    Args:
+        paths: Iterable of file paths.
+        curves, depth_range, rows, index, null_policy, errors, dtype, dtypes,
+        encoding, cache, cache_size, cache_validate: As in :func:`read`,
+            applied to every file.
+
+    Returns:
+        list: ``LASFile`` objects or exception instances, in input order.
+    """
+    args = _read_args(
+        curves, depth_range, rows, index, null_policy, errors, dtype, dtypes,
+        encoding, cache, cache_size, cache_validate,
+    )
+    return list(await asyncio.gather(*(_read_item(str(p), args) for p in paths)))
+
+
+def clear_cache(cache):
+    """Remove every entry of the parse cache directory ``cache``.
+
+    Args:
+        cache: Directory passed as ``cache`` to :func:`read`.
+    """
+    _rust_clear_cache(os.path.expanduser(cache))
+
+
+def write(las, path, **kwargs):
+    """Write ``las`` to ``path`` as a LAS file.
+
+    Same as ``las.to_las(path, **kwargs)``; see :meth:`LASFile.to_las`.
+    """
+    las.to_las(path, **kwargs)
+
+
+def iter_chunks(
+    file_path, rows=100_000, curves=None, as_arrow=False, null_policy="header", errors="nan",
+    encoding="auto",
+):
+    """Iterate over the curve data of a LAS file in blocks of bounded size.
+
+    Only the headers and one block are kept in memory, so files larger than
+    RAM can be processed with a constant footprint.
+
+    Args:
+        file_path: Path to the LAS file.
+        rows: Maximum number of rows per block.
+        curves: Optional list of mnemonics selecting (and ordering) the
+            columns of every block. Default is all curves.
+        as_arrow: Yield ``pyarrow.RecordBatch`` blocks instead of 2-D NumPy
+            arrays.
+        null_policy, errors, encoding: As in :func:`read`.
+
+    Returns:
+        Iterator of blocks; its ``curves`` attribute lists the column
+        mnemonics.
+    """
+    return _rust_iter_chunks(
+        str(file_path), rows, curves, as_arrow, *_null_args(null_policy), errors, encoding
+    )
+
+
+def read_header(file_path, encoding="auto"):
+    """Read only the header sections of a LAS file.
+
+    Reading stops at the ``~A`` marker, so the cost does not depend on the
+    size of the data section.
+
+    Args:
+        file_path: Path to the LAS file.
+        encoding: As in :func:`read`.
+
+    Returns:
+        LASFile: The headers and curve definitions; ``data`` has no rows.
+    """
+    return LASFile(_rust_read_header(str(file_path), encoding))
+
+
+def scan_headers(source, workers=None, as_arrow=False):
+    """Catalogue the headers of many LAS files in parallel.
+
+    Each file is read only up to its ``~A`` marker. Files that cannot be read
+    still get a row, with the reason in the ``error`` column.
+
+    Args:
+        source: A directory (scanned recursively for ``*.las`` files, any
+            case) or a glob pattern such as ``"archive/**/*.LAS"``.
+        workers: Number of threads; defaults to one per core.
+        as_arrow: Return a ``pyarrow.Table`` instead of a pandas DataFrame.
+
+    Returns:
+        One row per file with the columns ``path``, ``well``, ``uwi``,
+        ``strt``, ``stop``, ``step``, ``null``, ``curves`` (list of
+        mnemonics) and ``error``.
+    """
+    columns = _rust_scan_headers(str(source), workers)
+    if as_arrow:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for as_arrow=True. Install with: pip install pyarrow"
             )
-            f.write(" WRAP.                  NO  : One line per depth step\n")
-
-            # Well Section
-            f.write("~Well Information\n")
-            for mnem in self.well.keys():
-                item = self.well[mnem]
-                f.write(
-                    f" {mnem:18s}.{item.unit or '':8s} {item.value or '':30s}: {item.descr or ''}\n"
-                )
-
-            # Curve Section
-            f.write("~Curve Information\n")
-            for mnem in self.curves.keys():
-                curve = self.curves[mnem]
-                f.write(
-                    f" {mnem:18s}.{curve.unit or '':8s}                              : {curve.descr or ''}\n"
-                )
-
-            # Parameter Section (if exists)
-            if len(list(self.params.keys())) > 0:
-                f.write("~Parameter Information\n")
-                for mnem in self.params.keys():
-                    item = self.params[mnem]
-                    f.write(
-                        f" {mnem:18s}.{item.unit or '':8s} {item.value or '':30s}: {item.descr or ''}\n"
-                    )
-
-            # ASCII Data Section
-            f.write("~A")
-            for mnem in self.curves.keys():
-                f.write(f" {mnem}")
-            f.write("\n")
-
-            # Get data length from first curve
-            first_curve = self.curves[list(self.curves.keys())[0]]
-            nrows = len(first_curve.data)
-
-            for i in range(nrows):
-                row = []
-                for mnem in self.curves.keys():
-                    val = self.curves[mnem].data[i]
-                    row.append(f"{val:12.6f}")
-                f.write(" ".join(row) + "\n")
-
-
-def read(file_path):
-    rust_obj = _rust_read(str(file_path))
-    return LASFile(rust_obj)
+        return pa.table(columns)
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError(
+            "pandas is required for scan_headers(). Install with: pip install pandas"
+        )
+    return pd.DataFrame(columns)
+
+
+def validate(paths, workers=None, as_arrow=False):
+    """Check many LAS files for structural problems, in parallel.
+
+    Every file is checked in one pass on the Rust thread pool, without the
+    GIL, for what :func:`read` silently tolerates: repeated mnemonics, data
+    rows whose value count differs from the ~Curve section or the first row,
+    incomplete wrapped records, values that are not numbers, depths that are
+    not monotonic or do not follow STEP, and STRT / STOP disagreeing with the
+    data. At most 100 issues of each kind are listed per file.
+
+    Args:
+        paths: Iterable of file paths, or a directory / glob pattern as in
+            :func:`scan_headers`.
+        workers: Number of threads; defaults to one per core.
+        as_arrow: Return a ``pyarrow.Table`` (with ``issues`` as a list of
+            structs) instead of a list of dicts.
+
+    Returns:
+        One report per file, in input order: a dict with ``path``, ``rows``,
+        ``valid`` and ``issues``, a list of ``{"kind", "line", "message"}``
+        dicts (``line`` counts from 1 and is None for file-level issues).
+        The list can be passed to ``json.dumps`` as is.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = os.fspath(paths)
+    else:
+        paths = [os.fspath(p) for p in paths]
+    reports = _rust_validate(paths, workers)
+    if not as_arrow:
+        return reports
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for as_arrow=True. Install with: pip install pyarrow"
+        )
+    issue = pa.struct([("kind", pa.string()), ("line", pa.int64()), ("message", pa.string())])
+    schema = pa.schema([
+        ("path", pa.string()),
+        ("rows", pa.int64()),
+        ("valid", pa.bool_()),
+        ("issues", pa.list_(issue)),
+    ])
+    return pa.Table.from_pylist(reports, schema=schema)
+
+
+def align(las_list, curves, step, start=None, stop=None, method="linear", as_arrow=False):
+    """Resample several wells onto one depth grid and stack them.
+
+    Every well is resampled in Rust, in parallel, as in
+    :meth:`LASFile.resample`; no Python loop runs over wells or curves.
+
+    Args:
+        las_list: Iterable of :class:`LASFile`.
+        curves: Mnemonics to stack, in order. A curve a well does not have is
+            NaN in that well; string curves are NaN too.
+        step: Depth increment of the grid.
+        start, stop: Ends of the grid. Default is the whole range covered by
+            any of the wells, increasing.
+        method: ``"linear"`` (default) or ``"nearest"``.
+        as_arrow: Return a long-format ``pyarrow.Table`` with columns
+            ``well`` (position in ``las_list``), ``depth`` and one per curve.
+
+    Returns:
+        tuple: ``(depth, data)``, the 1-D grid and a float64 array of shape
+        ``(wells, depths, curves)``; or a ``pyarrow.Table`` with ``as_arrow``.
+    """
+    wells = [las._rust for las in las_list]
+    if not as_arrow:
+        return _rust_align(wells, list(curves), step, start, stop, method, False)
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for as_arrow=True. Install with: pip install pyarrow"
+        )
+    return pa.Table.from_batches([_rust_align(wells, list(curves), step, start, stop, method, True)])
+
+
+def merge(runs, overlap="prefer_last", path=None, workers=None, **write_options):
+    """Splice several logging runs of one well into a single file.
+
+    Rows are merged by depth in the direction of the first run; rows of
+    different runs at the same depth become one row. Curves are matched by
+    mnemonic, so the result has every curve of every run, NaN where a run
+    did not log it. The data never goes through Python: runs given as paths
+    are read in parallel, and the merged file is built (and optionally
+    written) in Rust with the GIL released.
+
+    Args:
+        runs: Iterable of :class:`LASFile` objects and/or file paths, in run
+            order. Paths are read with :func:`read_many`.
+        overlap: Value taken by a curve where several runs have one at the
+            same depth: ``"prefer_last"`` (default), ``"prefer_first"`` or
+            ``"average"`` (integer and string curves keep the last). NULL
+            values never replace real ones.
+        path: If given, also write the merged file there.
+        workers: Number of threads used to read paths.
+        **write_options: ``version``, ``wrap``, ``fmt`` and ``null_value``
+            of the written file, as in :meth:`LASFile.to_las`.
+
+    Returns:
+        LASFile: The merged well, with STRT, STOP and STEP (0 if irregular)
+        set from the merged index.
+    """
+    runs = list(runs)
+    paths = [str(run) for run in runs if not isinstance(run, LASFile)]
+    loaded = iter(read_many(paths, workers=workers)) if paths else iter(())
+    wells = []
+    for run in runs:
+        if not isinstance(run, LASFile):
+            run = next(loaded)
+            if isinstance(run, BaseException):
+                raise run
+        wells.append(run._rust)
+    if path is not None:
+        path = str(path)
+    return LASFile(_rust_merge(wells, overlap, path, **write_options))
@@ -0,0 +1,144 @@
+use crate::{Column, CurveItem, LASFile, SectionCurves};
+use arrow::array::{ArrayRef, DictionaryArray, Float32Array, Float64Array, Int32Array, Int64Array, StringArray};
+use arrow::buffer::{Buffer, NullBuffer, ScalarBuffer};
+use arrow::datatypes::{DataType, Field, Int32Type, Schema};
+use arrow::error::ArrowError;
+use arrow::record_batch::RecordBatch;
+use ndarray::{s, Array2, Array3};
+use std::collections::HashMap;
+use std::mem::size_of;
+use std::ptr::NonNull;
+use std::sync::Arc;
+
+/// Arrow type of a curve stored in `column`, or in the float64 matrix.
+fn column_type(column: Option<&Column>) -> DataType {
+    match column {
+        None | Some(Column::Float64(_)) => DataType::Float64,
+        Some(Column::Float32(_)) => DataType::Float32,
+        Some(Column::Int64 { .. }) => DataType::Int64,
+        Some(Column::Text(_)) => DataType::Dictionary(Box::new(DataType::Int32), Box::new(DataType::Utf8)),
+    }
+}
+
+/// Curves that have data, in order.
+fn curves_with_data(las: &LASFile) -> impl Iterator<Item = &CurveItem> {
+    las.curves
+        .items
+        .values()
+        .filter(|curve| las.columns.contains_key(&curve.mnemonic) || las.curve_index(&curve.mnemonic).is_some())
+}
+
+/// Nullable field of `curve` with its unit, description and API code in the
+/// field metadata.
+fn curve_field(curve: &CurveItem, data_type: DataType) -> Field {
+    let metadata = HashMap::from([
+        ("unit".to_string(), curve.unit.clone()),
+        ("description".to_string(), curve.descr.clone()),
+        ("value".to_string(), curve.value.clone()),
+    ]);
+    Field::new(curve.mnemonic.as_str(), data_type, true).with_metadata(metadata)
+}
+
+/// Arrow schema for the curves that have data, one nullable field per curve
+/// with its unit, description and API code in the field metadata.
+///
+/// Float64 and float32 curves map to `Float64` / `Float32`, integer curves
+/// to `Int64` and string curves to `Dictionary<Int32, Utf8>`.
+pub fn curve_schema(las: &LASFile) -> Schema {
+    let fields: Vec<Field> = curves_with_data(las)
+        .map(|curve| curve_field(curve, column_type(las.columns.get(&curve.mnemonic))))
+        .collect();
+    Schema::new(fields)
+}
+
+/// Schema of the blocks of a [`stream::AsciiChunks`](crate::stream::AsciiChunks)
+/// over `curves`: one `Float64` field per curve, with the metadata of
+/// [`curve_schema`].
+pub fn block_schema(curves: &SectionCurves) -> Schema {
+    Schema::new(curves.items.values().map(|curve| curve_field(curve, DataType::Float64)).collect::<Vec<_>>())
+}
+
+/// Batch of one streamed block, with missing values (NaN) as nulls so they
+/// survive formats without NaN, such as JSON.
+pub fn block_record_batch(schema: &Arc<Schema>, block: &Array2<f64>) -> Result<RecordBatch, ArrowError> {
+    let columns: Vec<ArrayRef> = block
+        .columns()
+        .into_iter()
+        .map(|values| Arc::new(values.iter().map(|&v| (!v.is_nan()).then_some(v)).collect::<Float64Array>()) as ArrayRef)
+        .collect();
+    RecordBatch::try_new(schema.clone(), columns)
+}
+
+/// Buffer over `values`, owned by `las`, without copying.
+fn borrowed_buffer<T>(las: &Arc<LASFile>, values: &[T]) -> Buffer {
+    let ptr = NonNull::from(values).cast::<u8>();
+    // SAFETY: `ptr` covers `values`, owned by `las`, which the buffer keeps
+    // alive, and the data is never mutated after parsing: not through Rust,
+    // and not through NumPy, whose views of it are read-only.
+    unsafe { Buffer::from_custom_allocation(ptr, values.len() * size_of::<T>(), las.clone()) }
+}
+
+fn not_contiguous() -> ArrowError {
+    ArrowError::InvalidArgumentError("curve data is not contiguous".to_string())
+}
+
+/// Export the curves as an Arrow `RecordBatch`.
+///
+/// Numeric column buffers point straight into the parsed file (the
+/// column-major `data` matrix or the typed columns) and hold a clone of the
+/// `Arc`, so the file outlives every consumer of the batch (including ones on
+/// the other side of the C Data Interface). Only the validity bitmaps of
+/// integer columns and the dictionaries of string columns are built here.
+pub fn to_record_batch(las: &Arc<LASFile>) -> Result<RecordBatch, ArrowError> {
+    let nrows = las.data.nrows();
+    let mut columns: Vec<ArrayRef> = Vec::new();
+    for curve in curves_with_data(las) {
+        let array: ArrayRef = match las.columns.get(&curve.mnemonic) {
+            None => {
+                let i = las.curve_index(&curve.mnemonic).ok_or_else(not_contiguous)?;
+                let values = las.data.column(i).to_slice().ok_or_else(not_contiguous)?;
+                Arc::new(Float64Array::new(ScalarBuffer::new(borrowed_buffer(las, values), 0, nrows), None))
+            }
+            Some(Column::Float64(values)) => {
+                let values = values.as_slice().ok_or_else(not_contiguous)?;
+                Arc::new(Float64Array::new(ScalarBuffer::new(borrowed_buffer(las, values), 0, values.len()), None))
+            }
+            Some(Column::Float32(values)) => {
+                let values = values.as_slice().ok_or_else(not_contiguous)?;
+                Arc::new(Float32Array::new(ScalarBuffer::new(borrowed_buffer(las, values), 0, values.len()), None))
+            }
+            Some(Column::Int64 { values, valid }) => {
+                let values = values.as_slice().ok_or_else(not_contiguous)?;
+                let nulls = match valid.iter().all(|&v| v) {
+                    true => None,
+                    false => Some(NullBuffer::from(valid.clone())),
+                };
+                Arc::new(Int64Array::new(ScalarBuffer::new(borrowed_buffer(las, values), 0, values.len()), nulls))
+            }
+            Some(Column::Text(text)) => {
+                let keys: Int32Array = text.codes.iter().map(|&code| (code >= 0).then_some(code)).collect();
+                let values = StringArray::from_iter_values(text.values.iter());
+                Arc::new(DictionaryArray::<Int32Type>::try_new(keys, Arc::new(values))?)
+            }
+        };
+        columns.push(array);
+    }
+    RecordBatch::try_new(Arc::new(curve_schema(las)), columns)
+}
+
+/// Long-format batch of a [`resample::align`](crate::resample::align)
+/// result: one row per well and depth, with the position of the well in the
+/// input (`well`), the `depth` and one float64 column per curve.
+pub fn long_record_batch(aligned: &Array3<f64>, grid: &[f64], curves: &[String]) -> Result<RecordBatch, ArrowError> {
+    let (nwells, ndepths, _) = aligned.dim();
+    let mut fields = vec![Field::new("well", DataType::Int32, false), Field::new("depth", DataType::Float64, false)];
+    let mut columns: Vec<ArrayRef> = vec![
+        Arc::new(Int32Array::from_iter_values((0..nwells as i32).flat_map(|w| std::iter::repeat(w).take(ndepths)))),
+        Arc::new(Float64Array::from_iter_values((0..nwells).flat_map(|_| grid.iter().copied()))),
+    ];
+    for (c, mnemonic) in curves.iter().enumerate() {
+        fields.push(Field::new(mnemonic.as_str(), DataType::Float64, true));
+        columns.push(Arc::new(Float64Array::from_iter_values(aligned.slice(s![.., .., c]).iter().copied())));
+    }
+    RecordBatch::try_new(Arc::new(Schema::new(fields)), columns)
+}
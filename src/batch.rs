@@ -0,0 +1,48 @@
+//! Parsing many LAS files at once on a dedicated rayon pool.
+use crate::reader::{read_las_file_with, ReadOptions};
+use crate::{LASFile, LasError};
+use rayon::prelude::*;
+use rayon::{ThreadPool, ThreadPoolBuilder};
+use std::path::PathBuf;
+use std::sync::mpsc::{channel, Receiver};
+use std::thread;
+
+/// Pool of `workers` threads for one batch; one per core by default.
+pub(crate) fn build_pool(workers: Option<usize>) -> Result<ThreadPool, LasError> {
+    // Zero lets rayon pick one thread per core.
+    Ok(ThreadPoolBuilder::new().num_threads(workers.unwrap_or(0)).build()?)
+}
+
+/// Read every file in `paths` on a pool of `workers` threads.
+///
+/// Results come back in input order; a file that fails to read yields its
+/// own `Err` without affecting the others. Each file's ~ASCII section is
+/// itself parsed in parallel on the same pool.
+pub fn read_many(paths: &[PathBuf], options: &ReadOptions, workers: Option<usize>) -> Result<Vec<Result<LASFile, LasError>>, LasError> {
+    let pool = build_pool(workers)?;
+    Ok(pool.install(|| paths.par_iter().map(|path| read_las_file_with(path, options)).collect()))
+}
+
+/// Like [`read_many`], but deliver `(input index, result)` pairs as soon as
+/// each file is done.
+///
+/// The work runs on a background thread; the receiver is closed once every
+/// file has been delivered.
+pub fn read_many_unordered(
+    paths: Vec<PathBuf>,
+    options: ReadOptions,
+    workers: Option<usize>,
+) -> Result<Receiver<(usize, Result<LASFile, LasError>)>, LasError> {
+    let pool = build_pool(workers)?;
+    let (sender, receiver) = channel();
+    thread::spawn(move || {
+        pool.install(|| {
+            paths.par_iter().enumerate().for_each_with(sender, |sender, (i, path)| {
+                // The receiver may have been dropped; the rest of the batch is
+                // then simply discarded.
+                let _ = sender.send((i, read_las_file_with(path, &options)));
+            });
+        });
+    });
+    Ok(receiver)
+}
@@ -0,0 +1,218 @@
+//! `lasio`: bulk conversion, header scans, validation and read benchmarks of
+//! LAS archives from the shell, without a Python interpreter.
+//!
+//! Build with `cargo install --path . --no-default-features --features cli`.
+//! Every subcommand takes files, directories (searched for `*.las`) or glob
+//! patterns, and writes one JSON object per line (NDJSON) to stdout, except
+//! `bench`, which prints a table. The exit status is 1 if any file failed.
+use _lasio_rs::catalog::{expand_paths, scan_headers};
+use _lasio_rs::convert::{convert_file, convert_files, Format};
+use _lasio_rs::reader::{read_las_file_with, ReadOptions};
+use _lasio_rs::stats::{peak_rss_bytes, ReadStats};
+use _lasio_rs::validate::validate;
+use _lasio_rs::LasError;
+use clap::{Parser, Subcommand};
+use serde::Serialize;
+use std::fs;
+use std::io::{self, BufWriter, Write};
+use std::path::{Path, PathBuf};
+use std::process::ExitCode;
+use std::sync::Arc;
+use std::time::Instant;
+
+#[derive(Parser)]
+#[command(name = "lasio", version, about = "Convert, scan, validate and benchmark LAS well log files")]
+struct Cli {
+    #[command(subcommand)]
+    command: Command,
+}
+
+#[derive(Subcommand)]
+enum Command {
+    /// Convert LAS files to Parquet, Arrow IPC, CSV or NDJSON, in parallel.
+    ///
+    /// Every file is streamed block by block, so memory stays bounded
+    /// whatever its size. One result line per file is printed to stdout.
+    Convert {
+        /// LAS files, directories or glob patterns (quote them).
+        #[arg(required = true)]
+        inputs: Vec<String>,
+        /// Output format: parquet, arrow, csv or ndjson.
+        #[arg(short = 't', long = "to", value_parser = Format::parse, default_value = "parquet")]
+        format: Format,
+        /// Output directory (created if missing), or `-` to stream a single
+        /// input to stdout.
+        #[arg(short, long, default_value = ".")]
+        output: PathBuf,
+        /// Curves to keep, in this order (comma separated).
+        #[arg(short, long, value_delimiter = ',')]
+        curves: Option<Vec<String>>,
+        /// Rows per written batch (and per Parquet/Arrow record batch).
+        #[arg(long, default_value_t = 65_536)]
+        batch_rows: usize,
+        /// Files converted at once; one per core by default.
+        #[arg(short, long)]
+        workers: Option<usize>,
+    },
+    /// Print one catalogue line per file, reading only the headers.
+    Headers {
+        #[arg(required = true)]
+        inputs: Vec<String>,
+        #[arg(short, long)]
+        workers: Option<usize>,
+    },
+    /// Check files against the LAS rules and print one report per file.
+    Validate {
+        #[arg(required = true)]
+        inputs: Vec<String>,
+        #[arg(short, long)]
+        workers: Option<usize>,
+        /// Print only the reports of files with issues.
+        #[arg(long)]
+        errors_only: bool,
+    },
+    /// Time whole-file reads and report the throughput of every file.
+    Bench {
+        #[arg(required = true)]
+        inputs: Vec<String>,
+        /// Reads per file; the fastest one is reported.
+        #[arg(short, long, default_value_t = 3)]
+        repeat: usize,
+        /// Also print the time of every phase of the fastest read.
+        #[arg(long)]
+        phases: bool,
+    },
+}
+
+/// Files named by every input, in order.
+fn expand(inputs: &[String]) -> Result<Vec<PathBuf>, LasError> {
+    let mut paths = Vec::new();
+    for input in inputs {
+        let found = expand_paths(input)?;
+        if found.is_empty() {
+            return Err(LasError::InvalidOptions(format!("no LAS files found for '{}'", input)));
+        }
+        paths.extend(found);
+    }
+    Ok(paths)
+}
+
+/// Write `rows` to stdout as NDJSON.
+fn print_lines<T: Serialize>(rows: &[T]) -> Result<(), LasError> {
+    let mut out = BufWriter::new(io::stdout().lock());
+    for row in rows {
+        serde_json::to_writer(&mut out, row).map_err(io::Error::from)?;
+        writeln!(out)?;
+    }
+    out.flush()?;
+    Ok(())
+}
+
+fn convert(
+    inputs: &[String],
+    format: Format,
+    output: &Path,
+    curves: Option<Vec<String>>,
+    rows: usize,
+    workers: Option<usize>,
+) -> Result<bool, LasError> {
+    let paths = expand(inputs)?;
+    let options = ReadOptions { curves, ..Default::default() };
+    if output == Path::new("-") {
+        let [path] = paths.as_slice() else {
+            return Err(LasError::InvalidOptions("only a single input can be written to stdout".to_string()));
+        };
+        convert_file(path, BufWriter::new(io::stdout()), format, rows, &options)?;
+        return Ok(true);
+    }
+    let converted = convert_files(&paths, output, format, rows, &options, workers)?;
+    for failed in converted.iter().filter(|c| c.error.is_some()) {
+        eprintln!("lasio: {}: {}", failed.path.display(), failed.error.as_deref().unwrap_or_default());
+    }
+    print_lines(&converted)?;
+    Ok(converted.iter().all(|c| c.error.is_none()))
+}
+
+fn headers(inputs: &[String], workers: Option<usize>) -> Result<bool, LasError> {
+    let summaries = scan_headers(&expand(inputs)?, workers)?;
+    print_lines(&summaries)?;
+    Ok(summaries.iter().all(|s| s.error.is_none()))
+}
+
+fn check(inputs: &[String], workers: Option<usize>, errors_only: bool) -> Result<bool, LasError> {
+    let reports = validate(&expand(inputs)?, workers)?;
+    let shown: Vec<_> = reports.iter().filter(|r| !errors_only || !r.is_valid()).collect();
+    print_lines(&shown)?;
+    Ok(reports.iter().all(|r| r.is_valid()))
+}
+
+fn bench(inputs: &[String], repeat: usize, phases: bool) -> Result<bool, LasError> {
+    let mut out = io::stdout().lock();
+    writeln!(out, "{:<40} {:>10} {:>10} {:>10} {:>10}", "file", "rows", "MB", "ms", "MB/s")?;
+    let mut ok = true;
+    for path in expand(inputs)? {
+        let megabytes = fs::metadata(&path)?.len() as f64 / 1e6;
+        let mut best: Option<(f64, usize, Arc<ReadStats>)> = None;
+        for _ in 0..repeat.max(1) {
+            let stats = Arc::new(ReadStats::new());
+            let options = ReadOptions { stats: Some(stats.clone()), ..Default::default() };
+            let start = Instant::now();
+            let las = match read_las_file_with(&path, &options) {
+                Ok(las) => las,
+                Err(e) => {
+                    eprintln!("lasio: {}: {}", path.display(), e);
+                    ok = false;
+                    break;
+                }
+            };
+            let seconds = start.elapsed().as_secs_f64();
+            let rows = las.data.nrows().max(las.columns.values().map(|c| c.len()).max().unwrap_or(0));
+            if best.as_ref().map_or(true, |(s, _, _)| seconds < *s) {
+                best = Some((seconds, rows, stats));
+            }
+        }
+        let Some((seconds, rows, stats)) = best else {
+            continue;
+        };
+        let name = path.display().to_string();
+        writeln!(
+            out,
+            "{:<40} {:>10} {:>10.2} {:>10.2} {:>10.1}",
+            name,
+            rows,
+            megabytes,
+            seconds * 1e3,
+            megabytes / seconds.max(f64::EPSILON)
+        )?;
+        if phases {
+            for phase in stats.phases() {
+                let (name, megabytes) = (phase.phase.name(), phase.bytes as f64 / 1e6);
+                writeln!(out, "  {:<38} {:>10} {:>10.2} {:>10.2}", name, phase.rows, megabytes, phase.seconds * 1e3)?;
+            }
+        }
+    }
+    if let Some(peak) = peak_rss_bytes() {
+        writeln!(out, "peak RSS: {:.1} MB", peak as f64 / 1e6)?;
+    }
+    Ok(ok)
+}
+
+fn main() -> ExitCode {
+    let cli = Cli::parse();
+    let result = match cli.command {
+        Command::Convert { inputs, format, output, curves, batch_rows, workers } => {
+            convert(&inputs, format, &output, curves, batch_rows, workers)
+        }
+        Command::Headers { inputs, workers } => headers(&inputs, workers),
+        Command::Validate { inputs, workers, errors_only } => check(&inputs, workers, errors_only),
+        Command::Bench { inputs, repeat, phases } => bench(&inputs, repeat, phases),
+    };
+    match result {
+        Ok(true) => ExitCode::SUCCESS,
+        Ok(false) => ExitCode::FAILURE,
+        Err(e) => {
+            eprintln!("lasio: {}", e);
+            ExitCode::FAILURE
+        }
+    }
+}
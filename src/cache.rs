@@ -0,0 +1,396 @@
+//! Persistent on-disk cache of parsed files.
+//!
+//! Every entry holds one parsed file for one set of read options. It is a
+//! single binary file: a magic tag, a JSON header (the header sections, the
+//! matrix shape, the typed column layout and the stamp of the source file)
+//! and then the raw column data, 8-byte aligned and in native byte order.
+//!
+//! A hit maps the entry and copies every column straight into place, so no
+//! text is parsed. An entry is only used while the source file keeps the
+//! size and modification time (and, optionally, the content hash) it had
+//! when the entry was written. When the directory grows past its size
+//! budget, the least recently used entries are removed.
+use crate::index::modified_nanos;
+use crate::reader::ReadOptions;
+use crate::{Column, DType, LASFile, LasError, TextColumn};
+use memmap2::Mmap;
+use ndarray::{Array1, Array2, ShapeBuilder};
+use serde::{Deserialize, Serialize};
+use std::fs::{self, File};
+use std::io::{self, BufWriter, Write};
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::time::{Duration, SystemTime};
+use xxhash_rust::xxh3::xxh3_64;
+
+const MAGIC: &[u8; 8] = b"LASRSC01";
+
+/// File extension of cache entries.
+pub const EXTENSION: &str = "lascache";
+
+/// Default size budget of a cache directory (1 GiB).
+pub const DEFAULT_MAX_BYTES: u64 = 1 << 30;
+
+/// Age after which a temporary file is taken to be left over by a writer
+/// that died, and is removed on eviction.
+const STALE_TEMP: Duration = Duration::from_secs(3600);
+
+/// How a cache entry is checked against its source file.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
+pub enum CacheValidation {
+    /// Size and modification time only.
+    #[default]
+    Stat,
+    /// Size, modification time and a hash of the whole file.
+    Hash,
+}
+
+impl CacheValidation {
+    /// Parse `"stat"` or `"hash"`.
+    pub fn parse(name: &str) -> Result<Self, LasError> {
+        match name {
+            "stat" => Ok(CacheValidation::Stat),
+            "hash" => Ok(CacheValidation::Hash),
+            _ => Err(LasError::InvalidOptions(format!(
+                "cache validation must be 'stat' or 'hash', got '{}'",
+                name
+            ))),
+        }
+    }
+}
+
+/// Where and how parsed files are cached.
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub struct CacheOptions {
+    /// Directory holding the entries; created on first use.
+    pub dir: PathBuf,
+    /// Size budget of the directory, in bytes.
+    pub max_bytes: u64,
+    pub validation: CacheValidation,
+}
+
+impl CacheOptions {
+    pub fn new<P: AsRef<Path>>(dir: P) -> Self {
+        Self { dir: dir.as_ref().to_path_buf(), max_bytes: DEFAULT_MAX_BYTES, validation: CacheValidation::default() }
+    }
+}
+
+#[derive(Serialize, Deserialize)]
+struct ColumnHeader {
+    mnemonic: String,
+    dtype: String,
+    /// Dictionary of string columns.
+    #[serde(default)]
+    values: Vec<String>,
+}
+
+#[derive(Serialize, Deserialize)]
+struct EntryHeader {
+    source: PathBuf,
+    options: String,
+    source_len: u64,
+    source_modified: u64,
+    source_hash: Option<u64>,
+    little_endian: bool,
+    las: LASFile,
+    nrows: usize,
+    ncols: usize,
+    columns: Vec<ColumnHeader>,
+}
+
+/// Types written as their raw in-memory bytes.
+///
+/// SAFETY: implementors have no padding and every bit pattern is a valid
+/// value.
+unsafe trait Plain: Copy {}
+unsafe impl Plain for f64 {}
+unsafe impl Plain for f32 {}
+unsafe impl Plain for i64 {}
+unsafe impl Plain for i32 {}
+unsafe impl Plain for u8 {}
+
+fn align8(n: usize) -> usize {
+    (n + 7) & !7
+}
+
+/// Append `values` and pad to the next 8-byte boundary.
+fn put<T: Plain>(out: &mut impl Write, values: &[T], written: &mut usize) -> io::Result<()> {
+    // SAFETY: `Plain` types have no padding, so all these bytes are initialised.
+    let bytes = unsafe { std::slice::from_raw_parts(values.as_ptr().cast::<u8>(), std::mem::size_of_val(values)) };
+    out.write_all(bytes)?;
+    *written += bytes.len();
+    let padding = align8(*written) - *written;
+    out.write_all(&[0; 8][..padding])?;
+    *written += padding;
+    Ok(())
+}
+
+/// Reads the aligned segments of a mapped entry in order.
+struct Segments<'a> {
+    bytes: &'a [u8],
+    pos: usize,
+}
+
+impl Segments<'_> {
+    fn take<T: Plain>(&mut self, n: usize) -> Option<Vec<T>> {
+        let end = self.pos.checked_add(n.checked_mul(std::mem::size_of::<T>())?)?;
+        let bytes = self.bytes.get(self.pos..end)?;
+        self.pos = align8(end);
+        // SAFETY: every bit pattern is a valid `Plain` value.
+        let (head, values, tail) = unsafe { bytes.align_to::<T>() };
+        (head.is_empty() && tail.is_empty()).then(|| values.to_vec())
+    }
+}
+
+/// Temporary files written by this process so far, to name the next one.
+static TEMP_FILES: AtomicU64 = AtomicU64::new(0);
+
+/// Temporary file of an entry being written, removed when dropped: after a
+/// failed write, a failed rename or a panic, nothing is left behind (after
+/// a successful rename there is nothing left to remove).
+struct TempFile(PathBuf);
+
+impl Drop for TempFile {
+    fn drop(&mut self) {
+        let _ = fs::remove_file(&self.0);
+    }
+}
+
+/// The read options that change what is parsed, as a stable string.
+fn options_key(options: &ReadOptions) -> String {
+    let mut dtypes: Vec<(&str, &str)> = options.dtypes.iter().map(|(m, d)| (m.as_str(), d.name())).collect();
+    dtypes.sort_unstable();
+    format!(
+        "curves={:?};rows={:?};depth_range={:?};nulls={:?};errors={:?};dtype={};dtypes={:?};encoding={}",
+        options.curves,
+        options.rows,
+        options.depth_range,
+        options.nulls,
+        options.errors,
+        options.dtype.name(),
+        dtypes,
+        options.encoding.name()
+    )
+}
+
+/// The cache entry of one source file read with one set of options.
+pub(crate) struct CacheEntry {
+    path: PathBuf,
+    dir: PathBuf,
+    max_bytes: u64,
+    source: PathBuf,
+    options: String,
+    source_len: u64,
+    source_modified: u64,
+    source_hash: Option<u64>,
+}
+
+impl CacheEntry {
+    /// Entry for `path`, whose open handle is `file` and contents `bytes`.
+    pub(crate) fn new(cache: &CacheOptions, path: &Path, file: &File, bytes: &[u8], options: &ReadOptions) -> io::Result<Self> {
+        let metadata = file.metadata()?;
+        let source = fs::canonicalize(path).unwrap_or_else(|_| path.to_path_buf());
+        let options = options_key(options);
+        // XXH3 is a fixed algorithm, so entry names and content hashes stay
+        // valid across Rust releases and rebuilds of the extension.
+        let key = format!("{}\0{}", source.to_string_lossy(), options);
+        Ok(Self {
+            path: cache.dir.join(format!("{:016x}.{}", xxh3_64(key.as_bytes()), EXTENSION)),
+            dir: cache.dir.clone(),
+            max_bytes: cache.max_bytes,
+            source,
+            options,
+            source_len: metadata.len(),
+            source_modified: modified_nanos(&metadata),
+            source_hash: match cache.validation {
+                CacheValidation::Stat => None,
+                CacheValidation::Hash => Some(xxh3_64(bytes)),
+            },
+        })
+    }
+
+    fn matches(&self, header: &EntryHeader) -> bool {
+        header.source == self.source
+            && header.options == self.options
+            && header.source_len == self.source_len
+            && header.source_modified == self.source_modified
+            && (self.source_hash.is_none() || header.source_hash == self.source_hash)
+            && header.little_endian == cfg!(target_endian = "little")
+    }
+
+    /// The cached file, if there is a current entry.
+    ///
+    /// A missing, stale or unreadable entry is a miss, never an error.
+    pub(crate) fn load(&self) -> Option<LASFile> {
+        let file = File::open(&self.path).ok()?;
+        // SAFETY: entries are only ever replaced by renaming a new file over
+        // them, never modified in place.
+        let mmap = unsafe { Mmap::map(&file) }.ok()?;
+        let las = self.decode(&mmap)?;
+        // The modification time of an entry is its last use, for eviction.
+        let _ = File::options().write(true).open(&self.path).and_then(|f| f.set_modified(SystemTime::now()));
+        Some(las)
+    }
+
+    fn decode(&self, bytes: &[u8]) -> Option<LASFile> {
+        let rest = bytes.strip_prefix(MAGIC)?;
+        let header_len = usize::try_from(u64::from_le_bytes(rest.get(..8)?.try_into().ok()?)).ok()?;
+        let header: EntryHeader = serde_json::from_slice(rest.get(8..8usize.checked_add(header_len)?)?).ok()?;
+        if !self.matches(&header) {
+            return None;
+        }
+        let mut segments = Segments { bytes, pos: align8(MAGIC.len() + 8 + header_len) };
+        let nrows = header.nrows;
+        let mut las = header.las;
+        las.data = Array2::from_shape_vec((nrows, header.ncols).f(), segments.take(nrows.checked_mul(header.ncols)?)?).ok()?;
+        for column in header.columns {
+            let values = match DType::parse(&column.dtype).ok()? {
+                DType::Float64 => Column::Float64(Array1::from_vec(segments.take(nrows)?)),
+                DType::Float32 => Column::Float32(Array1::from_vec(segments.take(nrows)?)),
+                DType::Int64 => Column::Int64 {
+                    values: Array1::from_vec(segments.take(nrows)?),
+                    valid: segments.take::<u8>(nrows)?.into_iter().map(|v| v != 0).collect(),
+                },
+                DType::Text => Column::Text(TextColumn { codes: segments.take(nrows)?, values: column.values }),
+            };
+            las.columns.insert(column.mnemonic, values);
+        }
+        Some(las)
+    }
+
+    /// Write `las` as this entry, then trim the directory to its budget.
+    ///
+    /// Failing to write (for example in a read-only directory) is not an
+    /// error; the next read simply parses the file again.
+    pub(crate) fn store(&self, las: &LASFile) {
+        if self.write(las).is_ok() {
+            evict(&self.dir, self.max_bytes);
+        }
+    }
+
+    fn write(&self, las: &LASFile) -> io::Result<()> {
+        let nrows = las.data.nrows();
+        let not_contiguous = || io::Error::new(io::ErrorKind::InvalidData, "curve data is not contiguous");
+        // Column-major storage is the transpose of a standard layout.
+        if !las.data.t().is_standard_layout() {
+            return Err(not_contiguous());
+        }
+        let matrix = las.data.as_slice_memory_order().ok_or_else(not_contiguous)?;
+        let header = EntryHeader {
+            source: self.source.clone(),
+            options: self.options.clone(),
+            source_len: self.source_len,
+            source_modified: self.source_modified,
+            source_hash: self.source_hash,
+            little_endian: cfg!(target_endian = "little"),
+            las: LASFile {
+                version: las.version.clone(),
+                well: las.well.clone(),
+                curves: las.curves.clone(),
+                params: las.params.clone(),
+                other: las.other.clone(),
+                ..Default::default()
+            },
+            nrows,
+            ncols: las.data.ncols(),
+            columns: las
+                .columns
+                .iter()
+                .map(|(mnemonic, column)| ColumnHeader {
+                    mnemonic: mnemonic.clone(),
+                    dtype: column.dtype().name().to_string(),
+                    values: match column {
+                        Column::Text(text) => text.values.clone(),
+                        _ => Vec::new(),
+                    },
+                })
+                .collect(),
+        };
+        let header = serde_json::to_vec(&header).map_err(io::Error::from)?;
+
+        fs::create_dir_all(&self.dir)?;
+        // Write under a temporary name unique to this process and store, and
+        // rename, so readers (and other threads or processes storing the same
+        // entry) never see a partial file.
+        let serial = TEMP_FILES.fetch_add(1, Ordering::Relaxed);
+        let tmp = TempFile(self.path.with_extension(format!("{}.{}.{}.tmp", EXTENSION, std::process::id(), serial)));
+        let mut out = BufWriter::new(File::options().write(true).create_new(true).open(&tmp.0)?);
+        let mut written = 0;
+        put(&mut out, &MAGIC[..], &mut written)?;
+        out.write_all(&(header.len() as u64).to_le_bytes())?;
+        written += 8;
+        put(&mut out, &header[..], &mut written)?;
+        put(&mut out, matrix, &mut written)?;
+        for column in las.columns.values() {
+            match column {
+                Column::Float64(values) => put(&mut out, values.as_slice().ok_or_else(not_contiguous)?, &mut written)?,
+                Column::Float32(values) => put(&mut out, values.as_slice().ok_or_else(not_contiguous)?, &mut written)?,
+                Column::Int64 { values, valid } => {
+                    put(&mut out, values.as_slice().ok_or_else(not_contiguous)?, &mut written)?;
+                    let valid: Vec<u8> = valid.iter().map(|&v| v as u8).collect();
+                    put(&mut out, &valid[..], &mut written)?;
+                }
+                Column::Text(text) => put(&mut out, &text.codes[..], &mut written)?,
+            }
+        }
+        out.into_inner().map_err(|e| e.into_error())?.sync_all()?;
+        fs::rename(&tmp.0, &self.path)
+    }
+}
+
+/// Whether `path` is the temporary file of an entry being written.
+fn is_temp_file(path: &Path) -> bool {
+    let name = path.file_name().map(|name| name.to_string_lossy()).unwrap_or_default();
+    name.ends_with(".tmp") && name.contains(&format!(".{}.", EXTENSION))
+}
+
+fn dir_files(dir: &Path, keep: fn(&Path) -> bool) -> impl Iterator<Item = (PathBuf, fs::Metadata)> {
+    fs::read_dir(dir)
+        .into_iter()
+        .flatten()
+        .filter_map(Result::ok)
+        .map(|entry| entry.path())
+        .filter(move |path| keep(path))
+        .filter_map(|path| fs::metadata(&path).ok().map(|metadata| (path, metadata)))
+}
+
+fn cache_files(dir: &Path) -> impl Iterator<Item = (PathBuf, fs::Metadata)> {
+    dir_files(dir, |path| path.extension().map_or(false, |ext| ext == EXTENSION))
+}
+
+/// Remove the least recently used entries of `dir` until the rest fit in
+/// `max_bytes`, and any temporary file a writer left behind over an hour ago.
+pub fn evict(dir: &Path, max_bytes: u64) {
+    let now = SystemTime::now();
+    for (path, metadata) in dir_files(dir, is_temp_file) {
+        let age = metadata.modified().ok().and_then(|modified| now.duration_since(modified).ok());
+        if age.map_or(false, |age| age > STALE_TEMP) {
+            let _ = fs::remove_file(path);
+        }
+    }
+    let mut entries: Vec<(SystemTime, u64, PathBuf)> = cache_files(dir)
+        .map(|(path, metadata)| (metadata.modified().unwrap_or(SystemTime::UNIX_EPOCH), metadata.len(), path))
+        .collect();
+    // Most recently used first; everything past the budget goes.
+    entries.sort_by(|a, b| b.0.cmp(&a.0));
+    let mut total = 0u64;
+    for (_, len, path) in entries {
+        total = total.saturating_add(len);
+        if total > max_bytes {
+            let _ = fs::remove_file(path);
+        }
+    }
+}
+
+/// Remove every entry of the cache directory `dir`, and every temporary
+/// file of an entry being written.
+pub fn clear(dir: &Path) -> io::Result<()> {
+    for (path, _) in cache_files(dir).chain(dir_files(dir, is_temp_file)) {
+        match fs::remove_file(path) {
+            // A writer may have renamed or removed its temporary file meanwhile.
+            Err(e) if e.kind() == io::ErrorKind::NotFound => {}
+            result => result?,
+        }
+    }
+    Ok(())
+}
@@ -0,0 +1,147 @@
+//! Header-only scans of whole well archives.
+//!
+//! Every file is read up to its ~ASCII marker only, on a rayon pool, and
+//! reduced to one [`HeaderSummary`] row for cataloguing.
+use crate::batch::build_pool;
+use crate::reader::read_las_header;
+use crate::{LASFile, LasError, SectionItems};
+use rayon::prelude::*;
+use serde::Serialize;
+use std::fs;
+use std::path::{Path, PathBuf};
+
+/// Catalogue row for one LAS file.
+#[derive(Debug, Clone, PartialEq, Serialize)]
+pub struct HeaderSummary {
+    pub path: PathBuf,
+    pub well: Option<String>,
+    pub uwi: Option<String>,
+    /// STRT / STOP / STEP / NULL from ~Well; NaN when missing or not a number.
+    pub strt: f64,
+    pub stop: f64,
+    pub step: f64,
+    pub null: f64,
+    /// Curve mnemonics, in column order.
+    pub curves: Vec<String>,
+    /// Why the file could not be read, if it could not.
+    pub error: Option<String>,
+}
+
+fn text_value(section: &SectionItems, mnemonic: &str) -> Option<String> {
+    section
+        .items
+        .get(mnemonic)
+        .map(|item| item.value.trim().to_string())
+        .filter(|value| !value.is_empty())
+}
+
+fn number_value(section: &SectionItems, mnemonic: &str) -> f64 {
+    section
+        .items
+        .get(mnemonic)
+        .and_then(|item| item.value.trim().parse().ok())
+        .unwrap_or(f64::NAN)
+}
+
+impl HeaderSummary {
+    pub fn new(path: &Path, las: &LASFile) -> Self {
+        Self {
+            path: path.to_path_buf(),
+            well: text_value(&las.well, "WELL"),
+            uwi: text_value(&las.well, "UWI"),
+            strt: number_value(&las.well, "STRT"),
+            stop: number_value(&las.well, "STOP"),
+            step: number_value(&las.well, "STEP"),
+            null: number_value(&las.well, "NULL"),
+            curves: las.curves.items.keys().cloned().collect(),
+            error: None,
+        }
+    }
+
+    fn failed(path: &Path, error: &LasError) -> Self {
+        Self {
+            path: path.to_path_buf(),
+            well: None,
+            uwi: None,
+            strt: f64::NAN,
+            stop: f64::NAN,
+            step: f64::NAN,
+            null: f64::NAN,
+            curves: Vec::new(),
+            error: Some(error.to_string()),
+        }
+    }
+}
+
+fn is_las_file(path: &Path) -> bool {
+    path.is_file() && path.extension().map_or(false, |ext| ext.eq_ignore_ascii_case("las"))
+}
+
+/// Collect the LAS files below `dir`.
+///
+/// A directory or entry that cannot be read is kept as a path of its own, so
+/// the scan reports it as a failed row instead of aborting, and the walk
+/// goes on with the next entry. Symbolic links to directories are not
+/// followed, so a link loop cannot recurse forever.
+fn walk(dir: &Path, found: &mut Vec<PathBuf>) {
+    let Ok(entries) = fs::read_dir(dir) else {
+        found.push(dir.to_path_buf());
+        return;
+    };
+    for entry in entries {
+        let Ok(entry) = entry else {
+            found.push(dir.to_path_buf());
+            continue;
+        };
+        let path = entry.path();
+        match entry.file_type() {
+            Ok(kind) if kind.is_dir() => walk(&path, found),
+            Ok(_) if is_las_file(&path) => found.push(path),
+            Ok(_) => {}
+            Err(_) => found.push(path),
+        }
+    }
+}
+
+/// The LAS files named by `source`: every `*.las` file (any case) below a
+/// directory, or the files matching a glob pattern such as `logs/**/*.LAS`.
+///
+/// Paths are sorted so that scans are reproducible. Directories that cannot
+/// be listed are returned too, so that the scan (or validation, or
+/// conversion) records them as failed rows; only an invalid pattern is an
+/// error.
+pub fn expand_paths(source: &str) -> Result<Vec<PathBuf>, LasError> {
+    let mut found = Vec::new();
+    if Path::new(source).is_dir() {
+        walk(Path::new(source), &mut found);
+    } else {
+        let paths = glob::glob(source).map_err(|e| LasError::InvalidOptions(format!("{}: {}", source, e)))?;
+        for path in paths {
+            match path {
+                Ok(path) if path.is_file() => found.push(path),
+                Ok(_) => {}
+                Err(e) => found.push(e.path().to_path_buf()),
+            }
+        }
+    }
+    found.sort();
+    found.dedup();
+    Ok(found)
+}
+
+/// Read the headers of every file in `paths` on a pool of `workers` threads.
+///
+/// Rows come back in input order. A file that cannot be read still gets a
+/// row, with `error` set, so one bad file never aborts a scan.
+pub fn scan_headers(paths: &[PathBuf], workers: Option<usize>) -> Result<Vec<HeaderSummary>, LasError> {
+    let pool = build_pool(workers)?;
+    Ok(pool.install(|| {
+        paths
+            .par_iter()
+            .map(|path| match read_las_header(path) {
+                Ok(las) => HeaderSummary::new(path, &las),
+                Err(e) => HeaderSummary::failed(path, &e),
+            })
+            .collect()
+    }))
+}
@@ -0,0 +1,158 @@
+//! Compact and typed storage for curves that are not read as float64.
+use crate::{CurveItem, LasError};
+use ndarray::Array1;
+
+/// Storage type of one curve.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
+pub enum DType {
+    /// Kept in the file's column-major `data` matrix.
+    #[default]
+    Float64,
+    Float32,
+    Int64,
+    /// Dictionary-encoded strings.
+    Text,
+}
+
+impl DType {
+    /// Parse a NumPy-style name such as `"float32"`, `"int64"` or `"str"`.
+    pub fn parse(name: &str) -> Result<Self, LasError> {
+        match name.trim().to_ascii_lowercase().as_str() {
+            "float64" | "f8" | "float" | "double" => Ok(DType::Float64),
+            "float32" | "f4" | "single" => Ok(DType::Float32),
+            "int64" | "i8" | "int" => Ok(DType::Int64),
+            "str" | "string" | "text" | "object" | "category" => Ok(DType::Text),
+            _ => Err(LasError::InvalidOptions(format!(
+                "unsupported dtype '{}', expected float64, float32, int64 or str",
+                name
+            ))),
+        }
+    }
+
+    /// Canonical name, as accepted by [`DType::parse`].
+    pub fn name(self) -> &'static str {
+        match self {
+            DType::Float64 => "float64",
+            DType::Float32 => "float32",
+            DType::Int64 => "int64",
+            DType::Text => "str",
+        }
+    }
+
+    /// Type given by the LAS 3.0 format of a curve definition, e.g. `{S}`
+    /// for strings or `{I}` for integers. Float formats (`{F..}`, `{E..}`)
+    /// and curves without a format give `None`.
+    pub fn from_format(curve: &CurveItem) -> Option<Self> {
+        let spec = curve.format_spec()?;
+        match spec.chars().next()?.to_ascii_uppercase() {
+            'F' | 'E' => None,
+            'I' => Some(DType::Int64),
+            // Strings, and date/time formats such as {DD/MM/YYYY}.
+            _ => Some(DType::Text),
+        }
+    }
+}
+
+/// Dictionary-encoded string column.
+#[derive(Debug, Clone, Default, PartialEq)]
+pub struct TextColumn {
+    /// Index into `values` per row; -1 marks a missing value.
+    pub codes: Vec<i32>,
+    /// Distinct strings, in order of first appearance.
+    pub values: Vec<String>,
+}
+
+impl TextColumn {
+    /// Encode one optional string per row.
+    pub fn encode(rows: impl IntoIterator<Item = Option<String>>) -> Self {
+        let mut lookup = std::collections::HashMap::new();
+        let mut column = TextColumn::default();
+        for row in rows {
+            let code = match row {
+                None => -1,
+                Some(value) => *lookup.entry(value).or_insert_with_key(|value| {
+                    column.values.push(value.clone());
+                    column.values.len() as i32 - 1
+                }),
+            };
+            column.codes.push(code);
+        }
+        column
+    }
+
+    /// Value of `row`, or `None` if it is missing.
+    pub fn get(&self, row: usize) -> Option<&str> {
+        let code = *self.codes.get(row)?;
+        self.values.get(usize::try_from(code).ok()?).map(String::as_str)
+    }
+}
+
+/// Values of one curve stored outside the float64 `data` matrix.
+#[derive(Debug, Clone, PartialEq)]
+pub enum Column {
+    Float64(Array1<f64>),
+    Float32(Array1<f32>),
+    /// Integers with a validity flag per row (false for nulls).
+    Int64 { values: Array1<i64>, valid: Vec<bool> },
+    Text(TextColumn),
+}
+
+impl Column {
+    pub fn dtype(&self) -> DType {
+        match self {
+            Column::Float64(_) => DType::Float64,
+            Column::Float32(_) => DType::Float32,
+            Column::Int64 { .. } => DType::Int64,
+            Column::Text(_) => DType::Text,
+        }
+    }
+
+    pub fn len(&self) -> usize {
+        match self {
+            Column::Float64(values) => values.len(),
+            Column::Float32(values) => values.len(),
+            Column::Int64 { values, .. } => values.len(),
+            Column::Text(text) => text.codes.len(),
+        }
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+
+    /// Bytes held by the values (and validity flags or strings).
+    pub fn nbytes(&self) -> usize {
+        match self {
+            Column::Float64(values) => values.len() * 8,
+            Column::Float32(values) => values.len() * 4,
+            Column::Int64 { values, valid } => values.len() * 8 + valid.len(),
+            Column::Text(text) => text.codes.len() * 4 + text.values.iter().map(String::len).sum::<usize>(),
+        }
+    }
+
+    /// The values of `rows`, in that order.
+    pub fn take(&self, rows: &[usize]) -> Column {
+        match self {
+            Column::Float64(values) => Column::Float64(rows.iter().map(|&r| values[r]).collect()),
+            Column::Float32(values) => Column::Float32(rows.iter().map(|&r| values[r]).collect()),
+            Column::Int64 { values, valid } => Column::Int64 {
+                values: rows.iter().map(|&r| values[r]).collect(),
+                valid: rows.iter().map(|&r| valid[r]).collect(),
+            },
+            Column::Text(text) => Column::Text(TextColumn {
+                codes: rows.iter().map(|&r| text.codes[r]).collect(),
+                values: text.values.clone(),
+            }),
+        }
+    }
+
+    /// Numeric value of `row` as `f64`; NaN for nulls and strings.
+    pub fn value_f64(&self, row: usize) -> f64 {
+        match self {
+            Column::Float64(values) => values[row],
+            Column::Float32(values) => values[row] as f64,
+            Column::Int64 { values, valid } if valid[row] => values[row] as f64,
+            _ => f64::NAN,
+        }
+    }
+}
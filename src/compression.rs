@@ -0,0 +1,188 @@
+//! Reading gzip, zstd and zip compressed LAS files.
+//!
+//! Compression is recognised by the magic bytes at the start of the input, so
+//! file names do not matter. Whole-file reads decompress straight into memory
+//! and parse the result in parallel; streaming reads decompress on a
+//! background thread that hands decoded blocks to the parser through a
+//! bounded channel, so decompression overlaps with parsing.
+use crate::LasError;
+use flate2::read::MultiGzDecoder;
+use std::borrow::Cow;
+use std::fs::File;
+use std::io::{self, BufRead, BufReader, Cursor, Read, Seek};
+use std::path::Path;
+use std::sync::mpsc::{sync_channel, Receiver};
+use std::thread;
+use zip::ZipArchive;
+
+/// Decoded bytes handed over per message by a streaming decoder.
+const STREAM_BLOCK_BYTES: usize = 1 << 20;
+
+/// Decoded blocks a streaming decoder may run ahead of the parser.
+const STREAM_BLOCKS: usize = 4;
+
+/// Largest output, as a multiple of the input size, reserved up front from a
+/// size read out of the input itself; beyond it the output grows as decoded.
+const MAX_SIZE_HINT_RATIO: usize = 64;
+
+/// Container format of a LAS input.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum Compression {
+    None,
+    Gzip,
+    Zstd,
+    Zip,
+}
+
+impl Compression {
+    /// Format of an input starting with `head`.
+    pub fn detect(head: &[u8]) -> Self {
+        match head {
+            [0x1f, 0x8b, ..] => Compression::Gzip,
+            [0x28, 0xb5, 0x2f, 0xfd, ..] => Compression::Zstd,
+            [b'P', b'K', 0x03, 0x04, ..] => Compression::Zip,
+            _ => Compression::None,
+        }
+    }
+}
+
+/// Index of the LAS member of a zip archive: the first file named `*.las`
+/// (any case), or else the first file.
+fn zip_member<R: Read + Seek>(archive: &mut ZipArchive<R>) -> Result<usize, LasError> {
+    let mut first = None;
+    for i in 0..archive.len() {
+        let entry = archive.by_index(i).map_err(|e| LasError::Archive(e.to_string()))?;
+        if !entry.is_file() {
+            continue;
+        }
+        if entry.name().to_ascii_lowercase().ends_with(".las") {
+            return Ok(i);
+        }
+        first.get_or_insert(i);
+    }
+    first.ok_or_else(|| LasError::Archive("zip archive holds no files".to_string()))
+}
+
+/// Bytes to reserve for an output that `compressed` claims decodes to
+/// `claimed` bytes. The claim is not trusted beyond [`MAX_SIZE_HINT_RATIO`],
+/// so a forged or corrupt size cannot allocate gigabytes up front.
+fn size_hint(claimed: u64, compressed: &[u8]) -> usize {
+    claimed.min(compressed.len().saturating_mul(MAX_SIZE_HINT_RATIO) as u64) as usize
+}
+
+/// Uncompressed size of a gzip stream, from its trailer (modulo 4 GiB).
+fn gzip_size_hint(bytes: &[u8]) -> usize {
+    let claimed = match bytes.len().checked_sub(4) {
+        Some(at) => u32::from_le_bytes([bytes[at], bytes[at + 1], bytes[at + 2], bytes[at + 3]]),
+        None => 0,
+    };
+    size_hint(claimed as u64, bytes)
+}
+
+/// The contents of `bytes` decompressed, or `bytes` itself if they are not
+/// compressed.
+pub fn decompress(bytes: &[u8]) -> Result<Cow<'_, [u8]>, LasError> {
+    let mut out = Vec::new();
+    match Compression::detect(bytes) {
+        Compression::None => return Ok(Cow::Borrowed(bytes)),
+        Compression::Gzip => {
+            out.reserve(gzip_size_hint(bytes));
+            MultiGzDecoder::new(bytes).read_to_end(&mut out)?;
+        }
+        Compression::Zstd => {
+            zstd::stream::read::Decoder::with_buffer(bytes)?.read_to_end(&mut out)?;
+        }
+        Compression::Zip => {
+            let mut archive = ZipArchive::new(Cursor::new(bytes)).map_err(|e| LasError::Archive(e.to_string()))?;
+            let member = zip_member(&mut archive)?;
+            let mut entry = archive.by_index(member).map_err(|e| LasError::Archive(e.to_string()))?;
+            out.reserve(size_hint(entry.size(), bytes));
+            entry.read_to_end(&mut out)?;
+        }
+    }
+    Ok(Cow::Owned(out))
+}
+
+/// Consumer side of a streaming decoder.
+struct ChannelReader {
+    receiver: Receiver<io::Result<Vec<u8>>>,
+    block: Vec<u8>,
+    pos: usize,
+}
+
+impl Read for ChannelReader {
+    fn read(&mut self, buf: &mut [u8]) -> io::Result<usize> {
+        let available = self.fill_buf()?;
+        let n = available.len().min(buf.len());
+        buf[..n].copy_from_slice(&available[..n]);
+        self.consume(n);
+        Ok(n)
+    }
+}
+
+impl BufRead for ChannelReader {
+    fn fill_buf(&mut self) -> io::Result<&[u8]> {
+        while self.pos == self.block.len() {
+            match self.receiver.recv() {
+                Ok(Ok(block)) => {
+                    self.block = block;
+                    self.pos = 0;
+                }
+                Ok(Err(e)) => return Err(e),
+                // The decoder is done.
+                Err(_) => break,
+            }
+        }
+        Ok(&self.block[self.pos..])
+    }
+
+    fn consume(&mut self, amount: usize) {
+        self.pos = (self.pos + amount).min(self.block.len());
+    }
+}
+
+/// Decode all of `decoder` into blocks sent down `sender`.
+fn pump(mut decoder: impl Read, sender: &std::sync::mpsc::SyncSender<io::Result<Vec<u8>>>) -> io::Result<()> {
+    loop {
+        let mut block = Vec::with_capacity(STREAM_BLOCK_BYTES);
+        let n = decoder.by_ref().take(STREAM_BLOCK_BYTES as u64).read_to_end(&mut block)?;
+        // A closed receiver means the reader was dropped; stop decoding.
+        if n == 0 || sender.send(Ok(block)).is_err() {
+            return Ok(());
+        }
+    }
+}
+
+/// Buffered reader over the LAS text of the file at `path`.
+///
+/// Plain files are read directly. Compressed ones are decoded on a
+/// background thread, at most a few blocks ahead of the consumer.
+pub fn open_stream<P: AsRef<Path>>(path: P) -> Result<Box<dyn BufRead + Send>, LasError> {
+    let mut reader = BufReader::new(File::open(path)?);
+    let compression = Compression::detect(reader.fill_buf()?);
+    if compression == Compression::None {
+        return Ok(Box::new(reader));
+    }
+    let (sender, receiver) = sync_channel(STREAM_BLOCKS);
+    thread::spawn(move || {
+        let result = match compression {
+            Compression::Gzip => pump(MultiGzDecoder::new(reader), &sender),
+            Compression::Zstd => zstd::stream::read::Decoder::with_buffer(reader).and_then(|d| pump(d, &sender)),
+            _ => ZipArchive::new(reader)
+                .map_err(|e| LasError::Archive(e.to_string()))
+                .and_then(|mut archive| {
+                    let member = zip_member(&mut archive)?;
+                    let entry = archive.by_index(member).map_err(|e| LasError::Archive(e.to_string()))?;
+                    Ok(pump(entry, &sender)?)
+                })
+                .map_err(|e| match e {
+                    LasError::Io(e) => e,
+                    e => io::Error::new(io::ErrorKind::InvalidData, e.to_string()),
+                }),
+        };
+        if let Err(e) = result {
+            let _ = sender.send(Err(e));
+        }
+    });
+    Ok(Box::new(ChannelReader { receiver, block: Vec::new(), pos: 0 }))
+}
@@ -0,0 +1,258 @@
+//! Bulk conversion of LAS files to Parquet, Arrow IPC, CSV and NDJSON.
+//!
+//! Every file is streamed through [`AsciiChunks`] and each block is written
+//! as soon as it is parsed, so memory stays bounded by the block size
+//! whatever the size of the file. Batches of files are converted on a rayon
+//! pool, one file per task.
+use crate::arrow_export::{block_record_batch, block_schema};
+use crate::batch::build_pool;
+use crate::reader::ReadOptions;
+use crate::stream::AsciiChunks;
+use crate::LasError;
+use arrow::csv;
+use arrow::datatypes::Schema;
+use arrow::ipc::writer::FileWriter;
+use arrow::json::LineDelimitedWriter;
+use arrow::record_batch::RecordBatch;
+use parquet::arrow::ArrowWriter;
+use parquet::basic::{Compression, ZstdLevel};
+use parquet::file::properties::WriterProperties;
+use rayon::prelude::*;
+use serde::Serialize;
+use std::collections::{HashMap, HashSet};
+use std::fmt::Display;
+use std::fs::{self, File};
+use std::io::{BufWriter, Write};
+use std::path::{Path, PathBuf};
+use std::sync::Arc;
+use std::time::Instant;
+
+/// Schema metadata key holding the LAS headers as JSON, in the formats that
+/// keep schema metadata (Parquet and Arrow IPC).
+pub const HEADER_KEY: &str = "las_header";
+
+/// Output format of a conversion.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum Format {
+    /// Zstd-compressed Parquet.
+    Parquet,
+    /// Arrow IPC file (Feather v2).
+    Arrow,
+    /// CSV with a header line; missing values are empty fields.
+    Csv,
+    /// One JSON object per row; missing values are left out.
+    Ndjson,
+}
+
+impl Format {
+    /// Parse `"parquet"`, `"arrow"` (or `"ipc"`, `"feather"`), `"csv"` or
+    /// `"ndjson"` (or `"jsonl"`).
+    pub fn parse(name: &str) -> Result<Self, LasError> {
+        match name.trim().to_ascii_lowercase().as_str() {
+            "parquet" => Ok(Format::Parquet),
+            "arrow" | "ipc" | "feather" => Ok(Format::Arrow),
+            "csv" => Ok(Format::Csv),
+            "ndjson" | "jsonl" => Ok(Format::Ndjson),
+            _ => Err(LasError::InvalidOptions(format!(
+                "format must be 'parquet', 'arrow', 'csv' or 'ndjson', got '{}'",
+                name
+            ))),
+        }
+    }
+
+    /// Extension of the files written in this format.
+    pub fn extension(self) -> &'static str {
+        match self {
+            Format::Parquet => "parquet",
+            Format::Arrow => "arrow",
+            Format::Csv => "csv",
+            Format::Ndjson => "ndjson",
+        }
+    }
+}
+
+fn export_err(e: impl Display) -> LasError {
+    LasError::Export(e.to_string())
+}
+
+/// Writer of one output, fed batch by batch.
+enum Sink<W: Write + Send> {
+    Parquet(ArrowWriter<W>),
+    Arrow(FileWriter<W>),
+    Csv(csv::Writer<W>),
+    Ndjson(LineDelimitedWriter<W>),
+}
+
+impl<W: Write + Send> Sink<W> {
+    fn new(out: W, format: Format, schema: &Arc<Schema>) -> Result<Self, LasError> {
+        Ok(match format {
+            Format::Parquet => {
+                let properties =
+                    WriterProperties::builder().set_compression(Compression::ZSTD(ZstdLevel::default())).build();
+                Sink::Parquet(ArrowWriter::try_new(out, schema.clone(), Some(properties)).map_err(export_err)?)
+            }
+            Format::Arrow => Sink::Arrow(FileWriter::try_new(out, schema).map_err(export_err)?),
+            Format::Csv => Sink::Csv(csv::Writer::new(out)),
+            Format::Ndjson => Sink::Ndjson(LineDelimitedWriter::new(out)),
+        })
+    }
+
+    fn write(&mut self, batch: &RecordBatch) -> Result<(), LasError> {
+        match self {
+            Sink::Parquet(writer) => writer.write(batch).map_err(export_err),
+            Sink::Arrow(writer) => writer.write(batch).map_err(export_err),
+            Sink::Csv(writer) => writer.write(batch).map_err(export_err),
+            Sink::Ndjson(writer) => writer.write(batch).map_err(export_err),
+        }
+    }
+
+    /// Write any footer and flush the output.
+    fn finish(self) -> Result<(), LasError> {
+        let mut out = match self {
+            Sink::Parquet(writer) => writer.into_inner().map_err(export_err)?,
+            Sink::Arrow(mut writer) => {
+                writer.finish().map_err(export_err)?;
+                writer.into_inner().map_err(export_err)?
+            }
+            Sink::Csv(writer) => writer.into_inner(),
+            Sink::Ndjson(mut writer) => {
+                writer.finish().map_err(export_err)?;
+                writer.into_inner()
+            }
+        };
+        out.flush()?;
+        Ok(())
+    }
+}
+
+/// Stream the curves of the LAS file at `path` to `out` in `format`, in
+/// batches of at most `rows` rows, and return the number of rows written.
+///
+/// Every curve is written as a nullable float64 column with its unit and
+/// description in the field metadata; `options` select curves and null
+/// handling as for [`AsciiChunks`]. Parquet and Arrow IPC outputs also keep
+/// all the headers, as JSON, under [`HEADER_KEY`] in the schema metadata.
+pub fn convert_file<W: Write + Send>(
+    path: &Path,
+    out: W,
+    format: Format,
+    rows: usize,
+    options: &ReadOptions,
+) -> Result<usize, LasError> {
+    let chunks = AsciiChunks::open(path, rows, options)?;
+    let header = serde_json::to_string(chunks.header()).map_err(export_err)?;
+    let schema =
+        Arc::new(block_schema(chunks.curves()).with_metadata(HashMap::from([(HEADER_KEY.to_string(), header)])));
+    let mut sink = Sink::new(out, format, &schema)?;
+    let mut written = 0;
+    for block in chunks {
+        let block = block?;
+        sink.write(&block_record_batch(&schema, &block).map_err(export_err)?)?;
+        written += block.nrows();
+    }
+    sink.finish()?;
+    Ok(written)
+}
+
+/// Outcome of converting one file of a batch.
+#[derive(Debug, Clone, PartialEq, Serialize)]
+pub struct Converted {
+    pub path: PathBuf,
+    /// File written; `None` if the conversion failed.
+    pub output: Option<PathBuf>,
+    pub rows: usize,
+    pub seconds: f64,
+    /// Why the file could not be converted, if it could not.
+    pub error: Option<String>,
+}
+
+/// Deepest directory holding every one of `paths`.
+fn common_parent(paths: &[PathBuf]) -> PathBuf {
+    let mut parents = paths.iter().map(|path| path.parent().unwrap_or(Path::new("")));
+    let Some(first) = parents.next() else {
+        return PathBuf::new();
+    };
+    let mut common = first.to_path_buf();
+    for parent in parents {
+        while !parent.starts_with(&common) {
+            if !common.pop() {
+                return PathBuf::new();
+            }
+        }
+    }
+    common
+}
+
+/// Where the conversion of `path` goes: its place below `root`, mirrored
+/// below `out_dir`, with any `.gz`, `.zst` or `.zip` suffix dropped and the
+/// extension of `format`.
+pub fn output_path(path: &Path, root: &Path, out_dir: &Path, format: Format) -> PathBuf {
+    let mut relative = path.strip_prefix(root).unwrap_or(path).to_path_buf();
+    let compressed = relative.extension().map_or(false, |ext| {
+        ["gz", "zst", "zstd", "zip"].iter().any(|suffix| ext.eq_ignore_ascii_case(suffix))
+    });
+    if compressed {
+        relative.set_extension("");
+    }
+    relative.set_extension(format.extension());
+    match relative.is_absolute() {
+        true => out_dir.join(relative.file_name().unwrap_or_default()),
+        false => out_dir.join(relative),
+    }
+}
+
+/// Convert every file in `paths` into `out_dir` on a pool of `workers`
+/// threads.
+///
+/// Outputs mirror the layout of the inputs below the deepest directory they
+/// share (see [`output_path`]). Results come back in input order, with a
+/// path given more than once converted (and reported) once; a file that
+/// cannot be converted gets an `error` and leaves no partial output, so one
+/// bad file never aborts the batch. Of several inputs mapping to the same
+/// output, such as `a.las` and `a.las.gz`, only the first is converted and
+/// the others get an `error`.
+pub fn convert_files(
+    paths: &[PathBuf],
+    out_dir: &Path,
+    format: Format,
+    rows: usize,
+    options: &ReadOptions,
+    workers: Option<usize>,
+) -> Result<Vec<Converted>, LasError> {
+    let root = common_parent(paths);
+    let mut seen = HashSet::new();
+    let paths: Vec<&PathBuf> = paths.iter().filter(|path| seen.insert(*path)).collect();
+    let outputs: Vec<PathBuf> = paths.iter().map(|path| output_path(path, &root, out_dir, format)).collect();
+    let mut owners: HashMap<&Path, &Path> = HashMap::new();
+    let owners: Vec<&Path> =
+        paths.iter().zip(&outputs).map(|(path, output)| *owners.entry(output.as_path()).or_insert(path.as_path())).collect();
+    let pool = build_pool(workers)?;
+    Ok(pool.install(|| {
+        paths
+            .par_iter()
+            .zip(outputs.par_iter())
+            .zip(owners.par_iter())
+            .map(|((&path, output), &owner)| {
+                if owner != path.as_path() {
+                    let error = format!("{} is also the output of {}", output.display(), owner.display());
+                    return Converted { path: path.clone(), output: None, rows: 0, seconds: 0.0, error: Some(error) };
+                }
+                let start = Instant::now();
+                let result = output
+                    .parent()
+                    .map_or(Ok(()), fs::create_dir_all)
+                    .and_then(|_| File::create(output))
+                    .map_err(LasError::from)
+                    .and_then(|file| convert_file(path, BufWriter::new(file), format, rows, options));
+                let seconds = start.elapsed().as_secs_f64();
+                match result {
+                    Ok(rows) => Converted { path: path.clone(), output: Some(output.clone()), rows, seconds, error: None },
+                    Err(e) => {
+                        let _ = fs::remove_file(output);
+                        Converted { path: path.clone(), output: None, rows: 0, seconds, error: Some(e.to_string()) }
+                    }
+                }
+            })
+            .collect()
+    }))
+}
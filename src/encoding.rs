@@ -0,0 +1,192 @@
+//! Text encodings of LAS files.
+//!
+//! Header lines (and string data values) are decoded from the file's
+//! encoding, detected or given. Numbers are the same bytes in every
+//! ASCII-compatible encoding, so the ~ASCII section of such files is parsed
+//! straight from the input without transcoding. Only UTF-16 files, marked by
+//! a byte order mark, are converted to UTF-8 as a whole: in memory for
+//! whole-file reads, block by block for streaming reads.
+use crate::LasError;
+use encoding_rs::{CoderResult, Decoder, Encoding, UTF_8, WINDOWS_1252};
+use std::borrow::Cow;
+use std::io::{self, BufRead, Read};
+
+/// Raw bytes transcoded per step of a [`Utf8Reader`].
+const TRANSCODE_BLOCK_BYTES: usize = 1 << 16;
+
+/// Text encoding of a LAS input.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
+pub enum TextEncoding {
+    /// A byte order mark if there is one; otherwise UTF-8 where the text is
+    /// valid UTF-8 and Windows-1252 (a superset of Latin-1) where it is not.
+    #[default]
+    Auto,
+    /// This encoding, unless a byte order mark says otherwise.
+    Fixed(&'static Encoding),
+}
+
+impl TextEncoding {
+    /// Parse `"auto"`, a WHATWG label such as `"latin1"`, `"cp1252"` or
+    /// `"utf-16le"`, or a Windows code page number such as `"1252"`.
+    pub fn parse(label: &str) -> Result<Self, LasError> {
+        let label = label.trim();
+        if label.is_empty() || label.eq_ignore_ascii_case("auto") {
+            return Ok(TextEncoding::Auto);
+        }
+        let number = label.strip_prefix("cp").or_else(|| label.strip_prefix("CP")).unwrap_or(label);
+        number
+            .parse::<u16>()
+            .ok()
+            .and_then(codepage::to_encoding)
+            .or_else(|| Encoding::for_label(label.as_bytes()))
+            .map(TextEncoding::Fixed)
+            .ok_or_else(|| LasError::InvalidOptions(format!("unknown encoding '{}'", label)))
+    }
+
+    /// Canonical name, as accepted by [`TextEncoding::parse`].
+    pub fn name(self) -> &'static str {
+        match self {
+            TextEncoding::Auto => "auto",
+            TextEncoding::Fixed(encoding) => encoding.name(),
+        }
+    }
+}
+
+/// Decodes the header lines and string values of one input.
+#[derive(Debug, Clone, Copy, Default)]
+pub(crate) struct TextDecoder {
+    /// The encoding once known; `None` while only ASCII has been seen.
+    encoding: Option<&'static Encoding>,
+}
+
+impl TextDecoder {
+    pub(crate) fn new(encoding: TextEncoding) -> Self {
+        match encoding {
+            TextEncoding::Auto => Self { encoding: None },
+            TextEncoding::Fixed(encoding) => Self { encoding: Some(encoding) },
+        }
+    }
+
+    fn encoding_of(&self, bytes: &[u8]) -> &'static Encoding {
+        self.encoding.unwrap_or_else(|| match std::str::from_utf8(bytes) {
+            Ok(_) => UTF_8,
+            Err(_) => WINDOWS_1252,
+        })
+    }
+
+    /// `bytes` as text; valid UTF-8 is borrowed as is.
+    pub(crate) fn decode<'a>(&self, bytes: &'a [u8]) -> Cow<'a, str> {
+        self.encoding_of(bytes).decode_without_bom_handling(bytes).0
+    }
+
+    /// [`TextDecoder::decode`] for the next header line. The first line that
+    /// is not plain ASCII settles the encoding of the rest of the input.
+    pub(crate) fn decode_line<'a>(&mut self, line: &'a [u8]) -> Cow<'a, str> {
+        let encoding = self.encoding_of(line);
+        if !line.is_ascii() {
+            self.encoding.get_or_insert(encoding);
+        }
+        encoding.decode_without_bom_handling(line).0
+    }
+}
+
+/// The encoding of an input starting with `head`, and the length of its
+/// byte order mark (0 if it has none).
+fn with_bom(head: &[u8], encoding: TextEncoding) -> (TextEncoding, usize) {
+    match Encoding::for_bom(head) {
+        Some((encoding, bom)) => (TextEncoding::Fixed(encoding), bom),
+        None => (encoding, 0),
+    }
+}
+
+/// `bytes` without any byte order mark, transcoded to UTF-8 if they are not
+/// ASCII-compatible, with the decoder for the resulting text.
+pub(crate) fn transcode(bytes: &[u8], encoding: TextEncoding) -> (Cow<'_, [u8]>, TextDecoder) {
+    let (encoding, bom) = with_bom(bytes, encoding);
+    match encoding {
+        TextEncoding::Fixed(encoding) if !encoding.is_ascii_compatible() => {
+            let (text, _) = encoding.decode_without_bom_handling(&bytes[bom..]);
+            (Cow::Owned(text.into_owned().into_bytes()), TextDecoder::new(TextEncoding::Fixed(UTF_8)))
+        }
+        _ => (Cow::Borrowed(&bytes[bom..]), TextDecoder::new(encoding)),
+    }
+}
+
+/// Skip the byte order mark of `reader`, if any, and return the decoder for
+/// its text, which must be ASCII-compatible.
+pub(crate) fn skip_bom<R: BufRead>(reader: &mut R, encoding: TextEncoding) -> Result<TextDecoder, LasError> {
+    let (encoding, bom) = with_bom(reader.fill_buf()?, encoding);
+    if let TextEncoding::Fixed(encoding) = encoding {
+        if !encoding.is_ascii_compatible() {
+            return Err(LasError::InvalidOptions(format!("{} text must be read from a file or bytes", encoding.name())));
+        }
+    }
+    reader.consume(bom);
+    Ok(TextDecoder::new(encoding))
+}
+
+/// Reader of UTF-8 text decoded from a reader of another encoding.
+struct Utf8Reader<R> {
+    inner: R,
+    decoder: Decoder,
+    block: Vec<u8>,
+    pos: usize,
+    done: bool,
+}
+
+impl<R: BufRead> Read for Utf8Reader<R> {
+    fn read(&mut self, buf: &mut [u8]) -> io::Result<usize> {
+        let available = self.fill_buf()?;
+        let n = available.len().min(buf.len());
+        buf[..n].copy_from_slice(&available[..n]);
+        self.consume(n);
+        Ok(n)
+    }
+}
+
+impl<R: BufRead> BufRead for Utf8Reader<R> {
+    fn fill_buf(&mut self) -> io::Result<&[u8]> {
+        while self.pos == self.block.len() && !self.done {
+            let raw = self.inner.fill_buf()?;
+            let last = raw.is_empty();
+            let raw = &raw[..raw.len().min(TRANSCODE_BLOCK_BYTES)];
+            let capacity = self.decoder.max_utf8_buffer_length(raw.len()).unwrap_or(4 * raw.len() + 16);
+            self.block.clear();
+            self.block.resize(capacity, 0);
+            self.pos = 0;
+            let (result, read, written, _) = self.decoder.decode_to_utf8(raw, &mut self.block, last);
+            debug_assert!(matches!(result, CoderResult::InputEmpty));
+            self.block.truncate(written);
+            self.inner.consume(read);
+            self.done = last;
+        }
+        Ok(&self.block[self.pos..])
+    }
+
+    fn consume(&mut self, amount: usize) {
+        self.pos = (self.pos + amount).min(self.block.len());
+    }
+}
+
+/// `reader` past any byte order mark, as UTF-8 if its encoding is not
+/// ASCII-compatible, with the decoder for the resulting text.
+pub(crate) fn transcode_stream<'a, R: BufRead + Send + 'a>(
+    mut reader: R,
+    encoding: TextEncoding,
+) -> io::Result<(Box<dyn BufRead + Send + 'a>, TextDecoder)> {
+    let (encoding, bom) = with_bom(reader.fill_buf()?, encoding);
+    reader.consume(bom);
+    match encoding {
+        TextEncoding::Fixed(encoding) if !encoding.is_ascii_compatible() => {
+            let reader = Utf8Reader {
+                inner: reader,
+                decoder: encoding.new_decoder_without_bom_handling(),
+                block: Vec::new(),
+                pos: 0,
+                done: false,
+            };
+            Ok((Box::new(reader), TextDecoder::new(TextEncoding::Fixed(UTF_8))))
+        }
+        _ => Ok((Box::new(reader), TextDecoder::new(encoding))),
+    }
+}
@@ -0,0 +1,21 @@
+use thiserror::Error;
+
+/// Errors raised while reading LAS files.
+#[derive(Debug, Error)]
+pub enum LasError {
+    #[error(transparent)]
+    Io(#[from] std::io::Error),
+    #[error("Curve {0} not found")]
+    CurveNotFound(String),
+    #[error("{0}")]
+    InvalidOptions(String),
+    #[error("Invalid value '{token}' in data row {row}, column {column}")]
+    InvalidValue { row: usize, column: usize, token: String },
+    #[error("{0}")]
+    Archive(String),
+    /// Writing a Parquet, Arrow IPC, CSV or NDJSON output failed.
+    #[error("{0}")]
+    Export(String),
+    #[error(transparent)]
+    ThreadPool(#[from] rayon::ThreadPoolBuildError),
+}
@@ -0,0 +1,344 @@
+//! Sparse row/depth index over the ~ASCII section, used by windowed reads.
+//!
+//! The index samples every [`INDEX_STRIDE`]-th data row with its byte offset
+//! and its first value (the index curve, usually depth). A window is located
+//! by a binary search over the samples plus a scan of at most one stride of
+//! lines at each end, so repeated reads of the same file never rescan the
+//! whole data section. The search needs the depths to be monotonic; files
+//! with reversed or out-of-order depths are filtered line by line instead.
+use crate::reader::{data_lines, split_at_newlines};
+use crate::tokenizer::{parse_f64, tokens};
+use rayon::prelude::*;
+use indexmap::IndexMap;
+use serde::{Deserialize, Serialize};
+use std::ffi::OsString;
+use std::fs::{self, File};
+use std::io;
+use std::ops::Range;
+use std::path::{Path, PathBuf};
+use std::sync::{Arc, Mutex, OnceLock};
+use std::time::UNIX_EPOCH;
+
+/// Data rows between two sampled entries of a [`DepthIndex`].
+pub const INDEX_STRIDE: usize = 1024;
+
+/// Indexes kept by the per-process cache; the least recently used one is
+/// dropped past this.
+pub const MEMORY_CACHE_ENTRIES: usize = 256;
+
+/// Where windowed reads look up and keep their [`DepthIndex`].
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
+pub enum IndexMode {
+    /// Build a throwaway index for every read.
+    Off,
+    /// Keep indexes in a per-process cache keyed by path.
+    #[default]
+    Memory,
+    /// As `Memory`, and also persist them next to the file as `<file>.lasidx`.
+    Sidecar,
+}
+
+#[derive(Debug, Clone, Copy, PartialEq, Serialize, Deserialize)]
+pub struct IndexEntry {
+    /// Data row number, counted from 0 (blank and comment lines excluded).
+    pub row: usize,
+    /// Byte offset of the row from the start of the ~ASCII data.
+    pub offset: usize,
+    /// First value of the row.
+    pub depth: f64,
+}
+
+#[derive(Debug, Clone, PartialEq, Serialize, Deserialize)]
+pub struct DepthIndex {
+    /// Size and modification time (ns since the epoch) of the indexed file.
+    pub file_len: u64,
+    pub modified: u64,
+    /// Byte range of the ~ASCII data within the file.
+    pub data_start: usize,
+    pub data_end: usize,
+    pub nrows: usize,
+    pub entries: Vec<IndexEntry>,
+    /// Whether the depths of all rows never decrease, or never increase, so
+    /// that the samples can be binary searched. Sidecars written before this
+    /// field existed read as not monotonic, which is always correct.
+    #[serde(default)]
+    pub monotonic: bool,
+}
+
+/// Direction of the depths of a run of rows.
+#[derive(Debug, Clone, Copy)]
+struct Trend {
+    first: Option<f64>,
+    last: Option<f64>,
+    increasing: bool,
+    decreasing: bool,
+}
+
+impl Trend {
+    const EMPTY: Trend = Trend { first: None, last: None, increasing: true, decreasing: true };
+
+    fn push(mut self, depth: f64) -> Self {
+        match self.last {
+            Some(last) => {
+                self.increasing &= depth >= last;
+                self.decreasing &= depth <= last;
+            }
+            None => self.first = Some(depth),
+        }
+        self.last = Some(depth);
+        self
+    }
+
+    /// Trend of this run followed by `next`.
+    fn then(self, next: Trend) -> Self {
+        match (self.last, next.first) {
+            (Some(_), Some(first)) => {
+                let mut joined = self.push(first);
+                joined.increasing &= next.increasing;
+                joined.decreasing &= next.decreasing;
+                joined.last = next.last;
+                joined
+            }
+            (None, _) => next,
+            (_, None) => self,
+        }
+    }
+}
+
+fn row_depth(line: &[u8]) -> Option<f64> {
+    // Comma-delimited rows have no whitespace after the first value.
+    let first = tokens(line).next()?.split(|&b| b == b',').next()?;
+    parse_f64(first).filter(|d| !d.is_nan())
+}
+
+/// Data lines of `data` from `offset` on, with their offsets in `data`.
+fn lines_from(data: &[u8], offset: usize) -> impl Iterator<Item = (usize, &[u8])> {
+    let base = data.as_ptr() as usize;
+    data_lines(&data[offset..]).map(move |line| (line.as_ptr() as usize - base, line))
+}
+
+impl DepthIndex {
+    /// Index the ~ASCII data found at `bytes[data_start..data_end]`.
+    pub fn build(bytes: &[u8], data_start: usize, data_end: usize) -> Self {
+        let data = &bytes[data_start..data_end];
+        let chunks = split_at_newlines(data, rayon::current_num_threads() * 4);
+        let summaries: Vec<(usize, Trend)> = chunks
+            .par_iter()
+            .map(|chunk| {
+                data_lines(chunk).fold((0, Trend::EMPTY), |(count, trend), line| match row_depth(line) {
+                    Some(depth) => (count + 1, trend.push(depth)),
+                    None => (count + 1, trend),
+                })
+            })
+            .collect();
+        let mut first_rows = Vec::with_capacity(chunks.len());
+        let mut nrows = 0;
+        let mut trend = Trend::EMPTY;
+        for &(count, chunk_trend) in &summaries {
+            first_rows.push(nrows);
+            nrows += count;
+            trend = trend.then(chunk_trend);
+        }
+
+        let base = data.as_ptr() as usize;
+        let mut entries: Vec<IndexEntry> = chunks
+            .par_iter()
+            .zip(first_rows.par_iter())
+            .flat_map_iter(|(chunk, &first_row)| {
+                data_lines(chunk).enumerate().filter_map(move |(r, line)| {
+                    let row = first_row + r;
+                    if row % INDEX_STRIDE != 0 && row + 1 != nrows {
+                        return None;
+                    }
+                    let depth = row_depth(line)?;
+                    Some(IndexEntry { row, offset: line.as_ptr() as usize - base, depth })
+                })
+            })
+            .collect();
+        entries.sort_by_key(|e| e.row);
+
+        let monotonic = trend.increasing || trend.decreasing;
+        Self { file_len: 0, modified: 0, data_start, data_end, nrows, entries, monotonic }
+    }
+
+    /// Whether the index curve grows down the file.
+    fn is_increasing(&self) -> bool {
+        match (self.entries.first(), self.entries.last()) {
+            (Some(first), Some(last)) => last.depth >= first.depth,
+            _ => true,
+        }
+    }
+
+    /// Byte offset of data row `row` in `data`, or `data.len()` past the end.
+    fn row_offset(&self, data: &[u8], row: usize) -> usize {
+        if row >= self.nrows {
+            return data.len();
+        }
+        let k = self.entries.partition_point(|e| e.row <= row);
+        let (mut current, offset) = match k {
+            0 => (0, 0),
+            _ => (self.entries[k - 1].row, self.entries[k - 1].offset),
+        };
+        for (line_offset, _) in lines_from(data, offset) {
+            if current == row {
+                return line_offset;
+            }
+            current += 1;
+        }
+        data.len()
+    }
+
+    /// Byte offset of the first row whose depth satisfies `pred`, which must
+    /// be false for every row before it and true for every row after it.
+    fn first_offset_where(&self, data: &[u8], pred: impl Fn(f64) -> bool) -> usize {
+        let k = self.entries.partition_point(|e| !pred(e.depth));
+        let offset = match k {
+            0 => 0,
+            _ => self.entries[k - 1].offset,
+        };
+        for (line_offset, line) in lines_from(data, offset) {
+            if row_depth(line).map_or(false, &pred) {
+                return line_offset;
+            }
+        }
+        data.len()
+    }
+
+    /// Byte range of `data` holding data rows `rows`.
+    pub fn rows_window(&self, data: &[u8], rows: Range<usize>) -> Range<usize> {
+        let start = self.row_offset(data, rows.start);
+        let end = self.row_offset(data, rows.end.max(rows.start));
+        start..end
+    }
+
+    /// Byte range of `data` holding the rows whose depth lies between `top`
+    /// and `bottom` (inclusive, in either order and either depth direction).
+    ///
+    /// Only valid for a [`monotonic`](Self::monotonic) index; use
+    /// [`depth_lines`] otherwise.
+    pub fn depth_window(&self, data: &[u8], top: f64, bottom: f64) -> Range<usize> {
+        let (lo, hi) = (top.min(bottom), top.max(bottom));
+        let (start, end) = if self.is_increasing() {
+            (self.first_offset_where(data, |d| d >= lo), self.first_offset_where(data, |d| d > hi))
+        } else {
+            (self.first_offset_where(data, |d| d <= hi), self.first_offset_where(data, |d| d < lo))
+        };
+        start..end.max(start)
+    }
+}
+
+/// The data lines of `data` whose depth lies between `top` and `bottom`
+/// (inclusive, in either order), copied in order into one buffer.
+///
+/// A full scan, for files whose depths are not monotonic.
+pub fn depth_lines(data: &[u8], top: f64, bottom: f64) -> Vec<u8> {
+    let (lo, hi) = (top.min(bottom), top.max(bottom));
+    let parts: Vec<Vec<u8>> = split_at_newlines(data, rayon::current_num_threads() * 4)
+        .par_iter()
+        .map(|chunk| {
+            let mut out = Vec::new();
+            for line in data_lines(chunk).filter(|line| row_depth(line).map_or(false, |d| d >= lo && d <= hi)) {
+                out.extend_from_slice(line);
+                out.push(b'\n');
+            }
+            out
+        })
+        .collect();
+    parts.concat()
+}
+
+/// Modification time of a file in ns since the epoch, or 0 if unknown.
+pub(crate) fn modified_nanos(metadata: &fs::Metadata) -> u64 {
+    metadata
+        .modified()
+        .ok()
+        .and_then(|t| t.duration_since(UNIX_EPOCH).ok())
+        .map_or(0, |d| d.as_nanos() as u64)
+}
+
+/// Per-process indexes by path, least recently used first.
+fn memory_cache() -> &'static Mutex<IndexMap<PathBuf, Arc<DepthIndex>>> {
+    static CACHE: OnceLock<Mutex<IndexMap<PathBuf, Arc<DepthIndex>>>> = OnceLock::new();
+    CACHE.get_or_init(|| Mutex::new(IndexMap::new()))
+}
+
+/// Add `index` to the memory cache as its most recently used entry.
+fn cache_insert(cache: &mut IndexMap<PathBuf, Arc<DepthIndex>>, path: &Path, index: Arc<DepthIndex>) {
+    cache.shift_remove(path);
+    cache.insert(path.to_path_buf(), index);
+    while cache.len() > MEMORY_CACHE_ENTRIES {
+        cache.shift_remove_index(0);
+    }
+}
+
+fn sidecar_path(path: &Path) -> PathBuf {
+    let mut name: OsString = path.as_os_str().to_owned();
+    name.push(".lasidx");
+    PathBuf::from(name)
+}
+
+/// Looks up and stores the index of one file on disk.
+pub(crate) struct IndexStore {
+    path: PathBuf,
+    file_len: u64,
+    modified: u64,
+    mode: IndexMode,
+}
+
+impl IndexStore {
+    pub(crate) fn new(path: &Path, file: &File, mode: IndexMode) -> io::Result<Self> {
+        let metadata = file.metadata()?;
+        Ok(Self {
+            path: fs::canonicalize(path).unwrap_or_else(|_| path.to_path_buf()),
+            file_len: metadata.len(),
+            modified: modified_nanos(&metadata),
+            mode,
+        })
+    }
+
+    fn is_current(&self, index: &DepthIndex) -> bool {
+        index.file_len == self.file_len && index.modified == self.modified
+    }
+
+    /// A previously stored index of this exact file version, if any.
+    pub(crate) fn load(&self) -> Option<Arc<DepthIndex>> {
+        if self.mode == IndexMode::Off {
+            return None;
+        }
+        let mut cache = memory_cache().lock().unwrap_or_else(|e| e.into_inner());
+        if let Some(index) = cache.get(&self.path).filter(|i| self.is_current(i)).cloned() {
+            cache_insert(&mut cache, &self.path, index.clone());
+            return Some(index);
+        }
+        if self.mode == IndexMode::Sidecar {
+            let text = fs::read(sidecar_path(&self.path)).ok()?;
+            let index: DepthIndex = serde_json::from_slice(&text).ok()?;
+            if self.is_current(&index) {
+                let index = Arc::new(index);
+                cache_insert(&mut cache, &self.path, index.clone());
+                return Some(index);
+            }
+        }
+        None
+    }
+
+    /// Stamp `index` with this file version and keep it according to the mode.
+    ///
+    /// Failing to write a sidecar (for example in a read-only directory) is
+    /// not an error; the index then only lives in memory.
+    pub(crate) fn store(&self, mut index: DepthIndex) -> Arc<DepthIndex> {
+        index.file_len = self.file_len;
+        index.modified = self.modified;
+        if self.mode == IndexMode::Sidecar {
+            if let Ok(text) = serde_json::to_vec(&index) {
+                let _ = fs::write(sidecar_path(&self.path), text);
+            }
+        }
+        let index = Arc::new(index);
+        if self.mode != IndexMode::Off {
+            let mut cache = memory_cache().lock().unwrap_or_else(|e| e.into_inner());
+            cache_insert(&mut cache, &self.path, index.clone());
+        }
+        index
+    }
+}
@@ -25,8 +25,6 @@ pub struct CurveItem {
     pub unit: String,
     pub value: String, // API code or similar metadata
     pub descr: String,
-    #[serde(skip_serializing)] 
-    pub data: Vec<f64>, 
 }
 
 impl CurveItem {
@@ -36,7 +34,16 @@ impl CurveItem {
             unit: unit.to_string(),
             value: value.to_string(),
             descr: descr.to_string(),
-            data: Vec::new(),
         }
     }
+
+    /// LAS 3.0 format of the curve, the text between the braces of a trailing
+    /// `{...}` in its description (`"S"` in `"Lithology {S}"`).
+    pub fn format_spec(&self) -> Option<&str> {
+        // Anything after `|` associates the curve with other items.
+        let descr = self.descr.split('|').next()?.trim_end();
+        let inner = descr.strip_suffix('}')?;
+        let start = inner.rfind('{')?;
+        Some(inner[start + 1..].trim())
+    }
 }
@@ -1,13 +1,34 @@
+pub mod arrow_export;
+pub mod batch;
+pub mod cache;
+pub mod catalog;
+pub mod columns;
+pub mod compression;
+#[cfg(feature = "convert")]
+pub mod convert;
+pub mod encoding;
+pub mod error;
+pub mod index;
 pub mod las_items;
+pub mod merge;
 pub mod reader;
-// Conditional compilation for python bindings? 
-// Or just always expose if feature enabled? 
-// For now, let's include it.
-// We just need pybindings.
+pub mod resample;
+pub mod stats;
+pub mod stream;
+pub mod synthetic;
+pub mod tokenizer;
+pub mod validate;
+pub mod writer;
+// The Python extension module; the `lasio` binary builds without it.
+#[cfg(feature = "python")]
 pub mod pybindings;
 
 use indexmap::IndexMap;
+pub use columns::{Column, DType, TextColumn};
+pub use encoding::TextEncoding;
+pub use error::LasError;
 pub use las_items::{CurveItem, HeaderItem}; 
+use ndarray::{Array2, ArrayView1};
 use serde::{Deserialize, Serialize};
 
 #[derive(Debug, Clone, Serialize, Deserialize, Default)]
@@ -17,6 +38,16 @@ pub struct LASFile {
     pub curves: SectionCurves, 
     pub params: SectionItems,
     pub other: String,
+    /// Curve data as one (rows x curves) matrix in column-major (Fortran)
+    /// order, so every curve is a contiguous column.
+    ///
+    /// Curves read with another dtype live in `columns` instead and have no
+    /// column here; the matrix keeps the relative order of the others.
+    #[serde(skip)]
+    pub data: Array2<f64>,
+    /// Curves stored as float32, int64 or strings, by mnemonic.
+    #[serde(skip)]
+    pub columns: IndexMap<String, Column>,
 }
 
 #[derive(Debug, Clone, Serialize, Deserialize, Default)]
@@ -60,8 +91,28 @@ impl LASFile {
     pub fn new() -> Self {
         Self::default()
     }
-}
 
-// We need to re-export the pymodule entry point if we want it to be found by python
-// No cfg needed here since pybindings is already pub mod above.
-// pub mod pybindings; // We only declare mod once. 
+    /// Column of `data` holding the given curve, if it has one.
+    pub fn curve_index(&self, mnemonic: &str) -> Option<usize> {
+        if self.columns.contains_key(mnemonic) {
+            return None;
+        }
+        let position = self.curves.items.get_index_of(mnemonic)?;
+        let column = match self.columns.is_empty() {
+            true => position,
+            false => self
+                .curves
+                .items
+                .keys()
+                .take(position)
+                .filter(|m| !self.columns.contains_key(m.as_str()))
+                .count(),
+        };
+        Some(column).filter(|&i| i < self.data.ncols())
+    }
+
+    /// Borrowed view of a curve's values; no copy is made.
+    pub fn curve_data(&self, mnemonic: &str) -> Option<ArrayView1<'_, f64>> {
+        self.curve_index(mnemonic).map(|i| self.data.column(i))
+    }
+}
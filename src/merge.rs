@@ -0,0 +1,304 @@
+//! Splicing several logging runs of one well into a single file.
+//!
+//! The rows of every run are merged by depth, in the direction of the first
+//! run. Rows of different runs at the same depth become one row; curves are
+//! matched by mnemonic, and a curve present in several runs at that depth
+//! takes its value according to an [`Overlap`] rule. Missing values (NaN)
+//! never win over a real value. Runs sampled on different grids should be
+//! resampled onto a common one first (see [`crate::resample`]), otherwise
+//! their rows interleave.
+use crate::resample::{index_curve, set_well_value, SNAP};
+use crate::{Column, CurveItem, DType, LASFile, LasError, SectionCurves, SectionItems, TextColumn};
+use indexmap::IndexMap;
+use ndarray::{Array2, ArrayView1, ShapeBuilder};
+use rayon::prelude::*;
+use std::ops::Range;
+
+/// Which value a curve takes where several runs have one at the same depth.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
+pub enum Overlap {
+    /// The value of the latest run, in input order.
+    #[default]
+    PreferLast,
+    /// The value of the earliest run.
+    PreferFirst,
+    /// The mean of the values. Integer and string curves keep the latest.
+    Average,
+}
+
+impl Overlap {
+    /// Parse `"prefer_last"`, `"prefer_first"` or `"average"`.
+    pub fn parse(name: &str) -> Result<Self, LasError> {
+        match name.trim().to_ascii_lowercase().as_str() {
+            "prefer_last" | "last" => Ok(Overlap::PreferLast),
+            "prefer_first" | "first" => Ok(Overlap::PreferFirst),
+            "average" | "mean" => Ok(Overlap::Average),
+            _ => Err(LasError::InvalidOptions(format!(
+                "overlap must be 'prefer_last', 'prefer_first' or 'average', got '{}'",
+                name
+            ))),
+        }
+    }
+}
+
+/// One input row: its depth, run and row within the run.
+type Sample = (f64, usize, usize);
+
+/// Where the values of one curve come from in one run.
+#[derive(Clone, Copy)]
+enum Source<'a> {
+    Matrix(ArrayView1<'a, f64>),
+    Typed(&'a Column),
+}
+
+impl Source<'_> {
+    fn value_f64(self, row: usize) -> f64 {
+        match self {
+            Source::Matrix(values) => values[row],
+            Source::Typed(column) => column.value_f64(row),
+        }
+    }
+
+    fn is_valid(self, row: usize) -> bool {
+        match self {
+            Source::Typed(Column::Int64 { valid, .. }) => valid[row],
+            Source::Typed(Column::Text(text)) => text.codes[row] >= 0,
+            _ => !self.value_f64(row).is_nan(),
+        }
+    }
+
+    fn value_i64(self, row: usize) -> i64 {
+        match self {
+            Source::Typed(Column::Int64 { values, .. }) => values[row],
+            _ => self.value_f64(row) as i64,
+        }
+    }
+
+    fn value_text(self, row: usize) -> String {
+        match self {
+            Source::Typed(Column::Text(text)) => text.get(row).unwrap_or_default().to_string(),
+            _ => self.value_f64(row).to_string(),
+        }
+    }
+}
+
+/// Samples of all `runs` ordered by depth, increasing or decreasing like the
+/// first run, and the ranges of samples sharing one depth. Within a range
+/// samples are in run order.
+fn depth_groups(depths: &[ArrayView1<'_, f64>]) -> (Vec<Sample>, Vec<Range<usize>>) {
+    let mut samples: Vec<Sample> = depths
+        .iter()
+        .enumerate()
+        .flat_map(|(run, values)| {
+            values.iter().enumerate().filter(|(_, d)| !d.is_nan()).map(move |(row, &d)| (d, run, row))
+        })
+        .collect();
+    let decreasing = match (depths[0].iter().find(|d| !d.is_nan()), depths[0].iter().rev().find(|d| !d.is_nan())) {
+        (Some(first), Some(last)) => last < first,
+        _ => false,
+    };
+    samples.par_sort_by(|a, b| match decreasing {
+        true => b.0.total_cmp(&a.0),
+        false => a.0.total_cmp(&b.0),
+    });
+
+    let mut groups = Vec::new();
+    let mut start = 0;
+    for i in 1..=samples.len() {
+        let depth = samples[start].0;
+        if i == samples.len() || (samples[i].0 - depth).abs() > SNAP * depth.abs().max(1.0) {
+            samples[start..i].sort_unstable_by_key(|&(_, run, row)| (run, row));
+            groups.push(start..i);
+            start = i;
+        }
+    }
+    (samples, groups)
+}
+
+/// Curves of all runs by mnemonic in order of first appearance, the index
+/// curve of the first run leading. Later runs' index curves map onto it.
+fn union_curves(runs: &[&LASFile]) -> SectionCurves {
+    let mut curves = SectionCurves::new();
+    if let Some((_, index)) = runs[0].curves.items.get_index(0) {
+        curves.insert(index.clone());
+    }
+    for las in runs {
+        for curve in las.curves.items.values().skip(1) {
+            if !curves.items.contains_key(&curve.mnemonic) {
+                curves.insert(curve.clone());
+            }
+        }
+    }
+    curves
+}
+
+/// Items of every section, the first definition of a mnemonic winning.
+fn union_items<'a>(sections: impl Iterator<Item = &'a SectionItems>) -> SectionItems {
+    let mut out = SectionItems::new();
+    for section in sections {
+        for item in section.items.values() {
+            if !out.items.contains_key(&item.mnemonic) {
+                out.insert(item.clone());
+            }
+        }
+    }
+    out
+}
+
+/// Where `curve` comes from in every run; the index curve of each run for
+/// `index`.
+fn curve_sources<'a>(runs: &[&'a LASFile], depths: &[ArrayView1<'a, f64>], curve: &CurveItem, index: bool) -> Vec<Option<Source<'a>>> {
+    runs.iter()
+        .zip(depths)
+        .map(|(las, &depth)| match index {
+            true => Some(Source::Matrix(depth)),
+            // A run's own index curve only ever stands for the merged index.
+            false if las.curves.items.get_index_of(&curve.mnemonic) == Some(0) => None,
+            false => las
+                .curve_data(&curve.mnemonic)
+                .map(Source::Matrix)
+                .or_else(|| las.columns.get(&curve.mnemonic).map(Source::Typed)),
+        })
+        .collect()
+}
+
+/// The sample of `group` whose value a non-averaged curve takes.
+fn pick<'a>(group: &[Sample], sources: &[Option<Source<'a>>], overlap: Overlap) -> Option<(Source<'a>, usize)> {
+    let mut valid = group
+        .iter()
+        .filter_map(|&(_, run, row)| sources[run].filter(|source| source.is_valid(row)).map(|source| (source, row)));
+    match overlap {
+        Overlap::PreferFirst => valid.next(),
+        Overlap::PreferLast | Overlap::Average => valid.last(),
+    }
+}
+
+/// Float value of a curve over `group`.
+fn resolve(group: &[Sample], sources: &[Option<Source<'_>>], overlap: Overlap) -> f64 {
+    if overlap != Overlap::Average {
+        return pick(group, sources, overlap).map_or(f64::NAN, |(source, row)| source.value_f64(row));
+    }
+    let (sum, count) = group
+        .iter()
+        .filter_map(|&(_, run, row)| sources[run].map(|source| source.value_f64(row)))
+        .filter(|value| !value.is_nan())
+        .fold((0.0, 0usize), |(sum, count), value| (sum + value, count + 1));
+    if count == 0 {
+        f64::NAN
+    } else {
+        sum / count as f64
+    }
+}
+
+/// Typed column of a merged curve stored as `dtype`.
+fn typed_column(dtype: DType, samples: &[Sample], groups: &[Range<usize>], sources: &[Option<Source<'_>>], overlap: Overlap) -> Column {
+    let groups = groups.iter().map(|group| &samples[group.clone()]);
+    match dtype {
+        DType::Float64 => Column::Float64(groups.map(|group| resolve(group, sources, overlap)).collect()),
+        DType::Float32 => Column::Float32(groups.map(|group| resolve(group, sources, overlap) as f32).collect()),
+        DType::Int64 => {
+            let picked: Vec<Option<i64>> = groups
+                .map(|group| pick(group, sources, overlap).map(|(source, row)| source.value_i64(row)))
+                .collect();
+            Column::Int64 {
+                values: picked.iter().map(|value| value.unwrap_or(0)).collect(),
+                valid: picked.iter().map(Option::is_some).collect(),
+            }
+        }
+        DType::Text => Column::Text(TextColumn::encode(
+            groups.map(|group| pick(group, sources, overlap).map(|(source, row)| source.value_text(row))),
+        )),
+    }
+}
+
+/// Splice `runs` of one well into a single file.
+///
+/// Curves are the union of all runs by mnemonic, each stored with the dtype
+/// it has in the first run defining it; the index curve is the first curve
+/// of every run. Headers come from the first run, completed with items only
+/// later runs define, and STRT, STOP and STEP are set from the merged index
+/// (STEP is 0 if it is not regular). Curves are filled in parallel.
+pub fn merge(runs: &[&LASFile], overlap: Overlap) -> Result<LASFile, LasError> {
+    if runs.is_empty() {
+        return Err(LasError::InvalidOptions("merge needs at least one file".to_string()));
+    }
+    let depths = runs
+        .iter()
+        .enumerate()
+        .map(|(i, las)| {
+            index_curve(las)
+                .map_err(|_| LasError::InvalidOptions(format!("run {} has no float index (first) curve", i)))
+        })
+        .collect::<Result<Vec<_>, _>>()?;
+    let depths: Vec<ArrayView1<'_, f64>> = depths.iter().map(|values| values.view()).collect();
+    let (samples, groups) = depth_groups(&depths);
+    let curves = union_curves(runs);
+
+    let dtypes: Vec<DType> = curves
+        .items
+        .keys()
+        .enumerate()
+        .map(|(i, mnemonic)| match i {
+            0 => DType::Float64,
+            _ => runs
+                .iter()
+                .find(|las| las.curves.items.contains_key(mnemonic))
+                .and_then(|las| las.columns.get(mnemonic))
+                .map_or(DType::Float64, Column::dtype),
+        })
+        .collect();
+    let sources: Vec<Vec<Option<Source<'_>>>> =
+        curves.items.values().enumerate().map(|(i, curve)| curve_sources(runs, &depths, curve, i == 0)).collect();
+
+    let matrix: Vec<usize> = (0..dtypes.len()).filter(|&i| dtypes[i] == DType::Float64).collect();
+    let nrows = groups.len();
+    let mut values = vec![f64::NAN; nrows * matrix.len()];
+    values.par_chunks_mut(nrows.max(1)).zip(matrix.par_iter()).for_each(|(out, &curve)| {
+        for (value, group) in out.iter_mut().zip(&groups) {
+            *value = match curve {
+                // Depths within SNAP of each other are one row; keep the first.
+                0 => samples[group.start].0,
+                _ => resolve(&samples[group.clone()], &sources[curve], overlap),
+            };
+        }
+    });
+    let typed: Vec<usize> = (0..dtypes.len()).filter(|&i| dtypes[i] != DType::Float64).collect();
+    let columns: Vec<Column> = typed
+        .par_iter()
+        .map(|&curve| typed_column(dtypes[curve], &samples, &groups, &sources[curve], overlap))
+        .collect();
+
+    let mut out = LASFile {
+        version: runs[0].version.clone(),
+        well: union_items(runs.iter().map(|las| &las.well)),
+        params: union_items(runs.iter().map(|las| &las.params)),
+        other: runs.iter().map(|las| las.other.trim_end()).filter(|o| !o.is_empty()).collect::<Vec<_>>().join("\n"),
+        data: Array2::from_shape_vec((nrows, matrix.len()).f(), values).expect("one column per float64 curve"),
+        columns: typed
+            .iter()
+            .map(|&curve| curves.items.get_index(curve).map(|(m, _)| m.clone()).unwrap_or_default())
+            .zip(columns)
+            .collect::<IndexMap<_, _>>(),
+        curves,
+    };
+    let index = out.data.column(0);
+    let (first, last) = (index.first().copied(), index.last().copied());
+    let step = match index.len() {
+        0 | 1 => 0.0,
+        _ => {
+            let step = index[1] - index[0];
+            let tolerance = 1e-6 * step.abs().max(SNAP);
+            match index.iter().zip(index.iter().skip(1)).all(|(a, b)| (b - a - step).abs() <= tolerance) {
+                true => step,
+                false => 0.0,
+            }
+        }
+    };
+    let unit = out.curves.items.get_index(0).map_or(String::new(), |(_, curve)| curve.unit.clone());
+    if let (Some(first), Some(last)) = (first, last) {
+        set_well_value(&mut out, "STRT", &unit, first);
+        set_well_value(&mut out, "STOP", &unit, last);
+        set_well_value(&mut out, "STEP", &unit, step);
+    }
+    Ok(out)
+}
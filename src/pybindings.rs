@@ -1,58 +1,978 @@
-use crate::reader::parse_las_from_reader;
-use crate::LASFile;
+use crate::arrow_export::{long_record_batch, to_record_batch};
+use crate::batch;
+use crate::cache::{self, CacheOptions, CacheValidation, DEFAULT_MAX_BYTES};
+use crate::catalog;
+use crate::index::IndexMode;
+use crate::merge::{self, Overlap};
+use crate::reader::{
+    parse_las_from_bytes_with, read_las_file_with, read_las_header_with, NullPolicy, ReadOptions, TokenErrors,
+};
+use crate::resample::{self, depth_grid, Interpolation};
+use crate::stats::{peak_rss_bytes, ReadStats};
+use crate::stream::AsciiChunks;
+use crate::synthetic::{self, SyntheticSpec};
+use crate::validate;
+use crate::writer::{write_las_file, FloatFormat, LasVersion, WriteOptions};
+use crate::{Column, CurveItem, DType, HeaderItem, LASFile, LasError, SectionItems, TextEncoding};
+use arrow::error::ArrowError;
+use arrow::pyarrow::ToPyArrow;
+use ndarray::Dimension;
+use numpy::{Element, IntoPyArray, PyArray, PyArray1, PyArray2};
 use pyo3::prelude::*;
+use pyo3::types::{IntoPyDict, PyBytes, PyDict, PyList};
+use pyo3::PyClassInitializer;
 use pyo3::wrap_pyfunction;
+use std::collections::HashMap;
 use std::fs::File;
-use std::io::BufReader;
+use std::io::BufRead;
+use std::path::{Path, PathBuf};
+use std::sync::mpsc::Receiver;
+use std::sync::Arc;
 
 #[pymodule]
 fn _lasio_rs(_py: Python, m: &PyModule) -> PyResult<()> {
+    // Forward `log` records (such as the per-phase read stats) to Python's
+    // logging, under logger names like `lasio_rs.stats`.
+    pyo3_log::init();
     m.add_class::<PyLASFile>()?;
+    m.add_class::<PyHeaderItem>()?;
+    m.add_class::<PyCurveItem>()?;
+    m.add_class::<PySectionItems>()?;
+    m.add_class::<PyChunkIterator>()?;
+    m.add_class::<PyBatchIterator>()?;
     m.add_function(wrap_pyfunction!(read, m)?)?;
+    m.add_function(wrap_pyfunction!(read_bytes, m)?)?;
+    m.add_function(wrap_pyfunction!(read_many, m)?)?;
+    m.add_function(wrap_pyfunction!(spawn_read, m)?)?;
+    m.add_function(wrap_pyfunction!(clear_cache, m)?)?;
+    m.add_function(wrap_pyfunction!(iter_chunks, m)?)?;
+    m.add_function(wrap_pyfunction!(read_header, m)?)?;
+    m.add_function(wrap_pyfunction!(scan_headers, m)?)?;
+    m.add_function(wrap_pyfunction!(validate, m)?)?;
+    m.add_function(wrap_pyfunction!(align, m)?)?;
+    m.add_function(wrap_pyfunction!(merge, m)?)?;
+    m.add_function(wrap_pyfunction!(write_synthetic, m)?)?;
     Ok(())
 }
 
 #[pyclass(name = "LASFile")]
 struct PyLASFile {
-    inner: LASFile,
+    // Shared so that exported Arrow buffers can keep the data alive.
+    inner: Arc<LASFile>,
 }
 
 #[pymethods]
 impl PyLASFile {
     #[getter]
-    fn json_headers(&self) -> String {
-        // We exclude big data from this JSON to be fast.
-        // But our default Serialize includes CurveItem data? 
-        // CurveItem struct has `data` field. serialization of 100k floats is costly.
-        // We should probably implement custom serialization or a "metadata only" struct?
-        // Quick hack: Use a helper struct or just serialize sections individually.
-        
-        // Let's rely on the fact that CurveItem.data is Vec<f64>. 
-        // We can just serialize `inner.version`, `inner.well`, `inner.params`.
-        let json_structure = serde_json::json!({
-            "version": self.inner.version,
-            "well": self.inner.well,
-            "params": self.inner.params,
-            "curves": self.inner.curves // matches structure
+    fn version(slf: &PyCell<Self>) -> PySectionItems {
+        PySectionItems { owner: slf.into(), section: SectionKind::Version }
+    }
+
+    #[getter]
+    fn well(slf: &PyCell<Self>) -> PySectionItems {
+        PySectionItems { owner: slf.into(), section: SectionKind::Well }
+    }
+
+    #[getter]
+    fn curves(slf: &PyCell<Self>) -> PySectionItems {
+        PySectionItems { owner: slf.into(), section: SectionKind::Curves }
+    }
+
+    #[getter]
+    fn params(slf: &PyCell<Self>) -> PySectionItems {
+        PySectionItems { owner: slf.into(), section: SectionKind::Params }
+    }
+
+    /// The float64 data matrix as a 2-D NumPy array (rows x curves).
+    ///
+    /// Curves read with another dtype are not part of it.
+    ///
+    /// The matrix is Fortran-ordered and borrowed from Rust: no values are
+    /// copied, and the array keeps this `LASFile` alive as its base object.
+    /// The array is read-only; copy it to modify the values.
+    #[getter]
+    fn data<'py>(slf: &'py PyCell<Self>) -> PyResult<&'py PyArray2<f64>> {
+        let this = slf.borrow();
+        // SAFETY: the matrix is owned by `slf`, which numpy holds as the array
+        // base; it is never reallocated after parsing, and `read_only` keeps
+        // Python from writing to it.
+        read_only(unsafe { PyArray2::borrow_from_array(&this.inner.data, slf) })
+    }
+
+    /// Curve data as a NumPy array; see [`curve_array`].
+    fn get_curve_data(slf: &PyCell<Self>, mnemonic: &str) -> PyResult<Option<PyObject>> {
+        curve_array(slf.py(), slf, mnemonic)
+    }
+
+    /// Storage type of every curve that has data, by mnemonic: `"float64"`,
+    /// `"float32"`, `"int64"` or `"str"`.
+    #[getter]
+    fn dtypes(&self) -> Vec<(String, &'static str)> {
+        let las = &self.inner;
+        las.curves
+            .items
+            .keys()
+            .filter_map(|mnemonic| {
+                let dtype = match las.columns.get(mnemonic) {
+                    Some(column) => column.dtype(),
+                    None if las.curve_index(mnemonic).is_some() => DType::Float64,
+                    None => return None,
+                };
+                Some((mnemonic.clone(), dtype.name()))
+            })
+            .collect()
+    }
+
+    /// Write the file as LAS 2.0 or 3.0, formatting the data in Rust.
+    ///
+    /// `fmt` is a printf-style float format such as `"%12.6f"`; NaN values
+    /// are written as `null_value` (default: the file's NULL value).
+    #[pyo3(signature = (path, version="2.0", wrap=false, fmt="%12.6f", null_value=None, parallel=true))]
+    #[allow(clippy::too_many_arguments)]
+    fn write(
+        &self,
+        py: Python,
+        path: String,
+        version: &str,
+        wrap: bool,
+        fmt: &str,
+        null_value: Option<f64>,
+        parallel: bool,
+    ) -> PyResult<()> {
+        let options = WriteOptions {
+            version: LasVersion::parse(version).map_err(to_py_err)?,
+            wrap,
+            float_format: FloatFormat::parse(fmt).map_err(to_py_err)?,
+            null_value,
+            parallel,
+        };
+        let las = &self.inner;
+        py.allow_threads(|| write_las_file(las, path, &options)).map_err(to_py_err)
+    }
+
+    /// A new file with every curve resampled onto the depth grid `start`,
+    /// `start + step`, ... `stop` (defaults: the first and last index values).
+    ///
+    /// Runs in parallel over the curves without the GIL; see
+    /// [`resample::resample`] for the handling of missing values.
+    #[pyo3(signature = (step, start=None, stop=None, method="linear"))]
+    fn resample(&self, py: Python, step: f64, start: Option<f64>, stop: Option<f64>, method: &str) -> PyResult<PyLASFile> {
+        let method = Interpolation::parse(method).map_err(to_py_err)?;
+        let las = &self.inner;
+        let range = resample::index_range(las).unwrap_or((f64::NAN, f64::NAN));
+        let resampled = py
+            .allow_threads(|| resample::resample(las, &depth_grid(range, step, start, stop)?, method))
+            .map_err(to_py_err)?;
+        Ok(PyLASFile { inner: Arc::new(resampled) })
+    }
+
+    /// Export the data as a `pyarrow.RecordBatch` without copying.
+    ///
+    /// Curve units, descriptions and API codes travel in the field metadata.
+    fn to_arrow(&self, py: Python) -> PyResult<PyObject> {
+        let batch = to_record_batch(&self.inner).map_err(arrow_err)?;
+        batch.to_pyarrow(py)
+    }
+}
+
+/// One header line (mnemonic, unit, value and description).
+#[pyclass(name = "HeaderItem", subclass)]
+struct PyHeaderItem {
+    item: HeaderItem,
+}
+
+#[pymethods]
+impl PyHeaderItem {
+    #[getter]
+    fn mnemonic(&self) -> &str {
+        &self.item.mnemonic
+    }
+
+    /// Same as `mnemonic`; kept for compatibility with lasio.
+    #[getter]
+    fn original_mnemonic(&self) -> &str {
+        &self.item.mnemonic
+    }
+
+    #[getter]
+    fn unit(&self) -> &str {
+        &self.item.unit
+    }
+
+    #[getter]
+    fn value(&self) -> &str {
+        &self.item.value
+    }
+
+    #[getter]
+    fn descr(&self) -> &str {
+        &self.item.descr
+    }
+
+    fn __repr__(&self) -> String {
+        let item = &self.item;
+        format!(
+            "HeaderItem(mnemonic=\"{}\", unit=\"{}\", value=\"{}\", descr=\"{}\")",
+            item.mnemonic, item.unit, item.value, item.descr
+        )
+    }
+}
+
+/// Clear the `WRITEABLE` flag of an array borrowing a `LASFile` buffer.
+///
+/// Those buffers are shared with the Arrow batches of `to_arrow` and the
+/// parse cache, which both rely on them never changing. NumPy refuses to set
+/// the flag again, since the base object exposes no writable buffer.
+fn read_only<T: Element, D: Dimension>(array: &PyArray<T, D>) -> PyResult<&PyArray<T, D>> {
+    array.call_method("setflags", (), Some([("write", false)].into_py_dict(array.py())))?;
+    Ok(array)
+}
+
+/// NumPy array of one curve's values, or `None` if the curve has no data.
+///
+/// Float curves and integer curves without nulls borrow the Rust buffer, with
+/// `owner` as the array base, so no values are copied; these arrays are
+/// read-only. Integer curves with nulls become `numpy.ma.MaskedArray`s over
+/// the same buffer and string curves object arrays.
+fn curve_array(py: Python, owner: &PyCell<PyLASFile>, mnemonic: &str) -> PyResult<Option<PyObject>> {
+    let this = owner.borrow();
+    let las = &*this.inner;
+    // SAFETY (all borrows): the values are owned by `owner`, which numpy
+    // holds as the array base; they are never reallocated after parsing, and
+    // `read_only` keeps Python from writing to them.
+    if let Some(i) = las.curve_index(mnemonic) {
+        return Ok(Some(read_only(unsafe { PyArray1::borrow_from_array(&las.data.column(i), owner) })?.into_py(py)));
+    }
+    let array = match las.columns.get(mnemonic) {
+        None => return Ok(None),
+        Some(Column::Float64(values)) => read_only(unsafe { PyArray1::borrow_from_array(values, owner) })?.into_py(py),
+        Some(Column::Float32(values)) => read_only(unsafe { PyArray1::borrow_from_array(values, owner) })?.into_py(py),
+        Some(Column::Int64 { values, valid }) => {
+            let array = read_only(unsafe { PyArray1::borrow_from_array(values, owner) })?;
+            if valid.iter().all(|&v| v) {
+                array.into_py(py)
+            } else {
+                let mask: Vec<bool> = valid.iter().map(|&v| !v).collect();
+                py.import("numpy.ma")?
+                    .call_method1("masked_array", (array, mask.into_pyarray(py)))?
+                    .into_py(py)
+            }
+        }
+        Some(Column::Text(text)) => {
+            let values: Vec<PyObject> = (0..text.codes.len())
+                .map(|row| text.get(row).map_or_else(|| py.None(), |value| value.to_object(py)))
+                .collect();
+            PyArray1::from_vec(py, values).into_py(py)
+        }
+    };
+    Ok(Some(array))
+}
+
+/// A curve definition whose `data` is a view of its values in the file.
+#[pyclass(name = "CurveItem", extends = PyHeaderItem)]
+struct PyCurveItem {
+    owner: Py<PyLASFile>,
+    mnemonic: String,
+}
+
+impl PyCurveItem {
+    fn create(py: Python, owner: &Py<PyLASFile>, curve: &CurveItem) -> PyResult<PyObject> {
+        let base = PyHeaderItem {
+            item: HeaderItem::new(&curve.mnemonic, &curve.unit, &curve.value, &curve.descr),
+        };
+        let this = PyCurveItem { owner: owner.clone_ref(py), mnemonic: curve.mnemonic.clone() };
+        Ok(Py::new(py, PyClassInitializer::from(base).add_subclass(this))?.into_py(py))
+    }
+}
+
+#[pymethods]
+impl PyCurveItem {
+    /// Curve values as a NumPy array borrowing the Rust buffer where possible.
+    #[getter]
+    fn data(&self, py: Python) -> PyResult<PyObject> {
+        match curve_array(py, self.owner.as_ref(py), &self.mnemonic)? {
+            Some(array) => Ok(array),
+            None => Ok(PyArray1::<f64>::from_vec(py, Vec::new()).into_py(py)),
+        }
+    }
+
+    fn __getitem__(&self, py: Python, index: &PyAny) -> PyResult<PyObject> {
+        Ok(self.data(py)?.as_ref(py).get_item(index)?.into_py(py))
+    }
+
+    fn __len__(&self, py: Python) -> usize {
+        let owner = self.owner.as_ref(py).borrow();
+        let las = &owner.inner;
+        match las.columns.get(&self.mnemonic) {
+            Some(column) => column.len(),
+            None if las.curve_index(&self.mnemonic).is_some() => las.data.nrows(),
+            None => 0,
+        }
+    }
+
+    fn __repr__(slf: PyRef<'_, Self>) -> String {
+        let item = &slf.as_ref().item;
+        format!(
+            "CurveItem(mnemonic=\"{}\", unit=\"{}\", value=\"{}\", descr=\"{}\", data.shape=({},))",
+            item.mnemonic,
+            item.unit,
+            item.value,
+            item.descr,
+            slf.__len__(slf.py())
+        )
+    }
+}
+
+#[derive(Debug, Clone, Copy)]
+enum SectionKind {
+    Version,
+    Well,
+    Curves,
+    Params,
+}
+
+/// Read-only mapping view of one header section of a `LASFile`.
+///
+/// Items are built on access straight from the Rust `IndexMap`, so opening a
+/// file never materializes Python objects for headers nobody looks at.
+#[pyclass(name = "SectionItems")]
+struct PySectionItems {
+    owner: Py<PyLASFile>,
+    section: SectionKind,
+}
+
+impl PySectionItems {
+    fn header_items<'a>(&self, las: &'a LASFile) -> Option<&'a SectionItems> {
+        match self.section {
+            SectionKind::Version => Some(&las.version),
+            SectionKind::Well => Some(&las.well),
+            SectionKind::Params => Some(&las.params),
+            SectionKind::Curves => None,
+        }
+    }
+
+    fn item(&self, py: Python, key: &str) -> PyResult<Option<PyObject>> {
+        let owner = self.owner.as_ref(py).borrow();
+        let las = &*owner.inner;
+        match self.header_items(las) {
+            Some(section) => match section.items.get(key) {
+                Some(item) => Ok(Some(Py::new(py, PyHeaderItem { item: item.clone() })?.into_py(py))),
+                None => Ok(None),
+            },
+            None => match las.curves.items.get(key) {
+                Some(curve) => Ok(Some(PyCurveItem::create(py, &self.owner, curve)?)),
+                None => Ok(None),
+            },
+        }
+    }
+}
+
+#[pymethods]
+impl PySectionItems {
+    fn keys(&self, py: Python) -> Vec<String> {
+        let owner = self.owner.as_ref(py).borrow();
+        match self.header_items(&owner.inner) {
+            Some(section) => section.items.keys().cloned().collect(),
+            None => owner.inner.curves.items.keys().cloned().collect(),
+        }
+    }
+
+    fn values(&self, py: Python) -> PyResult<Vec<PyObject>> {
+        self.keys(py)
+            .iter()
+            .map(|key| Ok(self.item(py, key)?.unwrap_or_else(|| py.None())))
+            .collect()
+    }
+
+    fn items(&self, py: Python) -> PyResult<Vec<(String, PyObject)>> {
+        let values = self.values(py)?;
+        Ok(self.keys(py).into_iter().zip(values).collect())
+    }
+
+    #[pyo3(signature = (key, default=None))]
+    fn get(&self, py: Python, key: &str, default: Option<PyObject>) -> PyResult<PyObject> {
+        Ok(self.item(py, key)?.or(default).unwrap_or_else(|| py.None()))
+    }
+
+    fn __getitem__(&self, py: Python, key: &str) -> PyResult<PyObject> {
+        self.item(py, key)?
+            .ok_or_else(|| pyo3::exceptions::PyKeyError::new_err(format!("{} not found", key)))
+    }
+
+    fn __contains__(&self, py: Python, key: &str) -> bool {
+        let owner = self.owner.as_ref(py).borrow();
+        match self.header_items(&owner.inner) {
+            Some(section) => section.items.contains_key(key),
+            None => owner.inner.curves.items.contains_key(key),
+        }
+    }
+
+    fn __len__(&self, py: Python) -> usize {
+        let owner = self.owner.as_ref(py).borrow();
+        match self.header_items(&owner.inner) {
+            Some(section) => section.items.len(),
+            None => owner.inner.curves.items.len(),
+        }
+    }
+
+    fn __iter__(&self, py: Python) -> PyResult<PyObject> {
+        Ok(PyList::new(py, self.keys(py)).as_ref().iter()?.into_py(py))
+    }
+
+    fn __repr__(&self, py: Python) -> PyResult<String> {
+        Ok(format!("SectionItems({})", PyList::new(py, self.keys(py)).repr()?))
+    }
+}
+
+/// Iterator over the data of a LAS file in bounded blocks of rows.
+#[pyclass(name = "ChunkIterator")]
+struct PyChunkIterator {
+    inner: AsciiChunks<Box<dyn BufRead + Send>>,
+    as_arrow: bool,
+}
+
+#[pymethods]
+impl PyChunkIterator {
+    /// Mnemonics of the curves in every block, in column order.
+    #[getter]
+    fn curves(&self) -> Vec<String> {
+        self.inner.curves().items.keys().cloned().collect()
+    }
+
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(mut slf: PyRefMut<'_, Self>) -> PyResult<Option<PyObject>> {
+        let py = slf.py();
+        let inner = &mut slf.inner;
+        let block = match py.allow_threads(move || inner.next()) {
+            None => return Ok(None),
+            Some(block) => block.map_err(to_py_err)?,
+        };
+        if slf.as_arrow {
+            let chunk = LASFile {
+                curves: slf.inner.curves().clone(),
+                data: block,
+                ..LASFile::default()
+            };
+            let batch = to_record_batch(&Arc::new(chunk)).map_err(arrow_err)?;
+            return batch.to_pyarrow(py).map(Some);
+        }
+        Ok(Some(block.into_pyarray(py).into_py(py)))
+    }
+}
+
+/// Map a read error to Python with the given message: I/O failures become
+/// `OSError`, unknown curves `KeyError`, anything else `ValueError`.
+fn py_err(e: &LasError, message: String) -> PyErr {
+    match e {
+        LasError::Io(_) => pyo3::exceptions::PyIOError::new_err(message),
+        LasError::CurveNotFound(_) => pyo3::exceptions::PyKeyError::new_err(message),
+        _ => pyo3::exceptions::PyValueError::new_err(message),
+    }
+}
+
+fn to_py_err(e: LasError) -> PyErr {
+    py_err(&e, e.to_string())
+}
+
+/// Failure to build an Arrow batch, mapped like any other export error.
+fn arrow_err(e: ArrowError) -> PyErr {
+    to_py_err(LasError::Export(e.to_string()))
+}
+
+fn index_mode(name: &str) -> PyResult<IndexMode> {
+    match name {
+        "off" => Ok(IndexMode::Off),
+        "memory" => Ok(IndexMode::Memory),
+        "sidecar" => Ok(IndexMode::Sidecar),
+        _ => Err(pyo3::exceptions::PyValueError::new_err(format!(
+            "index must be 'off', 'memory' or 'sidecar', got '{}'",
+            name
+        ))),
+    }
+}
+
+fn null_policy(nulls: &str, null_values: Option<Vec<f64>>) -> PyResult<NullPolicy> {
+    match (nulls, null_values) {
+        ("keep", _) => Ok(NullPolicy::Keep),
+        ("header", None) => Ok(NullPolicy::Header),
+        ("header", Some(values)) => Ok(NullPolicy::Values(values)),
+        _ => Err(pyo3::exceptions::PyValueError::new_err(format!(
+            "null_policy must be 'header', None or a list of values, got '{}'",
+            nulls
+        ))),
+    }
+}
+
+fn token_errors(name: &str) -> PyResult<TokenErrors> {
+    match name {
+        "nan" => Ok(TokenErrors::Nan),
+        "raise" => Ok(TokenErrors::Raise),
+        _ => Err(pyo3::exceptions::PyValueError::new_err(format!(
+            "errors must be 'nan' or 'raise', got '{}'",
+            name
+        ))),
+    }
+}
+
+#[allow(clippy::too_many_arguments)]
+fn read_options(
+    curves: Option<Vec<String>>,
+    depth_range: Option<(f64, f64)>,
+    rows: Option<(usize, Option<usize>)>,
+    index: &str,
+    nulls: &str,
+    null_values: Option<Vec<f64>>,
+    errors: &str,
+    dtype: &str,
+    dtypes: Option<HashMap<String, String>>,
+    encoding: &str,
+    cache: Option<PathBuf>,
+    cache_size: u64,
+    cache_validate: &str,
+) -> PyResult<ReadOptions> {
+    let dtypes = dtypes
+        .unwrap_or_default()
+        .into_iter()
+        .map(|(mnemonic, name)| Ok((mnemonic, DType::parse(&name).map_err(to_py_err)?)))
+        .collect::<PyResult<HashMap<_, _>>>()?;
+    Ok(ReadOptions {
+        curves,
+        rows: rows.map(|(start, stop)| start..stop.unwrap_or(usize::MAX)),
+        depth_range,
+        index: index_mode(index)?,
+        nulls: null_policy(nulls, null_values)?,
+        errors: token_errors(errors)?,
+        dtype: DType::parse(dtype).map_err(to_py_err)?,
+        dtypes,
+        encoding: TextEncoding::parse(encoding).map_err(to_py_err)?,
+        cache: match cache {
+            Some(dir) => Some(CacheOptions {
+                dir,
+                max_bytes: cache_size,
+                validation: CacheValidation::parse(cache_validate).map_err(to_py_err)?,
+            }),
+            None => None,
+        },
+        stats: None,
+    })
+}
+
+/// `las`, or `(las, stats)` when the read collected stats.
+fn read_result(py: Python, las: LASFile, stats: Option<Arc<ReadStats>>) -> PyResult<PyObject> {
+    let las = Py::new(py, PyLASFile { inner: Arc::new(las) })?.into_py(py);
+    let Some(stats) = stats else {
+        return Ok(las);
+    };
+    let phases = PyList::empty(py);
+    for phase in stats.phases() {
+        let item = PyDict::new(py);
+        item.set_item("phase", phase.phase.name())?;
+        item.set_item("seconds", phase.seconds)?;
+        item.set_item("bytes", phase.bytes)?;
+        item.set_item("rows", phase.rows)?;
+        phases.append(item)?;
+    }
+    let summary = PyDict::new(py);
+    summary.set_item("phases", phases)?;
+    summary.set_item("seconds", stats.seconds())?;
+    summary.set_item("chunks", stats.chunks())?;
+    summary.set_item("threads", rayon::current_num_threads())?;
+    summary.set_item("peak_rss_bytes", peak_rss_bytes())?;
+    Ok((las, summary).into_py(py))
+}
+
+/// The parsed file, or the exception it raised, for one file of a batch.
+fn batch_item(py: Python, path: &Path, result: Result<LASFile, LasError>) -> PyResult<PyObject> {
+    match result {
+        Ok(las) => Ok(Py::new(py, PyLASFile { inner: Arc::new(las) })?.into_py(py)),
+        Err(e) => {
+            let err = py_err(&e, format!("{}: {}", path.display(), e));
+            Ok(err.into_value(py).into_py(py))
+        }
+    }
+}
+
+/// `(input index, LASFile or exception)` pairs of a batch, as files finish.
+#[pyclass(name = "BatchIterator")]
+struct PyBatchIterator {
+    receiver: Receiver<(usize, Result<LASFile, LasError>)>,
+    paths: Vec<PathBuf>,
+}
+
+#[pymethods]
+impl PyBatchIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(mut slf: PyRefMut<'_, Self>) -> PyResult<Option<(usize, PyObject)>> {
+        let py = slf.py();
+        let receiver = &mut slf.receiver;
+        match py.allow_threads(move || receiver.recv()) {
+            Err(_) => Ok(None),
+            Ok((i, result)) => Ok(Some((i, batch_item(py, &slf.paths[i], result)?))),
+        }
+    }
+}
+
+#[pyfunction]
+#[pyo3(signature = (
+    path, curves=None, depth_range=None, rows=None, index="memory", nulls="header", null_values=None, errors="nan",
+    dtype="float64", dtypes=None, encoding="auto", cache=None, cache_size=DEFAULT_MAX_BYTES, cache_validate="stat",
+    stats=false
+))]
+#[allow(clippy::too_many_arguments)]
+fn read(
+    py: Python,
+    path: String,
+    curves: Option<Vec<String>>,
+    depth_range: Option<(f64, f64)>,
+    rows: Option<(usize, Option<usize>)>,
+    index: &str,
+    nulls: &str,
+    null_values: Option<Vec<f64>>,
+    errors: &str,
+    dtype: &str,
+    dtypes: Option<HashMap<String, String>>,
+    encoding: &str,
+    cache: Option<PathBuf>,
+    cache_size: u64,
+    cache_validate: &str,
+    stats: bool,
+) -> PyResult<PyObject> {
+    let mut options = read_options(
+        curves, depth_range, rows, index, nulls, null_values, errors, dtype, dtypes, encoding, cache, cache_size,
+        cache_validate,
+    )?;
+    options.stats = stats.then(|| Arc::new(ReadStats::new()));
+    let las = py.allow_threads(|| read_las_file_with(path, &options)).map_err(to_py_err)?;
+    read_result(py, las, options.stats)
+}
+
+/// Parse LAS text (plain or gzip/zstd/zip compressed) held in a `bytes`
+/// object.
+///
+/// The parser reads the object's own buffer, without copying it, with the
+/// GIL released.
+#[pyfunction]
+#[pyo3(signature = (
+    data, curves=None, depth_range=None, rows=None, nulls="header", null_values=None, errors="nan", dtype="float64",
+    dtypes=None, encoding="auto", stats=false
+))]
+#[allow(clippy::too_many_arguments)]
+fn read_bytes(
+    py: Python,
+    data: &PyBytes,
+    curves: Option<Vec<String>>,
+    depth_range: Option<(f64, f64)>,
+    rows: Option<(usize, Option<usize>)>,
+    nulls: &str,
+    null_values: Option<Vec<f64>>,
+    errors: &str,
+    dtype: &str,
+    dtypes: Option<HashMap<String, String>>,
+    encoding: &str,
+    stats: bool,
+) -> PyResult<PyObject> {
+    let mut options = read_options(
+        curves, depth_range, rows, "off", nulls, null_values, errors, dtype, dtypes, encoding, None, 0, "stat",
+    )?;
+    options.stats = stats.then(|| Arc::new(ReadStats::new()));
+    // `bytes` objects are immutable, and `data` keeps this one alive.
+    let bytes = data.as_bytes();
+    let las = py.allow_threads(|| parse_las_from_bytes_with(bytes, &options)).map_err(to_py_err)?;
+    read_result(py, las, options.stats)
+}
+
+/// Start reading `path` on the rayon pool and return immediately.
+///
+/// When the parse is done, `callback` is called on the worker thread (with
+/// the GIL) with the `LASFile` or, if the read failed, the exception
+/// instance. The asyncio wrappers use it to resolve a future.
+#[pyfunction]
+#[pyo3(signature = (
+    path, callback, curves=None, depth_range=None, rows=None, index="memory", nulls="header", null_values=None,
+    errors="nan", dtype="float64", dtypes=None, encoding="auto", cache=None, cache_size=DEFAULT_MAX_BYTES,
+    cache_validate="stat"
+))]
+#[allow(clippy::too_many_arguments)]
+fn spawn_read(
+    path: PathBuf,
+    callback: PyObject,
+    curves: Option<Vec<String>>,
+    depth_range: Option<(f64, f64)>,
+    rows: Option<(usize, Option<usize>)>,
+    index: &str,
+    nulls: &str,
+    null_values: Option<Vec<f64>>,
+    errors: &str,
+    dtype: &str,
+    dtypes: Option<HashMap<String, String>>,
+    encoding: &str,
+    cache: Option<PathBuf>,
+    cache_size: u64,
+    cache_validate: &str,
+) -> PyResult<()> {
+    let options = read_options(
+        curves, depth_range, rows, index, nulls, null_values, errors, dtype, dtypes, encoding, cache, cache_size,
+        cache_validate,
+    )?;
+    rayon::spawn(move || {
+        let result = read_las_file_with(&path, &options);
+        Python::with_gil(|py| {
+            let delivered = batch_item(py, &path, result).and_then(|item| callback.call1(py, (item,)));
+            // Nobody is left to receive an error raised by the callback.
+            if let Err(e) = delivered {
+                e.print(py);
+            }
         });
-        // Note: inner.curves items have .data. We need to avoid serializing that.
-        // But we don't have a separate struct.
-        // Ideally we change `LASFile` to not verify data.
-        
-        json_structure.to_string()
+    });
+    Ok(())
+}
+
+/// Read many files on a rayon pool of `workers` threads without the GIL.
+///
+/// Returns a list in input order whose items are `LASFile`s or, for files that
+/// failed, the exception instance; with `ordered=False`, an iterator of
+/// `(index, item)` pairs in completion order instead.
+#[pyfunction]
+#[pyo3(signature = (
+    paths, workers=None, ordered=true, curves=None, depth_range=None, rows=None, index="memory", nulls="header",
+    null_values=None, errors="nan", dtype="float64", dtypes=None, encoding="auto", cache=None,
+    cache_size=DEFAULT_MAX_BYTES, cache_validate="stat"
+))]
+#[allow(clippy::too_many_arguments)]
+fn read_many(
+    py: Python,
+    paths: Vec<PathBuf>,
+    workers: Option<usize>,
+    ordered: bool,
+    curves: Option<Vec<String>>,
+    depth_range: Option<(f64, f64)>,
+    rows: Option<(usize, Option<usize>)>,
+    index: &str,
+    nulls: &str,
+    null_values: Option<Vec<f64>>,
+    errors: &str,
+    dtype: &str,
+    dtypes: Option<HashMap<String, String>>,
+    encoding: &str,
+    cache: Option<PathBuf>,
+    cache_size: u64,
+    cache_validate: &str,
+) -> PyResult<PyObject> {
+    let options = read_options(
+        curves, depth_range, rows, index, nulls, null_values, errors, dtype, dtypes, encoding, cache, cache_size,
+        cache_validate,
+    )?;
+    if !ordered {
+        let receiver = batch::read_many_unordered(paths.clone(), options, workers).map_err(to_py_err)?;
+        return Ok(Py::new(py, PyBatchIterator { receiver, paths })?.into_py(py));
     }
-    
-    fn get_curve_data(&self, mnemonic: String) -> Option<Vec<f64>> {
-        self.inner.curves.items.get(&mnemonic).map(|c| c.data.clone())
+    let results = py
+        .allow_threads(|| batch::read_many(&paths, &options, workers))
+        .map_err(to_py_err)?;
+    let items = paths
+        .iter()
+        .zip(results)
+        .map(|(path, result)| batch_item(py, path, result))
+        .collect::<PyResult<Vec<_>>>()?;
+    Ok(items.into_py(py))
+}
+
+#[pyfunction]
+#[pyo3(signature = (
+    path, rows=100_000, curves=None, as_arrow=false, nulls="header", null_values=None, errors="nan", encoding="auto"
+))]
+#[allow(clippy::too_many_arguments)]
+fn iter_chunks(
+    path: String,
+    rows: usize,
+    curves: Option<Vec<String>>,
+    as_arrow: bool,
+    nulls: &str,
+    null_values: Option<Vec<f64>>,
+    errors: &str,
+    encoding: &str,
+) -> PyResult<PyChunkIterator> {
+    let options = read_options(
+        curves, None, None, "off", nulls, null_values, errors, "float64", None, encoding, None, 0, "stat",
+    )?;
+    let inner = AsciiChunks::open(path, rows, &options).map_err(to_py_err)?;
+    Ok(PyChunkIterator { inner, as_arrow })
+}
+
+/// Remove every parsed-file cache entry in `dir`.
+#[pyfunction]
+fn clear_cache(py: Python, dir: PathBuf) -> PyResult<()> {
+    py.allow_threads(|| cache::clear(&dir)).map_err(|e| to_py_err(e.into()))
+}
+
+#[pyfunction]
+#[pyo3(signature = (path, encoding="auto"))]
+fn read_header(py: Python, path: String, encoding: &str) -> PyResult<PyLASFile> {
+    let encoding = TextEncoding::parse(encoding).map_err(to_py_err)?;
+    let las = py.allow_threads(|| read_las_header_with(path, encoding)).map_err(to_py_err)?;
+    Ok(PyLASFile { inner: Arc::new(las) })
+}
+
+/// Header summary of every LAS file under a directory or matching a glob.
+///
+/// Returns a dict of equal-length column lists: `path`, `well`, `uwi`,
+/// `strt`, `stop`, `step`, `null`, `curves` and `error`.
+#[pyfunction]
+#[pyo3(signature = (source, workers=None))]
+fn scan_headers(py: Python, source: String, workers: Option<usize>) -> PyResult<PyObject> {
+    let rows = py
+        .allow_threads(|| catalog::scan_headers(&catalog::expand_paths(&source)?, workers))
+        .map_err(to_py_err)?;
+    let table = PyDict::new(py);
+    table.set_item("path", rows.iter().map(|r| r.path.to_string_lossy().into_owned()).collect::<Vec<_>>())?;
+    table.set_item("well", rows.iter().map(|r| r.well.clone()).collect::<Vec<_>>())?;
+    table.set_item("uwi", rows.iter().map(|r| r.uwi.clone()).collect::<Vec<_>>())?;
+    table.set_item("strt", rows.iter().map(|r| r.strt).collect::<Vec<_>>())?;
+    table.set_item("stop", rows.iter().map(|r| r.stop).collect::<Vec<_>>())?;
+    table.set_item("step", rows.iter().map(|r| r.step).collect::<Vec<_>>())?;
+    table.set_item("null", rows.iter().map(|r| r.null).collect::<Vec<_>>())?;
+    table.set_item("curves", rows.iter().map(|r| r.curves.clone()).collect::<Vec<_>>())?;
+    table.set_item("error", rows.iter().map(|r| r.error.clone()).collect::<Vec<_>>())?;
+    Ok(table.into())
+}
+
+/// Check many LAS files in parallel and report their problems.
+///
+/// `paths` is a list of files, or a directory / glob pattern as in
+/// `scan_headers`. Returns one dict per file with `path`, `rows`, `valid`
+/// and `issues` (dicts with `kind`, `line` and `message`).
+#[pyfunction]
+#[pyo3(signature = (paths, workers=None))]
+fn validate(py: Python, paths: &PyAny, workers: Option<usize>) -> PyResult<PyObject> {
+    let source: Option<String> = paths.extract().ok();
+    let paths: Vec<PathBuf> = match source {
+        Some(_) => Vec::new(),
+        None => paths.extract()?,
+    };
+    let reports = py
+        .allow_threads(|| {
+            let paths = match &source {
+                Some(source) => catalog::expand_paths(source)?,
+                None => paths,
+            };
+            validate::validate(&paths, workers)
+        })
+        .map_err(to_py_err)?;
+    let rows = PyList::empty(py);
+    for report in reports {
+        let issues = PyList::empty(py);
+        for issue in &report.issues {
+            let item = PyDict::new(py);
+            item.set_item("kind", issue.kind.name())?;
+            item.set_item("line", issue.line)?;
+            item.set_item("message", &issue.message)?;
+            issues.append(item)?;
+        }
+        let row = PyDict::new(py);
+        row.set_item("path", report.path.to_string_lossy().into_owned())?;
+        row.set_item("rows", report.rows)?;
+        row.set_item("valid", report.is_valid())?;
+        row.set_item("issues", issues)?;
+        rows.append(row)?;
     }
+    Ok(rows.into())
 }
 
+/// Resample `curves` of every well onto one depth grid and stack them.
+///
+/// Returns `(depth, array)` with a (wells x depths x curves) float64 array,
+/// or, with `as_arrow`, a long-format `pyarrow.RecordBatch`. The grid spans
+/// all wells unless `start` / `stop` are given.
 #[pyfunction]
-fn read(path: String) -> PyResult<PyLASFile> {
-    let file = File::open(path).map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
-    let reader = BufReader::new(file);
-    match parse_las_from_reader(reader) {
-        Ok(las) => Ok(PyLASFile { inner: las }),
-        Err(e) => Err(pyo3::exceptions::PyValueError::new_err(e.to_string())),
+#[pyo3(signature = (wells, curves, step, start=None, stop=None, method="linear", as_arrow=false))]
+#[allow(clippy::too_many_arguments)]
+fn align(
+    py: Python,
+    wells: Vec<PyRef<PyLASFile>>,
+    curves: Vec<String>,
+    step: f64,
+    start: Option<f64>,
+    stop: Option<f64>,
+    method: &str,
+    as_arrow: bool,
+) -> PyResult<PyObject> {
+    let method = Interpolation::parse(method).map_err(to_py_err)?;
+    let wells: Vec<Arc<LASFile>> = wells.iter().map(|las| las.inner.clone()).collect();
+    let (grid, aligned) = py
+        .allow_threads(|| {
+            let refs: Vec<&LASFile> = wells.iter().map(|las| las.as_ref()).collect();
+            let range = resample::common_range(&refs).unwrap_or((f64::NAN, f64::NAN));
+            let grid = depth_grid(range, step, start, stop)?;
+            let aligned = resample::align(&refs, &curves, &grid, method)?;
+            Ok::<_, LasError>((grid, aligned))
+        })
+        .map_err(to_py_err)?;
+    if as_arrow {
+        let batch = long_record_batch(&aligned, &grid, &curves).map_err(arrow_err)?;
+        return batch.to_pyarrow(py);
     }
+    Ok((grid.into_pyarray(py), aligned.into_pyarray(py)).into_py(py))
+}
+
+/// Splice several runs of one well into one file, resolving overlapping
+/// depths with `overlap`. With `path`, the result is also written there as in
+/// `LASFile.write`, without leaving Rust.
+#[pyfunction]
+#[pyo3(signature = (
+    runs, overlap="prefer_last", path=None, version="2.0", wrap=false, fmt="%12.6f", null_value=None
+))]
+#[allow(clippy::too_many_arguments)]
+fn merge(
+    py: Python,
+    runs: Vec<PyRef<PyLASFile>>,
+    overlap: &str,
+    path: Option<PathBuf>,
+    version: &str,
+    wrap: bool,
+    fmt: &str,
+    null_value: Option<f64>,
+) -> PyResult<PyLASFile> {
+    let overlap = Overlap::parse(overlap).map_err(to_py_err)?;
+    let options = WriteOptions {
+        version: LasVersion::parse(version).map_err(to_py_err)?,
+        wrap,
+        float_format: FloatFormat::parse(fmt).map_err(to_py_err)?,
+        null_value,
+        parallel: true,
+    };
+    let runs: Vec<Arc<LASFile>> = runs.iter().map(|las| las.inner.clone()).collect();
+    let merged = py
+        .allow_threads(|| {
+            let refs: Vec<&LASFile> = runs.iter().map(|las| las.as_ref()).collect();
+            let merged = merge::merge(&refs, overlap)?;
+            if let Some(path) = &path {
+                write_las_file(&merged, path, &options)?;
+            }
+            Ok::<_, LasError>(merged)
+        })
+        .map_err(to_py_err)?;
+    Ok(PyLASFile { inner: Arc::new(merged) })
+}
+
+/// Write the deterministic synthetic LAS file used by the benchmark suite.
+#[pyfunction]
+#[pyo3(signature = (path, rows=100_000, curves=20, wrap=false, null_density=0.01, seed=0))]
+fn write_synthetic(
+    py: Python,
+    path: PathBuf,
+    rows: usize,
+    curves: usize,
+    wrap: bool,
+    null_density: f64,
+    seed: u64,
+) -> PyResult<()> {
+    let spec = SyntheticSpec { rows, curves, wrap, null_density, seed };
+    py.allow_threads(|| File::create(&path).and_then(|file| synthetic::write_synthetic(file, &spec)))
+        .map_err(|e| to_py_err(e.into()))
 }
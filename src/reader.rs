@@ -1,6 +1,21 @@
-use crate::{CurveItem, HeaderItem, LASFile};
+use crate::cache::{CacheEntry, CacheOptions};
+use crate::compression::{decompress, open_stream, Compression};
+use crate::encoding::{transcode, transcode_stream, TextDecoder, TextEncoding};
+use crate::index::{depth_lines, DepthIndex, IndexMode, IndexStore};
+use crate::stats::{record, Phase, ReadStats, Span};
+use crate::tokenizer::{delimited_tokens, parse_f64};
+use crate::{Column, CurveItem, DType, HeaderItem, LASFile, LasError, SectionCurves, TextColumn};
+use memchr::{memchr, memchr_iter, memrchr};
+use memmap2::Mmap;
+use std::borrow::Cow;
+use std::collections::HashMap;
+use std::fs::File;
 use std::io::BufRead;
-use ndarray::Array2;
+use std::ops::Range;
+use std::path::Path;
+use std::sync::Arc;
+use std::time::{Duration, Instant};
+use ndarray::{Array1, Array2, ShapeBuilder};
 use nom::{
     bytes::complete::{tag, take_while, take_while1},
     character::complete::{char, space0},
@@ -89,107 +104,1047 @@ fn parse_line(input: &str) -> IResult<&str, LineType> {
 
 use rayon::prelude::*;
 
-const CHUNK_SIZE: usize = 10000;
+/// Smallest byte range handed to one rayon task in the ~ASCII section.
+const MIN_CHUNK_BYTES: usize = 256 * 1024;
 
-pub fn parse_las_from_reader<R: BufRead>(reader: R) -> Result<LASFile, Box<dyn std::error::Error>> {
-    let mut las = LASFile::default();
-    let mut current_section = "None".to_string();
-    let mut data_values: Vec<f64> = Vec::new();
-    let mut ncols = 0;
-    
-    // Chunk buffer for data lines
-    let mut line_chunk: Vec<String> = Vec::with_capacity(CHUNK_SIZE);
-    
-    // Helper closure to process chunk
-    let process_chunk = |chunk: &Vec<String>, data_vals: &mut Vec<f64>, ncols_ref: &mut usize| {
-        if chunk.is_empty() { return; }
-        // Parse in parallel
-        let parsed_rows: Vec<Vec<f64>> = chunk.par_iter()
-            .map(|line| {
-                 line.split_whitespace()
-                    .filter_map(|s| s.parse::<f64>().ok())
-                    .collect()
-            })
-            .collect();
-        
-        for row in parsed_rows {
-            if !row.is_empty() {
-                if *ncols_ref == 0 {
-                    *ncols_ref = row.len();
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
+pub(crate) enum Section {
+    None,
+    Version,
+    Well,
+    Curves,
+    Params,
+    Other,
+    Ascii,
+    Unknown,
+}
+
+/// Standard LAS 3.0 data groups; a `<group>_Parameter`, `_Definition` or
+/// `_Data` title with one of these is a LAS 3.0 section whatever the VERS of
+/// the file.
+const LAS3_GROUPS: [&str; 6] = ["LOG", "CORE", "INCLINOMETRY", "DRILLING", "TOPS", "TEST"];
+
+impl Section {
+    /// Section opened by a `~` line titled `title`; `las3` tells whether the
+    /// file declared VERS 3.x before it.
+    fn from_title(title: &str, las3: bool) -> Self {
+        // LAS 3.0 names sections `<group>_<kind>`; the data section names its
+        // definition after a `|`. Only the Log group maps to the LAS 2.0
+        // sections; other groups (Core, Tops, ...) are skipped. Other titles
+        // with an underscore, like the `~Well_Information` of many LAS 2.0
+        // writers, fall back to the first letter.
+        let upper = title.to_ascii_uppercase();
+        let name = upper.split('|').next().unwrap_or("").trim();
+        let is_group = |&(group, kind): &(&str, &str)| {
+            (las3 || LAS3_GROUPS.contains(&group)) && ["PARAM", "DEF", "DATA"].iter().any(|k| kind.starts_with(k))
+        };
+        if let Some((group, kind)) = name.split_once('_').filter(is_group) {
+            return match (group, kind) {
+                ("LOG", kind) if kind.starts_with("DEF") => Section::Curves,
+                ("LOG", kind) if kind.starts_with("DATA") => Section::Ascii,
+                ("LOG", kind) if kind.starts_with("PARAM") => Section::Params,
+                _ => Section::Unknown,
+            };
+        }
+        if upper.starts_with('A') || title.contains("ASCII") {
+            return Section::Ascii;
+        }
+        match title.chars().next().unwrap_or(' ').to_ascii_uppercase() {
+            'V' => Section::Version,
+            'W' => Section::Well,
+            'C' => Section::Curves,
+            'P' => Section::Params,
+            'O' => Section::Other,
+            _ => Section::Unknown,
+        }
+    }
+}
+
+/// The header item on `line`, if it holds one.
+pub(crate) fn header_item(line: &str) -> Option<HeaderItem> {
+    match parse_line(line) {
+        Ok((_, LineType::HeaderItem(item))) => Some(item),
+        _ => None,
+    }
+}
+
+/// Apply one header line to `las`, keeping track of the current section.
+///
+/// Returns `true` when the line opens the ~ASCII section.
+pub(crate) fn parse_header_line(las: &mut LASFile, section: &mut Section, line: &str) -> bool {
+    match parse_line(line) {
+        Ok((_, LineType::SectionTitle(title))) => {
+            let las3 = las.version.items.get("VERS").map_or(false, |vers| vers.value.trim().starts_with('3'));
+            *section = Section::from_title(&title, las3);
+            return *section == Section::Ascii;
+        },
+        Ok((_, LineType::HeaderItem(item))) => {
+            match *section {
+                Section::Version => las.version.insert(item),
+                Section::Well => las.well.insert(item),
+                Section::Params => las.params.insert(item),
+                Section::Curves => {
+                     let curve = CurveItem::new(&item.mnemonic, &item.unit, &item.value, &item.descr);
+                     las.curves.insert(curve);
+                },
+                Section::Other => {
+                    las.other.push_str(line.trim());
+                    las.other.push('\n');
+                },
+                _ => {}
+            }
+        },
+        Ok((_, LineType::DataLine(content))) => {
+            if *section == Section::Other {
+                las.other.push_str(&content);
+                las.other.push('\n');
+            }
+        },
+        _ => {}
+    }
+    false
+}
+
+/// Options controlling what a read produces.
+#[derive(Debug, Clone, Default)]
+pub struct ReadOptions {
+    /// Curves to keep, by mnemonic and in this order; `None` keeps them all.
+    /// Other columns are tokenized past but never converted or stored.
+    pub curves: Option<Vec<String>>,
+    /// Keep only data rows `start..end` (counted from 0, blank and comment
+    /// lines excluded).
+    pub rows: Option<Range<usize>>,
+    /// Keep only rows whose first value (the index curve) lies between these
+    /// two depths, inclusive and in either order.
+    pub depth_range: Option<(f64, f64)>,
+    /// Where windowed reads keep the sparse depth index of a file.
+    pub index: IndexMode,
+    /// Which values are read as missing (NaN).
+    pub nulls: NullPolicy,
+    /// What to do with tokens that are not numbers.
+    pub errors: TokenErrors,
+    /// Storage type of every curve: float64 (the `data` matrix) or float32.
+    pub dtype: DType,
+    /// Per-curve storage types, by mnemonic. They take precedence over the
+    /// LAS 3.0 format of a curve (`{S}`, `{I}`), which takes precedence over
+    /// `dtype`.
+    pub dtypes: HashMap<String, DType>,
+    /// Text encoding of the file; detected by default.
+    pub encoding: TextEncoding,
+    /// On-disk cache of parsed files used by [`read_las_file_with`]; `None`
+    /// parses every time.
+    pub cache: Option<CacheOptions>,
+    /// Collects the time, bytes and rows of every phase of the read.
+    pub stats: Option<Arc<ReadStats>>,
+}
+
+/// Values of the ~ASCII section replaced with NaN while parsing.
+#[derive(Debug, Clone, Default, PartialEq)]
+pub enum NullPolicy {
+    /// Keep sentinel values as ordinary numbers.
+    Keep,
+    /// Replace the ~Well NULL value.
+    #[default]
+    Header,
+    /// Replace the ~Well NULL value and each of these values.
+    Values(Vec<f64>),
+}
+
+/// Handling of data tokens that are not numbers.
+#[derive(Debug, Clone, Copy, Default, PartialEq, Eq)]
+pub enum TokenErrors {
+    /// Read them as NaN; later values keep their column.
+    #[default]
+    Nan,
+    /// Fail the read with [`LasError::InvalidValue`].
+    Raise,
+}
+
+/// Per-token rules applied inline by [`parse_data_section`].
+#[derive(Debug, Clone, Default)]
+pub(crate) struct ValueRules {
+    nulls: Vec<f64>,
+    errors: TokenErrors,
+    text: TextDecoder,
+}
+
+impl ValueRules {
+    /// Rules for a file whose headers are `las`, with strings decoded by
+    /// `text`.
+    pub(crate) fn new(las: &LASFile, nulls: &NullPolicy, errors: TokenErrors, text: TextDecoder) -> Self {
+        let header = || las.well.items.get("NULL").and_then(|item| item.value.trim().parse::<f64>().ok());
+        let nulls = match nulls {
+            NullPolicy::Keep => Vec::new(),
+            NullPolicy::Header => header().into_iter().collect(),
+            NullPolicy::Values(values) => header().into_iter().chain(values.iter().copied()).collect(),
+        };
+        Self { nulls, errors, text }
+    }
+
+    /// Float value of `token`; NaN for nulls, `None` if it must raise.
+    #[inline]
+    fn value(&self, token: &[u8]) -> Option<f64> {
+        match parse_f64(token) {
+            Some(value) if self.nulls.contains(&value) => Some(f64::NAN),
+            Some(value) => Some(value),
+            None if self.errors == TokenErrors::Raise => None,
+            None => Some(f64::NAN),
+        }
+    }
+
+    /// Integer value of `token`; `Some(None)` for nulls (and for bad tokens
+    /// unless they must raise), `None` if it must raise.
+    fn int_value(&self, token: &[u8]) -> Option<Option<i64>> {
+        let exact = std::str::from_utf8(token).ok().and_then(|t| t.parse::<i64>().ok());
+        let value = match exact {
+            Some(value) => Some(value).filter(|&v| !self.nulls.contains(&(v as f64))),
+            None => {
+                let value = self.value(token)?;
+                if value.is_nan() {
+                    None
+                } else if value.fract() == 0.0 && value.abs() < i64::MAX as f64 {
+                    Some(value as i64)
+                } else if self.errors == TokenErrors::Raise {
+                    return None;
+                } else {
+                    None
                 }
-                data_vals.extend(row);
             }
+        };
+        Some(value)
+    }
+
+    /// String value of `token` without its quotes; `None` for nulls.
+    fn text_value(&self, token: &[u8]) -> Option<String> {
+        if parse_f64(token).map_or(false, |value| self.nulls.contains(&value)) {
+            return None;
+        }
+        let text = match token {
+            [b'"', inner @ .., b'"'] => inner,
+            _ => token,
+        };
+        Some(self.text.decode(text).into_owned())
+    }
+}
+
+impl ReadOptions {
+    fn is_windowed(&self) -> bool {
+        self.rows.is_some() || self.depth_range.is_some()
+    }
+
+    /// Storage type of `curve` under these options.
+    pub(crate) fn dtype_of(&self, curve: &CurveItem) -> DType {
+        self.dtypes
+            .get(&curve.mnemonic)
+            .copied()
+            .or_else(|| DType::from_format(curve))
+            .unwrap_or(self.dtype)
+    }
+}
+
+/// Whether the ~ASCII section of `las` is wrapped (`WRAP YES`), with each
+/// depth step spread over several lines.
+pub(crate) fn is_wrapped(las: &LASFile) -> bool {
+    las.version.items.get("WRAP").map_or(false, |item| item.value.trim().eq_ignore_ascii_case("YES"))
+}
+
+/// Whether the ~ASCII section of `las` separates values with commas.
+pub(crate) fn is_comma_delimited(las: &LASFile) -> bool {
+    las.version.items.get("DLM").map_or(false, |item| item.value.trim().eq_ignore_ascii_case("COMMA"))
+}
+
+/// Column index of every named curve, in the given order, skipping repeats.
+pub(crate) fn resolve_curves(curves: &SectionCurves, names: &[String]) -> Result<Vec<usize>, LasError> {
+    let mut columns = Vec::with_capacity(names.len());
+    for name in names {
+        let index = curves
+            .items
+            .get_index_of(name.as_str())
+            .ok_or_else(|| LasError::CurveNotFound(name.clone()))?;
+        if !columns.contains(&index) {
+            columns.push(index);
+        }
+    }
+    Ok(columns)
+}
+
+/// The curves at `columns`, in that order.
+pub(crate) fn select_curves(curves: &SectionCurves, columns: &[usize]) -> SectionCurves {
+    let mut selected = SectionCurves::new();
+    for &i in columns {
+        if let Some((_, curve)) = curves.items.get_index(i) {
+            selected.insert(curve.clone());
+        }
+    }
+    selected
+}
+
+/// Parse a LAS file from any buffered reader.
+///
+/// The input is read into memory once and handed to [`parse_las_from_bytes`];
+/// prefer [`read_las_file`] for files on disk, which maps them instead.
+pub fn parse_las_from_reader<R: BufRead>(mut reader: R) -> Result<LASFile, LasError> {
+    let mut bytes = Vec::new();
+    reader.read_to_end(&mut bytes)?;
+    parse_las_from_bytes(&bytes)
+}
+
+/// Parse the header sections from `reader`, stopping right after the ~ASCII
+/// title line so none of the data is read.
+///
+/// Lines are decoded with `text`, which learns the encoding as it goes.
+/// Returns the headers (with an empty `data` matrix) and whether a ~ASCII
+/// section was found.
+pub(crate) fn parse_headers_from_reader<R: BufRead>(reader: &mut R, text: &mut TextDecoder) -> Result<(LASFile, bool), LasError> {
+    let mut las = LASFile::default();
+    let mut section = Section::None;
+    let mut line = Vec::new();
+    loop {
+        line.clear();
+        if reader.read_until(b'\n', &mut line)? == 0 {
+            return Ok((las, false));
+        }
+        if parse_header_line(&mut las, &mut section, &text.decode_line(&line)) {
+            return Ok((las, true));
+        }
+    }
+}
+
+/// Read only the header sections of a LAS file on disk.
+///
+/// Reading stops at the ~ASCII marker, so the cost does not depend on the
+/// size of the data section. The returned `data` matrix has no rows.
+pub fn read_las_header<P: AsRef<Path>>(path: P) -> Result<LASFile, LasError> {
+    read_las_header_with(path, TextEncoding::Auto)
+}
+
+/// [`read_las_header`] for a file in the given text encoding.
+pub fn read_las_header_with<P: AsRef<Path>>(path: P, encoding: TextEncoding) -> Result<LASFile, LasError> {
+    let (mut reader, mut text) = transcode_stream(open_stream(path)?, encoding)?;
+    let (mut las, _) = parse_headers_from_reader(&mut reader, &mut text)?;
+    las.data = Array2::zeros((0, las.curves.items.len()).f());
+    Ok(las)
+}
+
+/// Memory-map a LAS file and parse it with [`parse_las_from_bytes`].
+///
+/// Gzip, zstd and zip compressed files are decompressed into memory first.
+pub fn read_las_file<P: AsRef<Path>>(path: P) -> Result<LASFile, LasError> {
+    read_las_file_with(path, &ReadOptions::default())
+}
+
+/// [`read_las_file`] with explicit [`ReadOptions`].
+///
+/// Windowed reads (`rows` / `depth_range`) look up the file's sparse depth
+/// index according to `options.index`, so repeated windows of the same file
+/// seek straight to the rows they need. With `options.cache`, a current cache
+/// entry is loaded instead of parsing, and a fresh parse is stored.
+pub fn read_las_file_with<P: AsRef<Path>>(path: P, options: &ReadOptions) -> Result<LASFile, LasError> {
+    let path = path.as_ref();
+    let stats = options.stats.as_deref();
+    let span = Span::start(stats, Phase::Open);
+    let file = File::open(path)?;
+    if file.metadata()?.len() == 0 {
+        return parse_las_from_bytes_with(&[], options);
+    }
+    // SAFETY: the mapping is read-only and dropped before returning; the
+    // parsed LASFile owns copies of everything it keeps.
+    let mmap = unsafe { Mmap::map(&file)? };
+    span.end(mmap.len(), 0);
+    let entry = match &options.cache {
+        Some(cache) => {
+            let span = Span::start(stats, Phase::CacheLoad);
+            let entry = CacheEntry::new(cache, path, &file, &mmap, options)?;
+            let loaded = entry.load();
+            span.end(mmap.len(), loaded.as_ref().map_or(0, |las| las.data.nrows()));
+            if let Some(las) = loaded {
+                return Ok(las);
+            }
+            Some(entry)
         }
+        None => None,
     };
-    
-    for line_result in reader.lines() {
-        let line = line_result?;
-        
-        // Optimize for Data section
-        if current_section.starts_with('A') || current_section.contains("ASCII") {
-             // Check if we hit a new section
-             if line.trim().starts_with('~') {
-                  // Flus chunk
-                  process_chunk(&line_chunk, &mut data_values, &mut ncols);
-                  line_chunk.clear();
-                  
-                  let (_, title) = parse_section_title(line.trim()).unwrap_or(("", "Unknown".to_string()));
-                  current_section = title;
-                  continue;
-             }
-             
-             line_chunk.push(line);
-             
-             if line_chunk.len() >= CHUNK_SIZE {
-                 process_chunk(&line_chunk, &mut data_values, &mut ncols);
-                 line_chunk.clear();
-             }
-             continue;
-        }
-
-        match parse_line(&line) {
-            Ok((_, LineType::SectionTitle(title))) => {
-                current_section = title;
-            },
-            Ok((_, LineType::HeaderItem(item))) => {
-                let s = current_section.chars().nth(0).unwrap_or(' ').to_ascii_uppercase();
-                match s {
-                    'V' => las.version.insert(item),
-                    'W' => las.well.insert(item),
-                    'P' => las.params.insert(item),
-                    'C' => {
-                         let curve = CurveItem::new(&item.mnemonic, &item.unit, &item.value, &item.descr);
-                         las.curves.insert(curve);
-                    },
-                    _ => {
-                        // param/other?
+    let las = match Compression::detect(&mmap) {
+        Compression::None => {
+            let store = match options.is_windowed() {
+                true => Some(IndexStore::new(path, &file, options.index)?),
+                false => None,
+            };
+            parse_las(&mmap, options, store.as_ref())?
+        }
+        // The sparse index holds offsets into the decompressed text, which
+        // only exists for this read, so windows are indexed afresh.
+        _ => parse_las(&decompress_timed(&mmap, stats)?, options, None)?,
+    };
+    if let Some(entry) = &entry {
+        let span = Span::start(stats, Phase::CacheStore);
+        entry.store(&las);
+        span.end(0, las.data.nrows());
+    }
+    Ok(las)
+}
+
+/// [`decompress`], recorded as a phase of the read if the input was
+/// compressed.
+fn decompress_timed<'a>(bytes: &'a [u8], stats: Option<&ReadStats>) -> Result<Cow<'a, [u8]>, LasError> {
+    let span = Span::start(stats, Phase::Decompress);
+    let text = decompress(bytes)?;
+    if let Cow::Owned(text) = &text {
+        span.end(text.len(), 0);
+    }
+    Ok(text)
+}
+
+/// Parse a whole LAS file held in memory.
+///
+/// Header lines are parsed one at a time. The ~ASCII section is located by
+/// byte offset and parsed in parallel straight from the byte slice into a
+/// preallocated column-major matrix.
+pub fn parse_las_from_bytes(bytes: &[u8]) -> Result<LASFile, LasError> {
+    parse_las_from_bytes_with(bytes, &ReadOptions::default())
+}
+
+/// [`parse_las_from_bytes`] with explicit [`ReadOptions`].
+///
+/// Gzip, zstd and zip compressed input is decompressed first.
+pub fn parse_las_from_bytes_with(bytes: &[u8], options: &ReadOptions) -> Result<LASFile, LasError> {
+    parse_las(&decompress_timed(bytes, options.stats.as_deref())?, options, None)
+}
+
+/// Index of the ~ASCII data starting at `data_start`, from `store` when it
+/// holds a current one, otherwise built (and stored) now.
+fn data_index(bytes: &[u8], data_start: usize, store: Option<&IndexStore>) -> Arc<DepthIndex> {
+    if let Some(index) = store.and_then(IndexStore::load).filter(|i| i.data_start == data_start) {
+        return index;
+    }
+    let index = DepthIndex::build(bytes, data_start, find_section_end(bytes, data_start));
+    match store {
+        Some(store) => store.store(index),
+        None => Arc::new(index),
+    }
+}
+
+fn parse_las(bytes: &[u8], options: &ReadOptions, store: Option<&IndexStore>) -> Result<LASFile, LasError> {
+    if options.rows.is_some() && options.depth_range.is_some() {
+        return Err(LasError::InvalidOptions("rows and depth_range cannot be combined".to_string()));
+    }
+    if !matches!(options.dtype, DType::Float64 | DType::Float32) {
+        return Err(LasError::InvalidOptions("dtype must be float64 or float32; use dtypes for other curve types".to_string()));
+    }
+    let stats = options.stats.as_deref();
+    // Only header lines are decoded; ASCII-compatible input keeps its bytes.
+    let span = Span::start(stats, Phase::Decode);
+    let (bytes, mut text) = transcode(bytes, options.encoding);
+    let bytes = &bytes[..];
+    span.end(bytes.len(), 0);
+    let mut headers = Some(Span::start(stats, Phase::Headers));
+    let mut las = LASFile::default();
+    let mut section = Section::None;
+    let mut data: Option<ParsedData> = None;
+    let mut columns: Option<Vec<usize>> = None;
+    let mut selected: Vec<usize> = Vec::new();
+    let mut pos = 0;
+
+    while pos < bytes.len() {
+        let end = memchr(b'\n', &bytes[pos..]).map_or(bytes.len(), |i| pos + i);
+        let line = text.decode_line(&bytes[pos..end]);
+        pos = (end + 1).min(bytes.len());
+
+        if parse_header_line(&mut las, &mut section, &line) {
+            // Only the first ~ASCII section holds the curve data.
+            if data.is_some() {
+                pos = find_section_end(bytes, pos);
+                continue;
+            }
+            if let Some(span) = headers.take() {
+                span.end(pos, 0);
+            }
+            // Wrapped steps span several lines, so the line-based depth
+            // index does not apply to them.
+            let wrapped = is_wrapped(&las);
+            let index = match options.is_windowed() && !wrapped {
+                true => {
+                    let span = Span::start(stats, Phase::Index);
+                    let index = data_index(bytes, pos, store);
+                    span.end(index.data_end - pos, 0);
+                    Some(index)
+                }
+                false => None,
+            };
+            let data_end = index.as_ref().map_or_else(|| find_section_end(bytes, pos), |i| i.data_end);
+            if let Some(names) = &options.curves {
+                columns = Some(resolve_curves(&las.curves, names)?);
+            }
+            let ascii = &bytes[pos..data_end];
+            let comma = is_comma_delimited(&las);
+            let source_width = match wrapped {
+                true => las.curves.items.len(),
+                false => first_row_width(ascii, comma),
+            };
+            selected = columns.clone().unwrap_or_else(|| (0..source_width).collect());
+            let dtype_at = |src: usize| las.curves.items.get_index(src).map_or(DType::Float64, |(_, c)| options.dtype_of(c));
+            let projection = Projection::new(source_width, columns.as_deref(), dtype_at, comma);
+            let rules = ValueRules::new(&las, &options.nulls, options.errors, text);
+            data = Some(match wrapped {
+                true => parse_wrapped_section(ascii, &projection, &rules, source_width, options.rows.clone(), options.depth_range)?,
+                false => {
+                    let filtered;
+                    let window = match (&index, &options.rows, options.depth_range) {
+                        (Some(index), Some(rows), _) => &ascii[index.rows_window(ascii, rows.clone())],
+                        (Some(index), None, Some((top, bottom))) if index.monotonic => {
+                            &ascii[index.depth_window(ascii, top, bottom)]
+                        }
+                        (Some(_), None, Some((top, bottom))) => {
+                            filtered = depth_lines(ascii, top, bottom);
+                            &filtered[..]
+                        }
+                        _ => ascii,
+                    };
+                    parse_data_section(window, &projection, &rules)?
+                }
+            });
+            if let Some(parsed) = &data {
+                let (profile, rows) = (parsed.profile, parsed.matrix.nrows());
+                record(stats, Phase::Split, profile.split, ascii.len(), 0);
+                record(stats, Phase::Parse, profile.parse, ascii.len(), rows);
+                if let Some(stats) = stats {
+                    stats.add_chunks(profile.chunks);
+                }
+            }
+            pos = data_end;
+        }
+    }
+    if let Some(span) = headers.take() {
+        span.end(pos, 0);
+    }
+    let span = Span::start(stats, Phase::Assemble);
+
+    // Typed columns come out of the parser in output column order.
+    let typed_names: Vec<String> = selected
+        .iter()
+        .filter_map(|&src| las.curves.items.get_index(src))
+        .filter(|(_, curve)| options.dtype_of(curve) != DType::Float64)
+        .map(|(name, _)| name.clone())
+        .collect();
+    if let Some(names) = &options.curves {
+        let columns = match columns {
+            Some(columns) => columns,
+            None => resolve_curves(&las.curves, names)?,
+        };
+        las.curves = select_curves(&las.curves, &columns);
+    }
+    match data {
+        Some(parsed) if parsed.matrix.nrows() > 0 => {
+            las.data = parsed.matrix;
+            las.columns = typed_names.into_iter().zip(parsed.columns).collect();
+        }
+        _ => {
+            let mut float64 = 0;
+            for curve in las.curves.items.values() {
+                match options.dtype_of(curve) {
+                    DType::Float64 => float64 += 1,
+                    dtype => {
+                        las.columns.insert(curve.mnemonic.clone(), Column::empty(dtype));
                     }
                 }
-            },
-            Ok((_, LineType::DataLine(content))) => {
-                if current_section.starts_with('O') {
-                    las.other.push_str(&content);
-                    las.other.push('\n');
+            }
+            las.data = Array2::zeros((0, float64).f());
+        }
+    }
+    let held = las.data.len() * std::mem::size_of::<f64>() + las.columns.values().map(Column::nbytes).sum::<usize>();
+    span.end(held, las.data.nrows());
+    Ok(las)
+}
+
+/// Offset of the first line at or after `start` that opens a new section.
+pub(crate) fn find_section_end(bytes: &[u8], start: usize) -> usize {
+    for i in memchr_iter(b'~', &bytes[start..]) {
+        let at = start + i;
+        let line_start = memrchr(b'\n', &bytes[start..at]).map_or(start, |j| start + j + 1);
+        if bytes[line_start..at].iter().all(u8::is_ascii_whitespace) {
+            return line_start;
+        }
+    }
+    bytes.len()
+}
+
+/// Split `data` into roughly equal byte ranges that end on newlines.
+pub(crate) fn split_at_newlines(data: &[u8], parts: usize) -> Vec<&[u8]> {
+    let target = (data.len() / parts.max(1)).max(MIN_CHUNK_BYTES);
+    let mut chunks = Vec::new();
+    let mut start = 0;
+    while start < data.len() {
+        let mut end = (start + target).min(data.len());
+        if end < data.len() {
+            end = memchr(b'\n', &data[end..]).map_or(data.len(), |i| end + i + 1);
+        }
+        chunks.push(&data[start..end]);
+        start = end;
+    }
+    chunks
+}
+
+pub(crate) fn is_data_line(line: &[u8]) -> bool {
+    match line.iter().find(|b| !b.is_ascii_whitespace()) {
+        Some(&b) => b != b'#',
+        None => false,
+    }
+}
+
+pub(crate) fn data_lines(chunk: &[u8]) -> impl Iterator<Item = &[u8]> {
+    chunk.split(|&b| b == b'\n').filter(|line| is_data_line(line))
+}
+
+/// Whether the line opens a new section (`~` as first non-blank byte).
+pub(crate) fn is_section_line(line: &[u8]) -> bool {
+    line.iter().find(|b| !b.is_ascii_whitespace()) == Some(&b'~')
+}
+
+/// Number of values on the first data row; this sets the matrix width.
+pub(crate) fn first_row_width(data: &[u8], comma: bool) -> usize {
+    data_lines(data).next().map_or(0, |line| delimited_tokens(line, comma).count())
+}
+
+/// Raw view of a column-major matrix that several rayon tasks fill at once.
+///
+/// Every element is written by a single task, so no two threads touch the
+/// same element.
+struct SharedMatrix {
+    ptr: *mut f64,
+    nrows: usize,
+}
+
+unsafe impl Send for SharedMatrix {}
+unsafe impl Sync for SharedMatrix {}
+
+impl SharedMatrix {
+    /// SAFETY: `row`/`col` must be in bounds and owned by the calling task.
+    unsafe fn write(&self, row: usize, col: usize, value: f64) {
+        *self.ptr.add(col * self.nrows + row) = value;
+    }
+}
+
+/// Column of the output that holds one shared, preallocated column.
+struct SharedColumn<T> {
+    ptr: *mut T,
+}
+
+unsafe impl<T: Send> Send for SharedColumn<T> {}
+unsafe impl<T: Send> Sync for SharedColumn<T> {}
+
+impl<T> SharedColumn<T> {
+    fn new(values: &mut [T]) -> Self {
+        Self { ptr: values.as_mut_ptr() }
+    }
+
+    /// SAFETY: `row` must be in bounds and owned by the calling task.
+    unsafe fn write(&self, row: usize, value: T) {
+        *self.ptr.add(row) = value;
+    }
+}
+
+/// Where one kept source column is stored.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum Slot {
+    /// Tokenized past but never converted.
+    Skip,
+    /// Column of the float64 matrix.
+    Matrix(usize),
+    /// Index into the typed columns.
+    Typed(usize),
+}
+
+/// Where each source column of the ~ASCII section lands in the output.
+pub(crate) struct Projection {
+    /// Destination per source column. It ends at the last kept column, so
+    /// the rest of a row is not scanned at all.
+    slots: Vec<Slot>,
+    /// Columns of the float64 matrix.
+    width: usize,
+    /// Storage type of every typed column, in output column order.
+    kinds: Vec<DType>,
+    comma: bool,
+}
+
+impl Projection {
+    /// Keep `columns` (source indices, in output order) of a section whose
+    /// rows have `source_width` values (taken from the first row, or the
+    /// curve count of wrapped data); `None` keeps every column.
+    ///
+    /// `dtype` gives the storage type of a source column: float64 columns go
+    /// to the matrix, any other to a typed column of its own. `comma` splits
+    /// values at commas instead of whitespace.
+    pub(crate) fn new(source_width: usize, columns: Option<&[usize]>, dtype: impl Fn(usize) -> DType, comma: bool) -> Self {
+        let selected: Vec<usize> = match columns {
+            Some(columns) => columns.to_vec(),
+            None => (0..source_width).collect(),
+        };
+        let len = selected.iter().map(|&c| c + 1).max().unwrap_or(0).min(source_width);
+        let mut slots = vec![Slot::Skip; len];
+        let mut width = 0;
+        let mut kinds = Vec::new();
+        for &src in &selected {
+            let slot = match dtype(src) {
+                DType::Float64 => {
+                    width += 1;
+                    Slot::Matrix(width - 1)
+                }
+                kind => {
+                    kinds.push(kind);
+                    Slot::Typed(kinds.len() - 1)
+                }
+            };
+            if src < len {
+                slots[src] = slot;
+            }
+        }
+        Self { slots, width, kinds, comma }
+    }
+}
+
+/// Values parsed from a ~ASCII section.
+pub(crate) struct ParsedData {
+    /// Float64 columns, column-major.
+    pub(crate) matrix: Array2<f64>,
+    /// Typed columns, in the order of [`Projection`]'s typed slots.
+    pub(crate) columns: Vec<Column>,
+    pub(crate) profile: DataProfile,
+}
+
+impl ParsedData {
+    /// Keep only `rows`, in that order.
+    fn take_rows(self, rows: &[usize]) -> Self {
+        let mut matrix = Array2::zeros((rows.len(), self.matrix.ncols()).f());
+        for (mut out, values) in matrix.columns_mut().into_iter().zip(self.matrix.columns()) {
+            for (value, &row) in out.iter_mut().zip(rows) {
+                *value = values[row];
+            }
+        }
+        let columns = self.columns.iter().map(|column| column.take(rows)).collect();
+        Self { matrix, columns, profile: self.profile }
+    }
+}
+
+/// How the parse of a ~ASCII section went, for [`ReadStats`].
+#[derive(Debug, Clone, Copy, Default)]
+pub(crate) struct DataProfile {
+    /// Byte ranges parsed as separate rayon tasks.
+    pub(crate) chunks: usize,
+    /// Counting pass over the ranges.
+    pub(crate) split: Duration,
+    /// Tokenizing and converting the values.
+    pub(crate) parse: Duration,
+}
+
+/// Preallocated storage of one typed column while it is being filled.
+enum Sink {
+    Float64(Vec<f64>),
+    Float32(Vec<f32>),
+    Int64(Vec<i64>, Vec<bool>),
+    /// Strings are collected per range and encoded afterwards.
+    Text(usize),
+}
+
+enum SinkWriter {
+    Float64(SharedColumn<f64>),
+    Float32(SharedColumn<f32>),
+    Int64(SharedColumn<i64>, SharedColumn<bool>),
+    Text(usize),
+}
+
+impl Column {
+    /// A column of `dtype` without rows.
+    pub(crate) fn empty(dtype: DType) -> Self {
+        match dtype {
+            DType::Float64 => Column::Float64(Array1::zeros(0)),
+            DType::Float32 => Column::Float32(Array1::zeros(0)),
+            DType::Int64 => Column::Int64 { values: Array1::zeros(0), valid: Vec::new() },
+            DType::Text => Column::Text(TextColumn::default()),
+        }
+    }
+}
+
+fn invalid_value(row: usize, column: usize, token: &[u8]) -> LasError {
+    LasError::InvalidValue { row, column, token: String::from_utf8_lossy(token).into_owned() }
+}
+
+/// A string found by one task: text column, output row and value.
+type TextValue = (usize, usize, String);
+
+/// Outputs of a parse, preallocated for a known number of rows.
+struct Outputs {
+    matrix: Array2<f64>,
+    sinks: Vec<Sink>,
+    ntext: usize,
+}
+
+impl Outputs {
+    fn new(projection: &Projection, nrows: usize) -> Self {
+        let mut ntext = 0;
+        let sinks = projection
+            .kinds
+            .iter()
+            .map(|kind| match kind {
+                DType::Float64 => Sink::Float64(vec![f64::NAN; nrows]),
+                DType::Float32 => Sink::Float32(vec![f32::NAN; nrows]),
+                DType::Int64 => Sink::Int64(vec![0; nrows], vec![false; nrows]),
+                DType::Text => {
+                    ntext += 1;
+                    Sink::Text(ntext - 1)
+                }
+            })
+            .collect();
+        let matrix = Array2::from_elem((nrows, projection.width).f(), f64::NAN);
+        Self { matrix, sinks, ntext }
+    }
+
+    /// Raw writers that several tasks use to fill the outputs at once.
+    fn writers<'a>(&mut self, projection: &'a Projection, rules: &'a ValueRules) -> Writers<'a> {
+        Writers {
+            matrix: SharedMatrix { ptr: self.matrix.as_mut_ptr(), nrows: self.matrix.nrows() },
+            sinks: self
+                .sinks
+                .iter_mut()
+                .map(|sink| match sink {
+                    Sink::Float64(values) => SinkWriter::Float64(SharedColumn::new(values)),
+                    Sink::Float32(values) => SinkWriter::Float32(SharedColumn::new(values)),
+                    Sink::Int64(values, valid) => SinkWriter::Int64(SharedColumn::new(values), SharedColumn::new(valid)),
+                    Sink::Text(t) => SinkWriter::Text(*t),
+                })
+                .collect(),
+            projection,
+            rules,
+        }
+    }
+
+    /// The finished columns, given the strings found by every task.
+    fn finish(self, parts: Vec<Vec<TextValue>>) -> ParsedData {
+        let nrows = self.matrix.nrows();
+        let mut texts: Vec<Vec<Option<String>>> = vec![vec![None; nrows]; self.ntext];
+        for (t, row, value) in parts.into_iter().flatten() {
+            texts[t][row] = Some(value);
+        }
+        let mut texts = texts.into_iter();
+        let columns = self
+            .sinks
+            .into_iter()
+            .map(|sink| match sink {
+                Sink::Float64(values) => Column::Float64(Array1::from_vec(values)),
+                Sink::Float32(values) => Column::Float32(Array1::from_vec(values)),
+                Sink::Int64(values, valid) => Column::Int64 { values: Array1::from_vec(values), valid },
+                Sink::Text(_) => Column::Text(TextColumn::encode(texts.next().unwrap_or_default())),
+            })
+            .collect();
+        ParsedData { matrix: self.matrix, columns, profile: DataProfile::default() }
+    }
+}
+
+/// Converts tokens and stores them in the [`Outputs`] they were made from.
+struct Writers<'a> {
+    matrix: SharedMatrix,
+    sinks: Vec<SinkWriter>,
+    projection: &'a Projection,
+    rules: &'a ValueRules,
+}
+
+impl Writers<'_> {
+    /// Store `token`, the value of source column `column` in output row
+    /// `row`, where the projection puts it; strings go to `texts`.
+    ///
+    /// SAFETY: `row` must be in bounds, and no other task may store the same
+    /// `(row, column)`.
+    unsafe fn store(&self, row: usize, column: usize, token: &[u8], texts: &mut Vec<TextValue>) -> Result<(), LasError> {
+        let rules = self.rules;
+        match self.projection.slots.get(column).copied().unwrap_or(Slot::Skip) {
+            Slot::Skip => {}
+            Slot::Matrix(col) => {
+                let value = rules.value(token).ok_or_else(|| invalid_value(row, column, token))?;
+                self.matrix.write(row, col, value)
+            }
+            Slot::Typed(k) => match &self.sinks[k] {
+                SinkWriter::Float64(values) => {
+                    let value = rules.value(token).ok_or_else(|| invalid_value(row, column, token))?;
+                    values.write(row, value)
+                }
+                SinkWriter::Float32(values) => {
+                    let value = rules.value(token).ok_or_else(|| invalid_value(row, column, token))?;
+                    values.write(row, value as f32)
+                }
+                SinkWriter::Int64(values, valid) => {
+                    let value = rules.int_value(token).ok_or_else(|| invalid_value(row, column, token))?;
+                    if let Some(value) = value {
+                        values.write(row, value);
+                        valid.write(row, true);
+                    }
+                }
+                SinkWriter::Text(t) => {
+                    if let Some(value) = rules.text_value(token) {
+                        texts.push((*t, row, value));
+                    }
                 }
             },
-            _ => {}
         }
+        Ok(())
     }
-    
-    // Final flush
-    process_chunk(&line_chunk, &mut data_values, &mut ncols);
-    
-    // Assign data to curves
-    if ncols > 0 && !data_values.is_empty() {
-        let nrows = data_values.len() / ncols;
-        let arr = Array2::from_shape_vec((nrows, ncols), data_values)?;
-        
-        for (i, (_key, curve)) in las.curves.items.iter_mut().enumerate() {
-            if i < ncols {
-                curve.data = arr.column(i).to_vec();
+}
+
+/// First output row (or value) of every range, from the count of each.
+fn offsets(counts: &[usize]) -> (Vec<usize>, usize) {
+    let mut firsts = Vec::with_capacity(counts.len());
+    let mut total = 0;
+    for count in counts {
+        firsts.push(total);
+        total += count;
+    }
+    (firsts, total)
+}
+
+/// The strings of every range, or the error of the earliest range that
+/// failed, so the first bad token of the section is the one reported.
+fn collect_parts(parts: Vec<Result<Vec<TextValue>, LasError>>) -> Result<Vec<Vec<TextValue>>, LasError> {
+    parts.into_iter().collect()
+}
+
+/// Parse the ~ASCII section into a (rows x columns) column-major matrix plus
+/// the typed columns chosen by `projection`.
+///
+/// A first parallel pass counts the data rows of every byte range so each
+/// range knows its first output row; a second pass parses the values of every
+/// range directly into its slots. Null sentinels and, unless `rules` say to
+/// raise, unparsable values become NaN (or a null) as they are read, so a bad
+/// token never shifts the columns after it and no later pass is needed. Only
+/// the columns kept by `projection` are converted and stored.
+pub(crate) fn parse_data_section(data: &[u8], projection: &Projection, rules: &ValueRules) -> Result<ParsedData, LasError> {
+    let start = Instant::now();
+    let chunks = split_at_newlines(data, rayon::current_num_threads() * 4);
+    let row_counts: Vec<usize> = chunks.par_iter().map(|chunk| data_lines(chunk).count()).collect();
+    let (first_rows, nrows) = offsets(&row_counts);
+    let split = start.elapsed();
+
+    let mut outputs = Outputs::new(projection, nrows);
+    let mut parts = Vec::new();
+    if nrows > 0 && !projection.slots.is_empty() {
+        let writers = outputs.writers(projection, rules);
+        let width = projection.slots.len();
+        parts = collect_parts(
+            chunks
+                .par_iter()
+                .zip(first_rows.par_iter())
+                .map(|(chunk, &first_row)| {
+                    let mut texts = Vec::new();
+                    for (r, line) in data_lines(chunk).enumerate() {
+                        for (column, token) in delimited_tokens(line, projection.comma).take(width).enumerate() {
+                            // SAFETY: rows first_row.. belong to this range only.
+                            unsafe { writers.store(first_row + r, column, token, &mut texts)? }
+                        }
+                    }
+                    Ok(texts)
+                })
+                .collect(),
+        )?;
+    }
+    let mut parsed = outputs.finish(parts);
+    parsed.profile = DataProfile { chunks: chunks.len(), split, parse: start.elapsed() - split };
+    Ok(parsed)
+}
+
+/// Parse a wrapped (WRAP YES) ~ASCII section, where one depth step spans
+/// several lines, as a flat stream of `record` values per step.
+///
+/// A first parallel pass counts the values of every byte range, which fixes
+/// the row and column of each value; the second pass parses every range in
+/// place like [`parse_data_section`]. A step split across two ranges is
+/// simply filled by both. `rows` keeps only that range of steps, and
+/// `depth_range` the steps whose first value lies in it (found by a pass
+/// over the first values only, and exact even if the depths are out of
+/// order).
+pub(crate) fn parse_wrapped_section(
+    data: &[u8],
+    projection: &Projection,
+    rules: &ValueRules,
+    record: usize,
+    rows: Option<Range<usize>>,
+    depth_range: Option<(f64, f64)>,
+) -> Result<ParsedData, LasError> {
+    let start = Instant::now();
+    let comma = projection.comma;
+    let record = record.max(1);
+    let chunks = split_at_newlines(data, rayon::current_num_threads() * 4);
+    let value_counts: Vec<usize> = chunks
+        .par_iter()
+        .map(|chunk| data_lines(chunk).map(|line| delimited_tokens(line, comma).count()).sum())
+        .collect();
+    let (first_values, nvalues) = offsets(&value_counts);
+    let nrecords = nvalues.div_ceil(record);
+
+    let mut keep: Option<Vec<usize>> = None;
+    let window = match (rows, depth_range) {
+        (Some(rows), _) => rows.start.min(nrecords)..rows.end.clamp(rows.start.min(nrecords), nrecords),
+        (None, Some((top, bottom))) => {
+            let (lo, hi) = (top.min(bottom), top.max(bottom));
+            let depths: Vec<f64> = chunks
+                .par_iter()
+                .zip(first_values.par_iter())
+                .flat_map_iter(|(chunk, &first)| {
+                    data_lines(chunk)
+                        .flat_map(move |line| delimited_tokens(line, comma))
+                        .enumerate()
+                        .filter(move |(i, _)| (first + i) % record == 0)
+                        .map(|(_, token)| parse_f64(token).unwrap_or(f64::NAN))
+                })
+                .collect();
+            let inside = |&d: &f64| d >= lo && d <= hi;
+            match (depths.iter().position(inside), depths.iter().rposition(inside)) {
+                (Some(start), Some(end)) => {
+                    // Depths out of order can leave rows outside the interval
+                    // between the first and last rows inside it.
+                    if !depths[start..=end].iter().all(inside) {
+                        keep = Some((start..=end).filter(|&r| inside(&depths[r])).map(|r| r - start).collect());
+                    }
+                    start..end + 1
+                }
+                _ => 0..0,
             }
         }
+        _ => 0..nrecords,
+    };
+    let split = start.elapsed();
+
+    let mut outputs = Outputs::new(projection, window.len());
+    let mut parts = Vec::new();
+    if !window.is_empty() && !projection.slots.is_empty() {
+        let writers = outputs.writers(projection, rules);
+        let (start, end) = (window.start * record, window.end * record);
+        parts = collect_parts(
+            chunks
+                .par_iter()
+                .zip(first_values.par_iter().zip(value_counts.par_iter()))
+                .map(|(chunk, (&first, &count))| {
+                    let mut texts = Vec::new();
+                    if first + count <= start || first >= end {
+                        return Ok(texts);
+                    }
+                    let values = data_lines(chunk).flat_map(|line| delimited_tokens(line, comma));
+                    for (position, token) in (first..).zip(values) {
+                        if position < start {
+                            continue;
+                        }
+                        if position >= end {
+                            break;
+                        }
+                        let (row, column) = (position / record - window.start, position % record);
+                        // SAFETY: every value position belongs to one range only.
+                        unsafe { writers.store(row, column, token, &mut texts)? }
+                    }
+                    Ok(texts)
+                })
+                .collect(),
+        )?;
     }
-    
-    Ok(las)
+    let mut parsed = outputs.finish(parts);
+    if let Some(rows) = keep {
+        parsed = parsed.take_rows(&rows);
+    }
+    parsed.profile = DataProfile { chunks: chunks.len(), split, parse: start.elapsed() - split };
+    Ok(parsed)
 }
@@ -0,0 +1,258 @@
+//! Resampling curves onto a regular depth grid, and aligning many wells on a
+//! shared one.
+//!
+//! The position of every grid depth among the samples of the index curve is
+//! found once per file; every curve is then filled from those positions, one
+//! curve per task. Missing values (NaN) are never interpolated across: a
+//! grid depth next to a missing sample is missing too, and so is any depth
+//! outside the range of the file.
+use crate::{Column, HeaderItem, LASFile, LasError, TextColumn};
+use ndarray::{Array1, Array2, Array3, ArrayView1, CowArray, Ix1, ShapeBuilder};
+use rayon::prelude::*;
+
+/// Relative distance under which a grid depth counts as an exact sample, so
+/// rounding in `start + i * step` never turns a hit into an interpolation.
+pub(crate) const SNAP: f64 = 1e-9;
+
+/// How values between two samples are computed.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
+pub enum Interpolation {
+    #[default]
+    Linear,
+    /// The value of the closer sample.
+    Nearest,
+}
+
+impl Interpolation {
+    /// Parse `"linear"` or `"nearest"`.
+    pub fn parse(name: &str) -> Result<Self, LasError> {
+        match name.trim().to_ascii_lowercase().as_str() {
+            "linear" => Ok(Interpolation::Linear),
+            "nearest" => Ok(Interpolation::Nearest),
+            _ => Err(LasError::InvalidOptions(format!("method must be 'linear' or 'nearest', got '{}'", name))),
+        }
+    }
+}
+
+/// Where one grid depth falls among the samples of a file.
+#[derive(Debug, Clone, Copy, PartialEq)]
+enum Position {
+    Outside,
+    At(usize),
+    /// Between two rows, with the weight of the second one.
+    Between(usize, usize, f64),
+}
+
+impl Position {
+    /// Row providing the value of a nearest-sample read, if any.
+    fn nearest(self) -> Option<usize> {
+        match self {
+            Position::Outside => None,
+            Position::At(row) => Some(row),
+            Position::Between(a, b, w) => Some(if w < 0.5 { a } else { b }),
+        }
+    }
+
+    fn value(self, values: impl Fn(usize) -> f64, method: Interpolation) -> f64 {
+        match (self, method) {
+            (Position::Between(a, b, w), Interpolation::Linear) => {
+                let (x, y) = (values(a), values(b));
+                x + (y - x) * w
+            }
+            _ => self.nearest().map_or(f64::NAN, values),
+        }
+    }
+}
+
+/// Values of the index curve (the first curve) of `las`: borrowed from the
+/// float64 matrix, or widened from a float32 column.
+pub(crate) fn index_curve(las: &LASFile) -> Result<CowArray<'_, f64, Ix1>, LasError> {
+    let mnemonic = las.curves.items.get_index(0).map_or("", |(mnemonic, _)| mnemonic.as_str());
+    if let Some(values) = las.curve_data(mnemonic) {
+        return Ok(values.into());
+    }
+    match las.columns.get(mnemonic) {
+        Some(Column::Float32(values)) => Ok(values.mapv(f64::from).into()),
+        _ => Err(LasError::InvalidOptions("resampling needs a float index (first) curve".to_string())),
+    }
+}
+
+/// First and last index values of `las`, in file order, skipping missing
+/// ones; `None` if it has none.
+pub fn index_range(las: &LASFile) -> Option<(f64, f64)> {
+    let depths = index_curve(las).ok()?;
+    let first = depths.iter().copied().find(|d| !d.is_nan())?;
+    let last = depths.iter().copied().rev().find(|d| !d.is_nan())?;
+    Some((first, last))
+}
+
+/// Depths from `start` to `stop` (inclusive) every `step`.
+///
+/// `start` and `stop` default to the two ends of `range`. The direction of
+/// the grid is the one from `start` to `stop`; only the size of `step` is
+/// used.
+pub fn depth_grid(range: (f64, f64), step: f64, start: Option<f64>, stop: Option<f64>) -> Result<Vec<f64>, LasError> {
+    let start = start.unwrap_or(range.0);
+    let stop = stop.unwrap_or(range.1);
+    if !(step.is_finite() && step != 0.0 && start.is_finite() && stop.is_finite()) {
+        return Err(LasError::InvalidOptions(
+            "step must be non-zero, and start and stop finite (they default to the index range)".to_string(),
+        ));
+    }
+    let step = step.abs().copysign(stop - start);
+    let steps = ((stop - start) / step + SNAP).floor() as usize;
+    Ok((0..=steps).map(|i| start + i as f64 * step).collect())
+}
+
+/// Position of every depth of `grid` among `depths`, in any order and with
+/// missing values.
+fn positions(depths: ArrayView1<'_, f64>, grid: &[f64]) -> Vec<Position> {
+    let mut order: Vec<usize> = (0..depths.len()).filter(|&i| !depths[i].is_nan()).collect();
+    order.sort_by(|&a, &b| depths[a].total_cmp(&depths[b]));
+    grid.par_iter()
+        .map(|&depth| {
+            let k = order.partition_point(|&i| depths[i] < depth);
+            let near = |i: usize| (depths[i] - depth).abs() <= SNAP * depth.abs().max(1.0);
+            if let Some(&row) = order.get(k).filter(|&&row| near(row)) {
+                return Position::At(row);
+            }
+            if let Some(&row) = k.checked_sub(1).and_then(|k| order.get(k)).filter(|&&row| near(row)) {
+                return Position::At(row);
+            }
+            match (k.checked_sub(1).map(|k| order[k]), order.get(k)) {
+                (Some(a), Some(&b)) => Position::Between(a, b, (depth - depths[a]) / (depths[b] - depths[a])),
+                _ => Position::Outside,
+            }
+        })
+        .collect()
+}
+
+/// `column` at the grid `positions`. Integer and string curves always take
+/// the nearest sample.
+fn resample_column(column: &Column, positions: &[Position], method: Interpolation) -> Column {
+    match column {
+        Column::Float64(values) => Column::Float64(positions.iter().map(|p| p.value(|i| values[i], method)).collect()),
+        Column::Float32(values) => {
+            Column::Float32(positions.iter().map(|p| p.value(|i| values[i] as f64, method) as f32).collect())
+        }
+        Column::Int64 { values, valid } => {
+            let rows: Vec<Option<usize>> = positions.iter().map(|p| p.nearest().filter(|&i| valid[i])).collect();
+            Column::Int64 {
+                values: rows.iter().map(|row| row.map_or(0, |i| values[i])).collect::<Array1<i64>>(),
+                valid: rows.iter().map(Option::is_some).collect(),
+            }
+        }
+        Column::Text(text) => Column::Text(TextColumn {
+            codes: positions.iter().map(|p| p.nearest().map_or(-1, |i| text.codes[i])).collect(),
+            values: text.values.clone(),
+        }),
+    }
+}
+
+/// Set (or add) a ~Well item to a number.
+pub(crate) fn set_well_value(las: &mut LASFile, mnemonic: &str, unit: &str, value: f64) {
+    match las.well.items.get_mut(mnemonic) {
+        Some(item) => item.value = value.to_string(),
+        None => las.well.insert(HeaderItem::new(mnemonic, unit, &value.to_string(), "")),
+    }
+}
+
+/// `las` with every curve resampled onto `grid`.
+///
+/// The index curve becomes the grid itself and the ~Well STRT, STOP and
+/// STEP items are updated to match. Float curves are interpolated with
+/// `method`; integer and string curves take the nearest sample.
+pub fn resample(las: &LASFile, grid: &[f64], method: Interpolation) -> Result<LASFile, LasError> {
+    let depths = index_curve(las)?;
+    let positions = positions(depths.view(), grid);
+    let nrows = grid.len();
+    let first = las.curves.items.get_index(0).map_or("", |(m, _)| m.as_str());
+    let index = las.curve_index(first);
+
+    let mut values = vec![f64::NAN; nrows * las.data.ncols()];
+    values.par_chunks_mut(nrows.max(1)).enumerate().for_each(|(col, out)| {
+        if Some(col) == index {
+            out.copy_from_slice(grid);
+            return;
+        }
+        let source = las.data.column(col);
+        for (value, position) in out.iter_mut().zip(&positions) {
+            *value = position.value(|i| source[i], method);
+        }
+    });
+    let typed: Vec<(&String, &Column)> = las.columns.iter().collect();
+    let columns: Vec<Column> = typed
+        .par_iter()
+        .map(|&(mnemonic, column)| match mnemonic == first {
+            // A typed index curve is float32 (see `index_curve`).
+            true => Column::Float32(grid.iter().map(|&depth| depth as f32).collect()),
+            false => resample_column(column, &positions, method),
+        })
+        .collect();
+
+    let mut out = LASFile {
+        version: las.version.clone(),
+        well: las.well.clone(),
+        curves: las.curves.clone(),
+        params: las.params.clone(),
+        other: las.other.clone(),
+        data: Array2::from_shape_vec((nrows, las.data.ncols()).f(), values)
+            .expect("one column of grid values per data column"),
+        columns: las.columns.keys().cloned().zip(columns).collect(),
+    };
+    let unit = las.curves.items.get_index(0).map_or("", |(_, curve)| curve.unit.as_str()).to_string();
+    if let (Some(&first), Some(&last)) = (grid.first(), grid.last()) {
+        set_well_value(&mut out, "STRT", &unit, first);
+        set_well_value(&mut out, "STOP", &unit, last);
+        set_well_value(&mut out, "STEP", &unit, if grid.len() > 1 { grid[1] - grid[0] } else { 0.0 });
+    }
+    Ok(out)
+}
+
+/// Index range spanned by all of `wells` together, increasing.
+pub fn common_range(wells: &[&LASFile]) -> Option<(f64, f64)> {
+    wells
+        .iter()
+        .filter_map(|las| index_range(las))
+        .map(|(a, b)| (a.min(b), a.max(b)))
+        .reduce(|(lo, hi), (a, b)| (lo.min(a), hi.max(b)))
+}
+
+/// `curves` of every well resampled onto `grid`, stacked as one
+/// (wells x depths x curves) array in C order.
+///
+/// Wells are processed in parallel. A curve a well does not have is all NaN
+/// in that well, as are string curves; integer curves are converted to
+/// float with nulls as NaN.
+pub fn align(wells: &[&LASFile], curves: &[String], grid: &[f64], method: Interpolation) -> Result<Array3<f64>, LasError> {
+    let (ndepths, ncurves) = (grid.len(), curves.len());
+    let mut values = vec![f64::NAN; wells.len() * ndepths * ncurves];
+    values
+        .par_chunks_mut((ndepths * ncurves).max(1))
+        .zip(wells.par_iter())
+        .enumerate()
+        .try_for_each(|(w, (slab, las))| {
+            let depths = index_curve(las).map_err(|_| {
+                LasError::InvalidOptions(format!("well {} has no float index (first) curve", w))
+            })?;
+            let positions = positions(depths.view(), grid);
+            for (c, mnemonic) in curves.iter().enumerate() {
+                let cells = slab.iter_mut().skip(c).step_by(ncurves);
+                if let Some(source) = las.curve_data(mnemonic) {
+                    for (cell, position) in cells.zip(&positions) {
+                        *cell = position.value(|i| source[i], method);
+                    }
+                } else if let Some(column) = las.columns.get(mnemonic) {
+                    let method = match column {
+                        Column::Float64(_) | Column::Float32(_) => method,
+                        _ => Interpolation::Nearest,
+                    };
+                    for (cell, position) in cells.zip(&positions) {
+                        *cell = position.value(|i| column.value_f64(i), method);
+                    }
+                }
+            }
+            Ok::<(), LasError>(())
+        })?;
+    Ok(Array3::from_shape_vec((wells.len(), ndepths, ncurves), values).expect("one slab per well"))
+}
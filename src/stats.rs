@@ -0,0 +1,147 @@
+//! Opt-in instrumentation of reads.
+//!
+//! A [`ReadStats`] passed in [`ReadOptions::stats`](crate::reader::ReadOptions)
+//! collects the wall time, bytes and rows of every phase of a read, so a slow
+//! read can be blamed on I/O, decompression, the header lines, the counting
+//! pass over the ~ASCII section or the number parsing without a native
+//! profiler. Every phase is also logged at debug level under the
+//! [`LOG_TARGET`] target, whether or not stats are collected; the Python
+//! module forwards these records to the `lasio_rs.stats` logger.
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::Mutex;
+use std::time::{Duration, Instant};
+
+/// `log` target of the per-phase records.
+pub const LOG_TARGET: &str = "lasio_rs::stats";
+
+/// One step of a read, in the order they run.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum Phase {
+    /// Opening and memory-mapping the file.
+    Open,
+    /// Looking up (and loading) a parse cache entry.
+    CacheLoad,
+    /// Gzip, zstd or zip decompression.
+    Decompress,
+    /// Byte order mark handling and UTF-16 transcoding.
+    Decode,
+    /// Header lines up to the ~ASCII marker.
+    Headers,
+    /// Building or loading the sparse depth index of a windowed read.
+    Index,
+    /// Counting pass over the ~ASCII section: lines (or values) per range.
+    Split,
+    /// Tokenizing and converting the values, in parallel.
+    Parse,
+    /// Moving the parsed columns into the `LASFile`.
+    Assemble,
+    /// Writing a parse cache entry.
+    CacheStore,
+}
+
+impl Phase {
+    pub fn name(self) -> &'static str {
+        match self {
+            Phase::Open => "open",
+            Phase::CacheLoad => "cache_load",
+            Phase::Decompress => "decompress",
+            Phase::Decode => "decode",
+            Phase::Headers => "headers",
+            Phase::Index => "index",
+            Phase::Split => "split",
+            Phase::Parse => "parse",
+            Phase::Assemble => "assemble",
+            Phase::CacheStore => "cache_store",
+        }
+    }
+}
+
+/// What one phase of a read took.
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub struct PhaseStats {
+    pub phase: Phase,
+    pub seconds: f64,
+    /// Bytes the phase went through (or produced, for decompression and
+    /// assembly).
+    pub bytes: usize,
+    /// Data rows the phase produced.
+    pub rows: usize,
+}
+
+/// Statistics collected by the reads made with one [`ReadOptions`].
+///
+/// Reads sharing the options (as in a batch) add to the same figures.
+///
+/// [`ReadOptions`]: crate::reader::ReadOptions
+#[derive(Debug, Default)]
+pub struct ReadStats {
+    phases: Mutex<Vec<PhaseStats>>,
+    chunks: AtomicUsize,
+}
+
+impl ReadStats {
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// Every phase recorded so far, in the order they finished.
+    pub fn phases(&self) -> Vec<PhaseStats> {
+        self.phases.lock().map(|phases| phases.clone()).unwrap_or_default()
+    }
+
+    /// Byte ranges of ~ASCII sections handed to separate rayon tasks.
+    pub fn chunks(&self) -> usize {
+        self.chunks.load(Ordering::Relaxed)
+    }
+
+    /// Sum of the time of all phases.
+    pub fn seconds(&self) -> f64 {
+        self.phases().iter().map(|phase| phase.seconds).sum()
+    }
+
+    pub(crate) fn add_chunks(&self, chunks: usize) {
+        self.chunks.fetch_add(chunks, Ordering::Relaxed);
+    }
+}
+
+/// Log one finished phase and add it to `stats`, if any.
+pub(crate) fn record(stats: Option<&ReadStats>, phase: Phase, elapsed: Duration, bytes: usize, rows: usize) {
+    let seconds = elapsed.as_secs_f64();
+    log::debug!(target: LOG_TARGET, "{}: {:.3} ms, {} bytes, {} rows", phase.name(), seconds * 1e3, bytes, rows);
+    if let Some(stats) = stats {
+        if let Ok(mut phases) = stats.phases.lock() {
+            phases.push(PhaseStats { phase, seconds, bytes, rows });
+        }
+    }
+}
+
+/// Times one phase of a read. Nothing is measured unless stats are being
+/// collected or debug logging is enabled for [`LOG_TARGET`].
+pub(crate) struct Span<'a> {
+    stats: Option<&'a ReadStats>,
+    phase: Phase,
+    start: Option<Instant>,
+}
+
+impl<'a> Span<'a> {
+    pub(crate) fn start(stats: Option<&'a ReadStats>, phase: Phase) -> Self {
+        let active = stats.is_some() || log::log_enabled!(target: LOG_TARGET, log::Level::Debug);
+        Self { stats, phase, start: active.then(Instant::now) }
+    }
+
+    /// Finish the phase. A span dropped without `end` records nothing.
+    pub(crate) fn end(self, bytes: usize, rows: usize) {
+        if let Some(start) = self.start {
+            record(self.stats, self.phase, start.elapsed(), bytes, rows);
+        }
+    }
+}
+
+/// Peak resident set size of this process in bytes, where the platform
+/// reports it (Linux `VmHWM`).
+pub fn peak_rss_bytes() -> Option<u64> {
+    let status = std::fs::read_to_string("/proc/self/status").ok()?;
+    let line = status.lines().find(|line| line.starts_with("VmHWM:"))?;
+    let kib: u64 = line.split_whitespace().nth(1)?.parse().ok()?;
+    Some(kib * 1024)
+}
@@ -0,0 +1,189 @@
+//! Streaming access to the ~ASCII section for files larger than memory.
+use crate::compression::open_stream;
+use crate::encoding::{skip_bom, transcode_stream, TextDecoder};
+use crate::reader::{
+    first_row_width, is_data_line, is_section_line, parse_data_section, parse_headers_from_reader, resolve_curves,
+    is_comma_delimited, is_wrapped, parse_wrapped_section, select_curves, Projection, ReadOptions, ValueRules,
+};
+use crate::tokenizer::delimited_tokens;
+use crate::{DType, LASFile, LasError, SectionCurves};
+use ndarray::Array2;
+use std::io::BufRead;
+use std::path::Path;
+
+/// Iterator over the ~ASCII section in blocks of at most `rows` rows.
+///
+/// Only the headers and the current block are held in memory. Each block is
+/// read as raw bytes and parsed in parallel like a whole file, so memory stays
+/// bounded by the block size no matter how large the file is.
+pub struct AsciiChunks<R: BufRead> {
+    reader: R,
+    header: LASFile,
+    curves: SectionCurves,
+    columns: Option<Vec<usize>>,
+    rows: usize,
+    projection: Option<Projection>,
+    rules: ValueRules,
+    comma: bool,
+    /// Values per depth step of a wrapped (WRAP YES) section.
+    record: Option<usize>,
+    /// Data rows returned so far, to report bad values by their file row.
+    rows_read: usize,
+    block: Vec<u8>,
+    done: bool,
+}
+
+impl AsciiChunks<Box<dyn BufRead + Send>> {
+    /// Open a LAS file on disk for chunked reading.
+    ///
+    /// Gzip, zstd and zip compressed files are decoded on a background
+    /// thread while blocks are parsed, and UTF-16 files are transcoded to
+    /// UTF-8 as they are read.
+    pub fn open<P: AsRef<Path>>(path: P, rows: usize, options: &ReadOptions) -> Result<Self, LasError> {
+        let (reader, text) = transcode_stream(open_stream(path)?, options.encoding)?;
+        Self::with_decoder(reader, rows, options, text)
+    }
+}
+
+impl<R: BufRead> AsciiChunks<R> {
+    /// Parse the headers and stop at the start of the ~ASCII section.
+    ///
+    /// `options.curves` selects (and orders) the columns of every block, and
+    /// `options.nulls` / `options.errors` apply to every value as for whole
+    /// file reads. Row windows and dtypes do not apply to streaming: blocks
+    /// are always float64.
+    ///
+    /// The text of `reader` must be ASCII-compatible (UTF-8, Latin-1, ...);
+    /// [`AsciiChunks::open`] also reads UTF-16 files.
+    pub fn new(mut reader: R, rows: usize, options: &ReadOptions) -> Result<Self, LasError> {
+        let text = skip_bom(&mut reader, options.encoding)?;
+        Self::with_decoder(reader, rows, options, text)
+    }
+
+    fn with_decoder(mut reader: R, rows: usize, options: &ReadOptions, mut text: TextDecoder) -> Result<Self, LasError> {
+        let (header, found) = parse_headers_from_reader(&mut reader, &mut text)?;
+
+        let columns = match &options.curves {
+            Some(names) => Some(resolve_curves(&header.curves, names)?),
+            None => None,
+        };
+        let curves = match &columns {
+            Some(columns) => select_curves(&header.curves, columns),
+            None => header.curves.clone(),
+        };
+        let rules = ValueRules::new(&header, &options.nulls, options.errors, text);
+        let comma = is_comma_delimited(&header);
+        let record = is_wrapped(&header).then(|| header.curves.items.len());
+
+        Ok(Self {
+            reader,
+            header,
+            curves,
+            columns,
+            rows: rows.max(1),
+            projection: None,
+            rules,
+            comma,
+            record,
+            rows_read: 0,
+            block: Vec::new(),
+            done: !found,
+        })
+    }
+
+    /// Headers of the file; its `data` matrix is left empty.
+    pub fn header(&self) -> &LASFile {
+        &self.header
+    }
+
+    /// Curves present in every block, in column order.
+    pub fn curves(&self) -> &SectionCurves {
+        &self.curves
+    }
+
+    /// Read the raw lines of the next block into `self.block`.
+    ///
+    /// Wrapped steps start on a new line, so a block of wrapped data ends
+    /// after the line that completes its last step.
+    fn fill_block(&mut self) -> Result<usize, LasError> {
+        self.block.clear();
+        let mut nrows = 0;
+        let mut nvalues = 0;
+        while nrows < self.rows {
+            let start = self.block.len();
+            if self.reader.read_until(b'\n', &mut self.block)? == 0 {
+                self.done = true;
+                break;
+            }
+            let line = &self.block[start..];
+            if is_section_line(line) {
+                self.block.truncate(start);
+                self.done = true;
+                break;
+            }
+            if is_data_line(line) {
+                match self.record {
+                    None => nrows += 1,
+                    Some(record) => {
+                        nvalues += delimited_tokens(line, self.comma).count();
+                        if nvalues % record.max(1) == 0 {
+                            nrows = nvalues / record.max(1);
+                        }
+                    }
+                }
+            }
+        }
+        if let Some(record) = self.record {
+            nrows = nvalues.div_ceil(record.max(1));
+        }
+        Ok(nrows)
+    }
+}
+
+impl<R: BufRead> Iterator for AsciiChunks<R> {
+    type Item = Result<Array2<f64>, LasError>;
+
+    fn next(&mut self) -> Option<Self::Item> {
+        if self.done {
+            return None;
+        }
+        match self.fill_block() {
+            Err(e) => {
+                self.done = true;
+                Some(Err(e))
+            }
+            Ok(0) => None,
+            Ok(_) => {
+                // The width is fixed by the first row of the section (or by
+                // the curves of a wrapped one), as for whole-file reads, so
+                // every block has the same shape.
+                let block = &self.block;
+                let columns = self.columns.as_deref();
+                let comma = self.comma;
+                let record = self.record;
+                let projection = self.projection.get_or_insert_with(|| {
+                    let width = record.unwrap_or_else(|| first_row_width(block, comma));
+                    Projection::new(width, columns, |_| DType::Float64, comma)
+                });
+                let parsed = match record {
+                    Some(record) => parse_wrapped_section(block, projection, &self.rules, record, None, None),
+                    None => parse_data_section(block, projection, &self.rules),
+                };
+                match parsed.map(|parsed| parsed.matrix) {
+                    Ok(block) => {
+                        self.rows_read += block.nrows();
+                        Some(Ok(block))
+                    }
+                    Err(LasError::InvalidValue { row, column, token }) => {
+                        self.done = true;
+                        Some(Err(LasError::InvalidValue { row: self.rows_read + row, column, token }))
+                    }
+                    Err(e) => {
+                        self.done = true;
+                        Some(Err(e))
+                    }
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,126 @@
+//! Deterministic synthetic LAS files for benchmarks and tests.
+//!
+//! The same [`SyntheticSpec`] always produces the same bytes, so the Rust
+//! (criterion) and Python (pytest-benchmark) benchmarks measure identical
+//! inputs and results stay comparable across machines and commits.
+use std::fmt::Write as _;
+use std::io::{self, BufWriter, Write};
+
+/// Depth of the first row, in metres.
+const START_DEPTH: f64 = 1000.0;
+
+/// Depth increment between rows, in metres (half a foot).
+const STEP: f64 = 0.1524;
+
+/// ~Well NULL value written for missing samples.
+const NULL_VALUE: f64 = -999.25;
+
+/// Width of a formatted value; seven fit on an 80-column wrapped line.
+const VALUE_WIDTH: usize = 10;
+
+/// Shape and content of a synthetic LAS file.
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub struct SyntheticSpec {
+    /// Data rows (depth steps).
+    pub rows: usize,
+    /// Curves, the depth curve included.
+    pub curves: usize,
+    /// Write LAS 2.0 wrapped data: depth alone on a line, then the other
+    /// values in lines of at most 80 characters.
+    pub wrap: bool,
+    /// Fraction of non-depth values written as the NULL value.
+    pub null_density: f64,
+    /// Seed of the value generator.
+    pub seed: u64,
+}
+
+impl Default for SyntheticSpec {
+    fn default() -> Self {
+        Self { rows: 100_000, curves: 20, wrap: false, null_density: 0.01, seed: 0 }
+    }
+}
+
+/// SplitMix64, a small generator with well-spread output.
+struct SplitMix64(u64);
+
+impl SplitMix64 {
+    fn next(&mut self) -> u64 {
+        self.0 = self.0.wrapping_add(0x9e37_79b9_7f4a_7c15);
+        let mut z = self.0;
+        z = (z ^ (z >> 30)).wrapping_mul(0xbf58_476d_1ce4_e5b9);
+        z = (z ^ (z >> 27)).wrapping_mul(0x94d0_49bb_1331_11eb);
+        z ^ (z >> 31)
+    }
+
+    /// Uniform value in `[0, 1)`.
+    fn unit(&mut self) -> f64 {
+        (self.next() >> 11) as f64 / (1u64 << 53) as f64
+    }
+}
+
+/// Mnemonic of curve `i`; curve 0 is the depth.
+fn mnemonic(i: usize) -> String {
+    match i {
+        0 => "DEPT".to_string(),
+        i => format!("C{:03}", i),
+    }
+}
+
+/// Write the synthetic LAS file described by `spec` to `out`.
+///
+/// Every curve wanders around its own level (1 to 2000), so values vary in
+/// magnitude and digit count like real logs while staying within a fixed
+/// width.
+pub fn write_synthetic<W: Write>(out: W, spec: &SyntheticSpec) -> io::Result<()> {
+    let mut out = BufWriter::new(out);
+    let curves = spec.curves.max(1);
+    let stop = START_DEPTH + spec.rows.saturating_sub(1) as f64 * STEP;
+    let wrap = if spec.wrap { "YES" } else { "NO" };
+    writeln!(out, "~Version")?;
+    writeln!(out, " VERS.      2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0")?;
+    writeln!(out, " WRAP.      {wrap} : Synthetic data")?;
+    writeln!(out, "~Well")?;
+    writeln!(out, " STRT.M     {START_DEPTH:.4} : Start depth")?;
+    writeln!(out, " STOP.M     {stop:.4} : Stop depth")?;
+    writeln!(out, " STEP.M     {STEP:.4} : Step")?;
+    writeln!(out, " NULL.      {NULL_VALUE:.2} : Null value")?;
+    writeln!(out, " WELL.      SYNTHETIC-{} : Well", spec.seed)?;
+    writeln!(out, "~Curve")?;
+    writeln!(out, " DEPT.M : Depth")?;
+    for i in 1..curves {
+        writeln!(out, " {}.     : Synthetic curve {}", mnemonic(i), i)?;
+    }
+    writeln!(out, "~A")?;
+
+    let mut rng = SplitMix64(spec.seed);
+    let levels: Vec<f64> = (1..curves).map(|i| 10f64.powi((i % 4) as i32) * (1.0 + rng.unit())).collect();
+    // Mean-reverting noise per curve, bounded by 10 in magnitude.
+    let mut states = vec![0.0; levels.len()];
+    let mut line = String::with_capacity(curves * (VALUE_WIDTH + 1));
+    for row in 0..spec.rows {
+        line.clear();
+        let _ = write!(line, "{:.4}", START_DEPTH + row as f64 * STEP);
+        let mut line_len = line.len();
+        for (i, (level, state)) in levels.iter().zip(states.iter_mut()).enumerate() {
+            *state = 0.95 * *state + (rng.unit() - 0.5);
+            let value = if rng.unit() < spec.null_density { NULL_VALUE } else { level * (1.0 + 0.2 * *state) };
+            if spec.wrap && (i == 0 || line_len + 1 + VALUE_WIDTH > 80) {
+                line.push('\n');
+                line_len = 0;
+            }
+            let start = line.len();
+            let _ = write!(line, " {:>width$.4}", value, width = VALUE_WIDTH);
+            line_len += line.len() - start;
+        }
+        line.push('\n');
+        out.write_all(line.as_bytes())?;
+    }
+    out.flush()
+}
+
+/// The synthetic LAS file described by `spec`, in memory.
+pub fn synthetic_las(spec: &SyntheticSpec) -> Vec<u8> {
+    let mut bytes = Vec::new();
+    write_synthetic(&mut bytes, spec).expect("writing to a Vec cannot fail");
+    bytes
+}
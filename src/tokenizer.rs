@@ -0,0 +1,213 @@
+//! Numeric tokenizer for the ~ASCII section.
+//!
+//! Values are parsed straight from the input bytes. Plain decimal numbers with
+//! at most 19 significant digits and a small exponent (which covers nearly
+//! every value written by logging software) are converted with the exact
+//! fast path described by Clinger: the integer mantissa and the power of ten
+//! are both exactly representable as `f64`, so a single multiply or divide is
+//! correctly rounded. Anything else falls back to `str::parse::<f64>`.
+
+/// Powers of ten that are exactly representable as `f64`.
+const POW10: [f64; 23] = [
+    1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11, 1e12, 1e13, 1e14, 1e15, 1e16,
+    1e17, 1e18, 1e19, 1e20, 1e21, 1e22,
+];
+
+/// Largest mantissa that converts to `f64` without rounding.
+const MAX_EXACT_MANTISSA: u64 = 1 << 53;
+
+/// Bytes that separate values on a data line.
+#[inline]
+pub fn is_delimiter(b: u8) -> bool {
+    b == b' ' || b == b'\t' || b == b'\r' || b == b'\n'
+}
+
+/// Iterator over the tokens of one line.
+///
+/// Tokens are separated by whitespace, or by commas for LAS 3.0 files with
+/// `DLM = COMMA`, where empty fields are kept so later values keep their
+/// column. A token starting with a double quote runs to the closing quote, so
+/// quoted strings may contain delimiters; the quotes are part of the token.
+pub struct Tokens<'a> {
+    line: &'a [u8],
+    pos: usize,
+    comma: bool,
+}
+
+/// End of the token starting at `start`: past the closing quote for quoted
+/// tokens, otherwise `start` itself.
+#[inline]
+fn quoted_end(line: &[u8], start: usize) -> usize {
+    if line.get(start) != Some(&b'"') {
+        return start;
+    }
+    match line[start + 1..].iter().position(|&b| b == b'"') {
+        Some(i) => start + i + 2,
+        None => line.len(),
+    }
+}
+
+impl<'a> Tokens<'a> {
+    fn next_field(&mut self) -> Option<&'a [u8]> {
+        let line = self.line;
+        if self.pos > line.len() {
+            return None;
+        }
+        let mut start = self.pos;
+        while start < line.len() && is_delimiter(line[start]) {
+            start += 1;
+        }
+        let mut end = quoted_end(line, start);
+        while end < line.len() && line[end] != b',' {
+            end += 1;
+        }
+        self.pos = end + 1;
+        let mut stop = end;
+        while stop > start && is_delimiter(line[stop - 1]) {
+            stop -= 1;
+        }
+        Some(&line[start..stop])
+    }
+}
+
+impl<'a> Iterator for Tokens<'a> {
+    type Item = &'a [u8];
+
+    #[inline]
+    fn next(&mut self) -> Option<&'a [u8]> {
+        if self.comma {
+            return self.next_field();
+        }
+        let line = self.line;
+        let mut pos = self.pos;
+        while pos < line.len() && is_delimiter(line[pos]) {
+            pos += 1;
+        }
+        if pos == line.len() {
+            self.pos = pos;
+            return None;
+        }
+        let start = pos;
+        pos = quoted_end(line, pos);
+        while pos < line.len() && !is_delimiter(line[pos]) {
+            pos += 1;
+        }
+        self.pos = pos;
+        Some(&line[start..pos])
+    }
+}
+
+/// Split a line into whitespace separated tokens without allocating.
+#[inline]
+pub fn tokens(line: &[u8]) -> Tokens<'_> {
+    Tokens { line, pos: 0, comma: false }
+}
+
+/// Split a line into tokens, at commas if `comma` is set and otherwise at
+/// whitespace.
+#[inline]
+pub fn delimited_tokens(line: &[u8], comma: bool) -> Tokens<'_> {
+    Tokens { line, pos: 0, comma }
+}
+
+/// Parse one token as `f64`, or `None` if it is not a number.
+#[inline]
+pub fn parse_f64(token: &[u8]) -> Option<f64> {
+    match parse_fast(token) {
+        Some(value) => Some(value),
+        None => std::str::from_utf8(token).ok()?.parse::<f64>().ok(),
+    }
+}
+
+/// Fast path for `[+-]digits[.digits][(e|E)[+-]digits]`.
+#[inline]
+fn parse_fast(s: &[u8]) -> Option<f64> {
+    let mut i = 0;
+    let negative = match s.first() {
+        Some(b'-') => {
+            i += 1;
+            true
+        }
+        Some(b'+') => {
+            i += 1;
+            false
+        }
+        Some(_) => false,
+        None => return None,
+    };
+
+    let mut mantissa: u64 = 0;
+    let mut significant = 0;
+    let mut any_digit = false;
+    let mut exponent: i32 = 0;
+
+    while i < s.len() && s[i].is_ascii_digit() {
+        let d = (s[i] - b'0') as u64;
+        if mantissa != 0 || d != 0 {
+            significant += 1;
+        }
+        mantissa = mantissa.wrapping_mul(10).wrapping_add(d);
+        any_digit = true;
+        i += 1;
+    }
+    if i < s.len() && s[i] == b'.' {
+        i += 1;
+        while i < s.len() && s[i].is_ascii_digit() {
+            let d = (s[i] - b'0') as u64;
+            if mantissa != 0 || d != 0 {
+                significant += 1;
+            }
+            mantissa = mantissa.wrapping_mul(10).wrapping_add(d);
+            exponent -= 1;
+            any_digit = true;
+            i += 1;
+        }
+    }
+    if !any_digit || significant > 19 {
+        return None;
+    }
+    if i < s.len() && (s[i] == b'e' || s[i] == b'E') {
+        i += 1;
+        let negative_exp = match s.get(i) {
+            Some(b'-') => {
+                i += 1;
+                true
+            }
+            Some(b'+') => {
+                i += 1;
+                false
+            }
+            _ => false,
+        };
+        let start = i;
+        let mut e: i32 = 0;
+        while i < s.len() && s[i].is_ascii_digit() {
+            if e > 9999 {
+                return None;
+            }
+            e = e * 10 + (s[i] - b'0') as i32;
+            i += 1;
+        }
+        if i == start {
+            return None;
+        }
+        exponent += if negative_exp { -e } else { e };
+    }
+    if i != s.len() {
+        return None;
+    }
+
+    let value = if mantissa == 0 {
+        0.0
+    } else if mantissa <= MAX_EXACT_MANTISSA && (-22..=22).contains(&exponent) {
+        let m = mantissa as f64;
+        if exponent < 0 {
+            m / POW10[(-exponent) as usize]
+        } else {
+            m * POW10[exponent as usize]
+        }
+    } else {
+        return None;
+    };
+    Some(if negative { -value } else { value })
+}
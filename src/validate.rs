@@ -0,0 +1,456 @@
+//! Quality checks of LAS files, for QC of whole archives.
+//!
+//! The regular reader is lenient: the matrix width comes from the first data
+//! row, a repeated mnemonic replaces the earlier definition and unparsable
+//! values become NaN. [`validate`] reports those cases instead, with the
+//! line they were found on. Files are checked in parallel, and the ~ASCII
+//! section of each file is itself checked in parallel byte ranges, like a
+//! parse.
+use crate::batch::build_pool;
+use crate::compression::decompress;
+use crate::encoding::{transcode, TextDecoder, TextEncoding};
+use crate::reader::{
+    data_lines, find_section_end, header_item, is_comma_delimited, is_data_line, is_wrapped, parse_header_line,
+    split_at_newlines, Section,
+};
+use crate::tokenizer::{delimited_tokens, parse_f64};
+use crate::{DType, LASFile, LasError};
+use memchr::{memchr, memchr_iter};
+use memmap2::Mmap;
+use rayon::prelude::*;
+use serde::Serialize;
+use std::collections::HashMap;
+use std::fs::File;
+use std::path::{Path, PathBuf};
+
+/// Issues of one kind listed per file; further ones are only counted.
+const MAX_ISSUES_PER_KIND: usize = 100;
+
+/// Largest difference between a ~Well depth (STRT, STOP, STEP) and the data
+/// that is not reported, in depth units.
+const TOLERANCE: f64 = 1e-3;
+
+/// What is wrong.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash, Serialize)]
+#[serde(rename_all = "snake_case")]
+pub enum IssueKind {
+    /// The file could not be opened, decompressed or read.
+    Unreadable,
+    /// A mnemonic defined twice in one section; the reader keeps the last.
+    DuplicateMnemonic,
+    /// No ~ASCII section.
+    MissingData,
+    /// The first data row does not have one value per ~Curve definition.
+    ColumnCount,
+    /// A data row with another number of values than the first one.
+    RaggedRow,
+    /// Wrapped data whose value count is not a multiple of the curve count.
+    IncompleteRecord,
+    /// A value that is not a number in a curve not declared as text.
+    InvalidValue,
+    /// A depth that does not continue the direction of the index.
+    NonMonotonicDepth,
+    /// A depth increment that differs from the ~Well STEP.
+    StepMismatch,
+    /// STRT or STOP disagreeing with the first or last depth.
+    HeaderMismatch,
+}
+
+const ALL_KINDS: [IssueKind; 10] = [
+    IssueKind::Unreadable,
+    IssueKind::DuplicateMnemonic,
+    IssueKind::MissingData,
+    IssueKind::ColumnCount,
+    IssueKind::RaggedRow,
+    IssueKind::IncompleteRecord,
+    IssueKind::InvalidValue,
+    IssueKind::NonMonotonicDepth,
+    IssueKind::StepMismatch,
+    IssueKind::HeaderMismatch,
+];
+
+const KINDS: usize = ALL_KINDS.len();
+
+impl IssueKind {
+    /// Snake-case name, as used in reports.
+    pub fn name(self) -> &'static str {
+        match self {
+            IssueKind::Unreadable => "unreadable",
+            IssueKind::DuplicateMnemonic => "duplicate_mnemonic",
+            IssueKind::MissingData => "missing_data",
+            IssueKind::ColumnCount => "column_count",
+            IssueKind::RaggedRow => "ragged_row",
+            IssueKind::IncompleteRecord => "incomplete_record",
+            IssueKind::InvalidValue => "invalid_value",
+            IssueKind::NonMonotonicDepth => "non_monotonic_depth",
+            IssueKind::StepMismatch => "step_mismatch",
+            IssueKind::HeaderMismatch => "header_mismatch",
+        }
+    }
+}
+
+/// One problem found in a file.
+#[derive(Debug, Clone, PartialEq, Serialize)]
+pub struct Issue {
+    pub kind: IssueKind,
+    /// Line of the file (from 1) the problem is on, if it is on one.
+    pub line: Option<usize>,
+    pub message: String,
+}
+
+/// Validation report of one file.
+#[derive(Debug, Clone, PartialEq, Serialize)]
+pub struct FileReport {
+    pub path: PathBuf,
+    /// Data rows (depth steps) found.
+    pub rows: usize,
+    /// Problems in line order. At most [`MAX_ISSUES_PER_KIND`] of each kind
+    /// are listed, followed by one line-less issue counting the rest.
+    pub issues: Vec<Issue>,
+}
+
+impl FileReport {
+    pub fn is_valid(&self) -> bool {
+        self.issues.is_empty()
+    }
+}
+
+/// Issues found by one task, with the number of each kind.
+#[derive(Default)]
+struct Issues {
+    list: Vec<Issue>,
+    counts: [usize; KINDS],
+}
+
+impl Issues {
+    /// Record an issue; `message` is only built if it will be listed.
+    fn push(&mut self, kind: IssueKind, line: Option<usize>, message: impl FnOnce() -> String) {
+        self.counts[kind as usize] += 1;
+        if self.counts[kind as usize] <= MAX_ISSUES_PER_KIND {
+            self.list.push(Issue { kind, line, message: message() });
+        }
+    }
+
+    fn append(&mut self, other: Issues) {
+        self.list.extend(other.list);
+        for (count, other) in self.counts.iter_mut().zip(other.counts) {
+            *count += other;
+        }
+    }
+
+    /// The listed issues in line order, capped per kind.
+    fn finish(mut self) -> Vec<Issue> {
+        self.list.sort_by_key(|issue| issue.line.unwrap_or(usize::MAX));
+        let mut listed = [0; KINDS];
+        self.list.retain(|issue| {
+            listed[issue.kind as usize] += 1;
+            listed[issue.kind as usize] <= MAX_ISSUES_PER_KIND
+        });
+        for (&kind, &count) in ALL_KINDS.iter().zip(&self.counts) {
+            if count > MAX_ISSUES_PER_KIND {
+                self.list.push(Issue {
+                    kind,
+                    line: None,
+                    message: format!("{} more {} issues not listed", count - MAX_ISSUES_PER_KIND, kind.name()),
+                });
+            }
+        }
+        self.list
+    }
+}
+
+/// A depth and the line it is on.
+type Depth = (usize, f64);
+
+/// What every range of the ~ASCII section is checked against.
+struct Layout<'a> {
+    names: Vec<&'a str>,
+    /// Per curve, whether it is declared as text (`{S}` in LAS 3.0).
+    text: Vec<bool>,
+    /// Values per depth step of wrapped data.
+    record: usize,
+    /// Values on the first data row, which sets the width of the matrix.
+    width: usize,
+    wrapped: bool,
+    comma: bool,
+    null: f64,
+    /// ~Well STEP, unless missing or zero (irregular sampling).
+    step: Option<f64>,
+    /// +1 for increasing depths, -1 for decreasing, 0 if unknown.
+    direction: f64,
+}
+
+impl Layout<'_> {
+    fn depth(&self, token: &[u8]) -> Option<f64> {
+        parse_f64(token).filter(|d| !d.is_nan() && *d != self.null)
+    }
+
+    fn name(&self, column: usize) -> String {
+        self.names.get(column).map_or_else(|| format!("column {}", column + 1), |name| name.to_string())
+    }
+
+    /// Check the step from one depth to the next.
+    fn check_step(&self, (prev_line, prev): Depth, (line, depth): Depth, issues: &mut Issues) {
+        let delta = depth - prev;
+        if self.direction != 0.0 && delta * self.direction <= 0.0 {
+            issues.push(IssueKind::NonMonotonicDepth, Some(line), || {
+                format!("depth {} does not continue from {} (line {})", depth, prev, prev_line)
+            });
+        } else if let Some(step) = self.step.filter(|step| (delta - step).abs() > TOLERANCE) {
+            issues.push(IssueKind::StepMismatch, Some(line), || {
+                format!("depth increment {} from {} differs from STEP {}", delta, prev, step)
+            });
+        }
+    }
+}
+
+/// Findings of one byte range of the ~ASCII section.
+#[derive(Default)]
+struct RangeReport {
+    issues: Issues,
+    first: Option<Depth>,
+    last: Option<Depth>,
+    rows: usize,
+    last_line: Option<usize>,
+}
+
+/// Check one range whose first line is `first_line` and whose first value is
+/// value number `first_value` of the section (only used for wrapped data).
+fn check_range(chunk: &[u8], first_line: usize, first_value: usize, layout: &Layout) -> RangeReport {
+    let mut report = RangeReport::default();
+    let mut position = first_value;
+    for (i, line) in chunk.split(|&b| b == b'\n').enumerate() {
+        if !is_data_line(line) {
+            continue;
+        }
+        let line_no = first_line + i;
+        let mut width = 0;
+        for token in delimited_tokens(line, layout.comma) {
+            let column = if layout.wrapped { position % layout.record } else { width };
+            let value = parse_f64(token);
+            if value.is_none() && !layout.text.get(column).copied().unwrap_or(false) {
+                report.issues.push(IssueKind::InvalidValue, Some(line_no), || {
+                    format!("'{}' in {} is not a number", String::from_utf8_lossy(token), layout.name(column))
+                });
+            }
+            if column == 0 {
+                if let Some(depth) = layout.depth(token) {
+                    if let Some(prev) = report.last {
+                        layout.check_step(prev, (line_no, depth), &mut report.issues);
+                    }
+                    report.first.get_or_insert((line_no, depth));
+                    report.last = Some((line_no, depth));
+                }
+            }
+            width += 1;
+            position += 1;
+        }
+        if !layout.wrapped {
+            report.rows += 1;
+            if width != layout.width {
+                report.issues.push(IssueKind::RaggedRow, Some(line_no), || {
+                    format!("row has {} values, the first data row {}", width, layout.width)
+                });
+            }
+        }
+        report.last_line = Some(line_no);
+    }
+    report
+}
+
+/// Headers of a file, checked for repeated mnemonics, and where its first
+/// ~ASCII section starts (byte offset and line number).
+fn check_headers(
+    bytes: &[u8],
+    text: &mut TextDecoder,
+    issues: &mut Issues,
+) -> (LASFile, HashMap<String, usize>, Option<(usize, usize)>) {
+    let (mut las, mut section) = (LASFile::default(), Section::None);
+    let mut seen: HashMap<(Section, String), usize> = HashMap::new();
+    let (mut pos, mut line_no) = (0, 0);
+    while pos < bytes.len() {
+        let end = memchr(b'\n', &bytes[pos..]).map_or(bytes.len(), |i| pos + i);
+        let line = text.decode_line(&bytes[pos..end]);
+        pos = (end + 1).min(bytes.len());
+        line_no += 1;
+        let current = section;
+        if parse_header_line(&mut las, &mut section, &line) {
+            let well_lines = seen
+                .into_iter()
+                .filter(|((section, _), _)| *section == Section::Well)
+                .map(|((_, mnemonic), line)| (mnemonic, line))
+                .collect();
+            return (las, well_lines, Some((pos, line_no + 1)));
+        }
+        if section != current || !matches!(current, Section::Version | Section::Well | Section::Curves | Section::Params) {
+            continue;
+        }
+        if let Some(item) = header_item(&line) {
+            if let Some(first) = seen.insert((current, item.mnemonic.clone()), line_no) {
+                issues.push(IssueKind::DuplicateMnemonic, Some(line_no), || {
+                    format!("{} is already defined on line {}", item.mnemonic, first)
+                });
+            }
+        }
+    }
+    (las, HashMap::new(), None)
+}
+
+/// Number of the first data line of `data`, counting from `first_line`.
+fn first_data_line(data: &[u8], first_line: usize) -> Option<(usize, &[u8])> {
+    data.split(|&b| b == b'\n').enumerate().find(|(_, line)| is_data_line(line)).map(|(i, line)| (first_line + i, line))
+}
+
+/// Check a whole LAS file held in memory.
+fn check(bytes: &[u8]) -> Result<(usize, Issues), LasError> {
+    let bytes = decompress(bytes)?;
+    let (bytes, mut text) = transcode(&bytes, TextEncoding::Auto);
+    let bytes = &bytes[..];
+    let mut issues = Issues::default();
+    let (las, well_lines, data) = check_headers(bytes, &mut text, &mut issues);
+    let Some((start, data_line)) = data else {
+        issues.push(IssueKind::MissingData, None, || "no ~ASCII section".to_string());
+        return Ok((0, issues));
+    };
+    let ascii = &bytes[start..find_section_end(bytes, start)];
+    let (wrapped, comma) = (is_wrapped(&las), is_comma_delimited(&las));
+    let ncurves = las.curves.items.len();
+    let well_value = |mnemonic: &str| las.well.items.get(mnemonic).and_then(|item| item.value.trim().parse::<f64>().ok());
+
+    let mut layout = Layout {
+        names: las.curves.items.keys().map(String::as_str).collect(),
+        text: las.curves.items.values().map(|curve| DType::from_format(curve) == Some(DType::Text)).collect(),
+        record: ncurves.max(1),
+        width: 0,
+        wrapped,
+        comma,
+        null: well_value("NULL").unwrap_or(f64::NAN),
+        step: well_value("STEP").filter(|step| *step != 0.0 && step.is_finite()),
+        direction: 0.0,
+    };
+    let first = first_data_line(ascii, data_line);
+    if let Some((line, row)) = first.filter(|_| !wrapped) {
+        layout.width = delimited_tokens(row, comma).count();
+        if layout.width != ncurves {
+            issues.push(IssueKind::ColumnCount, Some(line), || {
+                format!("first data row has {} values but ~Curve defines {} curves", layout.width, ncurves)
+            });
+        }
+    }
+
+    let chunks = split_at_newlines(ascii, rayon::current_num_threads() * 4);
+    let counts: Vec<(usize, usize)> = chunks
+        .par_iter()
+        .map(|chunk| {
+            let values = match wrapped {
+                true => data_lines(chunk).map(|line| delimited_tokens(line, comma).count()).sum(),
+                false => 0,
+            };
+            (memchr_iter(b'\n', chunk).count(), values)
+        })
+        .collect();
+    let (mut first_lines, mut first_values) = (Vec::with_capacity(chunks.len()), Vec::with_capacity(chunks.len()));
+    let (mut lines, mut nvalues) = (data_line, 0);
+    for &(newlines, values) in &counts {
+        first_lines.push(lines);
+        first_values.push(nvalues);
+        lines += newlines;
+        nvalues += values;
+    }
+
+    // The direction of the index goes from the first depth to the last.
+    let first_depth = first.and_then(|(_, row)| delimited_tokens(row, comma).next()).and_then(|t| layout.depth(t));
+    let last_depth = match wrapped {
+        false => ascii
+            .rsplit(|&b| b == b'\n')
+            .find(|line| is_data_line(line))
+            .and_then(|row| delimited_tokens(row, comma).next()),
+        true => {
+            let position = nvalues.saturating_sub(1) / layout.record * layout.record;
+            chunks.iter().zip(&first_values).zip(&counts).find_map(|((chunk, &first), &(_, count))| {
+                let inside = position >= first && position < first + count;
+                inside.then(|| data_lines(chunk).flat_map(|line| delimited_tokens(line, comma)).nth(position - first)).flatten()
+            })
+        }
+    }
+    .and_then(|t| layout.depth(t));
+    if let (Some(first), Some(last)) = (first_depth, last_depth) {
+        layout.direction = (last - first).signum();
+    }
+
+    let reports: Vec<RangeReport> = chunks
+        .par_iter()
+        .zip(first_lines.par_iter().zip(first_values.par_iter()))
+        .map(|(chunk, (&line, &value))| check_range(chunk, line, value, &layout))
+        .collect();
+
+    let mut rows = 0;
+    let (mut first, mut last, mut last_line): (Option<Depth>, Option<Depth>, Option<usize>) = (None, None, None);
+    for report in reports {
+        if let (Some(prev), Some(next)) = (last, report.first) {
+            layout.check_step(prev, next, &mut issues);
+        }
+        first = first.or(report.first);
+        last = report.last.or(last);
+        last_line = report.last_line.or(last_line);
+        rows += report.rows;
+        issues.append(report.issues);
+    }
+    if wrapped {
+        rows = nvalues.div_ceil(layout.record);
+        if nvalues % layout.record != 0 {
+            issues.push(IssueKind::IncompleteRecord, last_line, || {
+                format!("{} values do not make whole steps of {} curves", nvalues, layout.record)
+            });
+        }
+    }
+    for (mnemonic, depth) in [("STRT", first), ("STOP", last)] {
+        if let (Some(header), Some((_, depth))) = (well_value(mnemonic), depth) {
+            if (header - depth).abs() > TOLERANCE {
+                issues.push(IssueKind::HeaderMismatch, well_lines.get(mnemonic).copied(), || {
+                    format!("{} is {} but the data {} at {}", mnemonic, header, if mnemonic == "STRT" { "starts" } else { "ends" }, depth)
+                });
+            }
+        }
+    }
+    Ok((rows, issues))
+}
+
+/// Validate a LAS file held in memory; gzip, zstd and zip input is
+/// decompressed first. The report has an empty `path`.
+pub fn validate_bytes(bytes: &[u8]) -> FileReport {
+    report(PathBuf::new(), check(bytes))
+}
+
+/// Validate a LAS file on disk.
+pub fn validate_file(path: &Path) -> FileReport {
+    let checked = File::open(path).map_err(LasError::from).and_then(|file| {
+        if file.metadata()?.len() == 0 {
+            return check(&[]);
+        }
+        // SAFETY: the mapping is read-only and dropped before returning.
+        let mmap = unsafe { Mmap::map(&file)? };
+        check(&mmap)
+    });
+    report(path.to_path_buf(), checked)
+}
+
+fn report(path: PathBuf, checked: Result<(usize, Issues), LasError>) -> FileReport {
+    match checked {
+        Ok((rows, issues)) => FileReport { path, rows, issues: issues.finish() },
+        Err(e) => FileReport {
+            path,
+            rows: 0,
+            issues: vec![Issue { kind: IssueKind::Unreadable, line: None, message: e.to_string() }],
+        },
+    }
+}
+
+/// Validate every file in `paths` on a pool of `workers` threads.
+///
+/// Reports come back in input order; a file that cannot be read gets an
+/// [`IssueKind::Unreadable`] issue, so one bad file never aborts the run.
+pub fn validate(paths: &[PathBuf], workers: Option<usize>) -> Result<Vec<FileReport>, LasError> {
+    let pool = build_pool(workers)?;
+    Ok(pool.install(|| paths.par_iter().map(|path| validate_file(path)).collect()))
+}
@@ -0,0 +1,301 @@
+//! Writing LAS 2.0 and 3.0 files.
+//!
+//! Headers are written line by line; the data section is formatted in blocks
+//! of rows, in parallel when enabled, and each finished block is flushed to a
+//! buffered writer in order, so memory stays bounded by a few blocks no matter
+//! how large the file is.
+use crate::{Column, DType, HeaderItem, LASFile, LasError, SectionItems};
+use ndarray::ArrayView1;
+use rayon::prelude::*;
+use std::fs::File;
+use std::io::{BufWriter, Write};
+use std::ops::Range;
+use std::path::Path;
+
+/// Rows formatted together by one task.
+const BLOCK_ROWS: usize = 4096;
+
+/// Longest data line allowed by LAS 2.0 in wrapped mode.
+const WRAP_WIDTH: usize = 80;
+
+/// LAS version of the output.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
+pub enum LasVersion {
+    #[default]
+    V2,
+    V3,
+}
+
+impl LasVersion {
+    /// Parse `"2.0"`, `"2"`, `"3.0"` or `"3"`.
+    pub fn parse(version: &str) -> Result<Self, LasError> {
+        match version.trim() {
+            "2" | "2.0" => Ok(LasVersion::V2),
+            "3" | "3.0" => Ok(LasVersion::V3),
+            other => Err(LasError::InvalidOptions(format!("unsupported LAS version '{}'", other))),
+        }
+    }
+
+    fn as_str(self) -> &'static str {
+        match self {
+            LasVersion::V2 => "2.0",
+            LasVersion::V3 => "3.0",
+        }
+    }
+}
+
+/// printf-style `%[width][.precision](f|e)` format of data values.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct FloatFormat {
+    pub width: usize,
+    pub precision: usize,
+    pub exponent: bool,
+}
+
+impl Default for FloatFormat {
+    fn default() -> Self {
+        Self { width: 12, precision: 6, exponent: false }
+    }
+}
+
+impl FloatFormat {
+    /// Parse a format such as `"%12.6f"`, `"%.4f"` or `"%10.3e"`.
+    pub fn parse(format: &str) -> Result<Self, LasError> {
+        let invalid = || LasError::InvalidOptions(format!("invalid float format '{}', expected e.g. '%12.6f'", format));
+        let spec = format.trim().strip_prefix('%').ok_or_else(invalid)?;
+        let (spec, exponent) = match spec.as_bytes().last() {
+            Some(b'f') => (&spec[..spec.len() - 1], false),
+            Some(b'e') => (&spec[..spec.len() - 1], true),
+            _ => return Err(invalid()),
+        };
+        let (width, precision) = match spec.split_once('.') {
+            Some((width, precision)) => (width, precision.parse().map_err(|_| invalid())?),
+            None => (spec, 6),
+        };
+        let width = match width {
+            "" => 0,
+            width => width.parse().map_err(|_| invalid())?,
+        };
+        Ok(Self { width, precision, exponent })
+    }
+
+    fn write(&self, out: &mut Vec<u8>, value: f64) {
+        let (width, precision) = (self.width, self.precision);
+        // Writing to a Vec cannot fail.
+        let _ = match self.exponent {
+            true => write!(out, "{:>width$.precision$e}", value),
+            false => write!(out, "{:>width$.precision$}", value),
+        };
+    }
+}
+
+/// Options controlling what [`write_las`] produces.
+#[derive(Debug, Clone)]
+pub struct WriteOptions {
+    pub version: LasVersion,
+    /// Write LAS 2.0 wrapped data: the index value alone on a line, then the
+    /// other values on lines of at most 80 characters. Not allowed for 3.0.
+    pub wrap: bool,
+    pub float_format: FloatFormat,
+    /// Written in place of NaN and as the ~Well NULL value. `None` keeps the
+    /// file's own NULL value, or -999.25 if it has none.
+    pub null_value: Option<f64>,
+    /// Format blocks of rows on the rayon pool.
+    pub parallel: bool,
+}
+
+impl Default for WriteOptions {
+    fn default() -> Self {
+        Self {
+            version: LasVersion::V2,
+            wrap: false,
+            float_format: FloatFormat::default(),
+            null_value: None,
+            parallel: true,
+        }
+    }
+}
+
+fn header_line(out: &mut impl Write, item: &HeaderItem) -> std::io::Result<()> {
+    writeln!(out, " {:18}.{:8} {:30}: {}", item.mnemonic, item.unit, item.value, item.descr)
+}
+
+fn header_section(out: &mut impl Write, title: &str, section: &SectionItems) -> std::io::Result<()> {
+    writeln!(out, "{}", title)?;
+    for item in section.items.values() {
+        header_line(out, item)?;
+    }
+    Ok(())
+}
+
+/// Values of one curve to write.
+enum Source<'a> {
+    Matrix(ArrayView1<'a, f64>),
+    Column(&'a Column),
+}
+
+impl Source<'_> {
+    /// Append the value of `row` to `cell`; nulls and NaN become `null`.
+    fn write(&self, cell: &mut Vec<u8>, row: usize, format: &FloatFormat, null: f64) {
+        let width = format.width;
+        let value = match self {
+            Source::Matrix(values) => values[row],
+            Source::Column(Column::Int64 { values, valid }) if valid[row] => {
+                let _ = write!(cell, "{:>width$}", values[row]);
+                return;
+            }
+            Source::Column(Column::Text(text)) => match text.get(row) {
+                // Strings with delimiters are quoted, as LAS 3.0 requires.
+                Some(value) if value.is_empty() || value.contains(|c: char| c.is_whitespace() || c == ',') => {
+                    let _ = write!(cell, "{:>width$}", format!("\"{}\"", value));
+                    return;
+                }
+                Some(value) => {
+                    let _ = write!(cell, "{:>width$}", value);
+                    return;
+                }
+                None => f64::NAN,
+            },
+            Source::Column(column) => column.value_f64(row),
+        };
+        format.write(cell, if value.is_nan() { null } else { value });
+    }
+}
+
+/// Format rows `rows` of `sources` as LAS data lines, appending them to `out`.
+fn format_rows(out: &mut Vec<u8>, sources: &[Source], rows: Range<usize>, options: &WriteOptions, null: f64) {
+    let format = &options.float_format;
+    let mut cell = Vec::with_capacity(32);
+    for row in rows {
+        let mut line_len = 0;
+        for (col, source) in sources.iter().enumerate() {
+            cell.clear();
+            source.write(&mut cell, row, format, null);
+            if options.wrap {
+                if col == 1 || (col > 1 && line_len + 1 + cell.len() > WRAP_WIDTH) {
+                    out.push(b'\n');
+                    line_len = 0;
+                }
+            }
+            if line_len > 0 {
+                out.push(b' ');
+                line_len += 1;
+            }
+            out.extend_from_slice(&cell);
+            line_len += cell.len();
+        }
+        out.push(b'\n');
+    }
+}
+
+/// Write `las` as a LAS file to `out`.
+pub fn write_las<W: Write>(las: &LASFile, out: W, options: &WriteOptions) -> Result<(), LasError> {
+    if options.wrap && options.version == LasVersion::V3 {
+        return Err(LasError::InvalidOptions("LAS 3.0 does not allow wrapped data".to_string()));
+    }
+    let null = options
+        .null_value
+        .or_else(|| las.well.items.get("NULL").and_then(|item| item.value.trim().parse().ok()))
+        .unwrap_or(-999.25);
+    let mut out = BufWriter::new(out);
+
+    let mut version = SectionItems::new();
+    version.insert(HeaderItem::new(
+        "VERS",
+        "",
+        options.version.as_str(),
+        &format!("CWLS LOG ASCII STANDARD - VERSION {}", options.version.as_str()),
+    ));
+    version.insert(match options.wrap {
+        true => HeaderItem::new("WRAP", "", "YES", "Multiple lines per depth step"),
+        false => HeaderItem::new("WRAP", "", "NO", "One line per depth step"),
+    });
+    if options.version == LasVersion::V3 {
+        version.insert(HeaderItem::new("DLM", "", "SPACE", "Column data section delimiter"));
+    }
+    for item in las.version.items.values() {
+        if !matches!(item.mnemonic.as_str(), "VERS" | "WRAP" | "DLM") {
+            version.insert(item.clone());
+        }
+    }
+    header_section(&mut out, "~Version Information", &version)?;
+
+    let mut well = las.well.clone();
+    let mut null_text = Vec::new();
+    FloatFormat { width: 0, ..options.float_format }.write(&mut null_text, null);
+    let null_text = String::from_utf8_lossy(&null_text);
+    match well.items.get_mut("NULL") {
+        Some(item) => item.value = null_text.into_owned(),
+        None => well.insert(HeaderItem::new("NULL", "", &null_text, "Null value")),
+    }
+    header_section(&mut out, "~Well Information", &well)?;
+
+    let (curve_title, param_title, data_title) = match options.version {
+        LasVersion::V2 => ("~Curve Information", "~Parameter Information", "~A"),
+        LasVersion::V3 => ("~Log_Definition", "~Log_Parameter", "~Log_Data | Log_Definition"),
+    };
+    if !las.params.items.is_empty() {
+        header_section(&mut out, param_title, &las.params)?;
+    }
+    writeln!(out, "{}", curve_title)?;
+    for curve in las.curves.items.values() {
+        let mut descr = curve.descr.clone();
+        if options.version == LasVersion::V3 && curve.format_spec().is_none() {
+            // Declare typed columns so LAS 3.0 readers keep their type.
+            match las.columns.get(&curve.mnemonic).map(Column::dtype) {
+                Some(DType::Int64) => descr.push_str(" {I}"),
+                Some(DType::Text) => descr.push_str(" {S}"),
+                _ => {}
+            }
+        }
+        header_line(&mut out, &HeaderItem::new(&curve.mnemonic, &curve.unit, &curve.value, descr.trim_start()))?;
+    }
+    if !las.other.is_empty() {
+        writeln!(out, "~Other Information")?;
+        out.write_all(las.other.as_bytes())?;
+    }
+
+    write!(out, "{}", data_title)?;
+    if options.version == LasVersion::V2 {
+        for mnemonic in las.curves.items.keys() {
+            write!(out, " {}", mnemonic)?;
+        }
+    }
+    writeln!(out)?;
+
+    let sources: Vec<Source> = las
+        .curves
+        .items
+        .keys()
+        .filter_map(|mnemonic| match las.columns.get(mnemonic) {
+            Some(column) => Some(Source::Column(column)),
+            None => las.curve_index(mnemonic).map(|i| Source::Matrix(las.data.column(i))),
+        })
+        .collect();
+    let nrows = las.data.nrows();
+    let blocks: Vec<usize> = (0..nrows).step_by(BLOCK_ROWS).collect();
+    let format_block = |&start: &usize| {
+        let rows = start..(start + BLOCK_ROWS).min(nrows);
+        let mut text = Vec::with_capacity(rows.len() * sources.len() * (options.float_format.width + 1));
+        format_rows(&mut text, &sources, rows, options, null);
+        text
+    };
+    // Format a bounded group of blocks at a time and write it out in order.
+    let group = rayon::current_num_threads().max(1) * 4;
+    for starts in blocks.chunks(group) {
+        let texts: Vec<Vec<u8>> = match options.parallel {
+            true => starts.par_iter().map(&format_block).collect(),
+            false => starts.iter().map(&format_block).collect(),
+        };
+        for text in texts {
+            out.write_all(&text)?;
+        }
+    }
+    out.flush()?;
+    Ok(())
+}
+
+/// Write `las` to a file at `path`, replacing it if it exists.
+pub fn write_las_file<P: AsRef<Path>>(las: &LASFile, path: P, options: &WriteOptions) -> Result<(), LasError> {
+    write_las(las, File::create(path)?, options)
+}
@@ -1,6 +1,7 @@
 import sys
 import os
 import json
+import math
 import subprocess
 
 # Add local lasio to path
@@ -12,26 +13,28 @@ except ImportError:
     print("Could not import lasio from local folder. Trying installed...")
     import lasio
 
-def run_rust_parser(filepath):
-    result = subprocess.run(["cargo", "run", "--quiet", "--bin", "lasio_json", "--", filepath], capture_output=True, text=True)
+LASIO = ["cargo", "run", "--quiet", "--no-default-features", "--features", "cli", "--bin", "lasio", "--"]
+
+def run_lasio(*args):
+    result = subprocess.run(LASIO + list(args), capture_output=True, text=True)
     if result.returncode != 0:
         print("Rust Error:", result.stderr)
         return None
-    return json.loads(result.stdout)
+    return [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+
+def run_rust_parser(filepath):
+    # Curve mnemonics from the header scan, rows from the NDJSON conversion.
+    headers = run_lasio("headers", filepath)
+    rows = run_lasio("convert", filepath, "--to", "ndjson", "--output", "-")
+    if headers is None or rows is None:
+        return None
+    return {"curves": headers[0]["curves"], "rows": rows}
 
 def compare(python_data, rust_data):
     # Basic comparison logic
-    # Compare headers
+    # Compare Curves length
     print("Comparing Headers...")
-    # This might be tricky as structures differ slightly in JSON representation
-    # Python lasio.json property returns a string of JSON manually constructed? 
-    # Or we can just inspect objects.
-    
-    # Let's compare Curves length
-    py_curves = python_data.cycles if hasattr(python_data, 'cycles') else python_data.keys()
-    # Wait, lasio object has .curves
     py_curve_count = len(python_data.curves)
-    # Rust data: curves.items (IndexMap)
     rust_curve_count = len(rust_data['curves'])
     
     if py_curve_count != rust_curve_count:
@@ -42,15 +45,20 @@ def compare(python_data, rust_data):
     
     # Compare Data
     print("Comparing Data content...")
-    # Check first value of first curve
-    py_val = python_data.curves[0].data[0]
-    rust_val = rust_data['curves'][python_data.curves[0]['mnemonic']]['data'][0]
-    
-    if abs(py_val - rust_val) > 1e-6:
-         print(f"Data Mismatch: {py_val} vs {rust_val}")
-         return False
+    if len(python_data.curves[0].data) != len(rust_data['rows']):
+        print(f"Row count mismatch: Py {len(python_data.curves[0].data)} vs Rust {len(rust_data['rows'])}")
+        return False
+    for curve in python_data.curves:
+        for py_val, row in zip(curve.data, rust_data['rows']):
+            # NDJSON leaves missing values out of the row.
+            rust_val = row.get(curve.mnemonic, float("nan"))
+            if math.isnan(py_val) and math.isnan(rust_val):
+                continue
+            if not abs(py_val - rust_val) <= 1e-6:
+                print(f"Data Mismatch in {curve.mnemonic}: {py_val} vs {rust_val}")
+                return False
 
-    print("Data verification passed (basic check).")
+    print("Data verification passed.")
     return True
 
 if __name__ == "__main__":
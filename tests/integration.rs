@@ -24,16 +24,858 @@ fn test_read_sample_las() {
 
     // Check Data
     // DEPT column 0
-    let dept_curve = las.curves.items.get("DEPT").unwrap();
-    assert_eq!(dept_curve.data.len(), 3);
-    assert!((dept_curve.data[0] - 1670.0000).abs() < 1e-4);
-    assert!((dept_curve.data[1] - 1669.8750).abs() < 1e-4);
-    assert!((dept_curve.data[2] - 1669.7500).abs() < 1e-4);
+    let dept_curve = las.curve_data("DEPT").unwrap();
+    assert_eq!(dept_curve.len(), 3);
+    assert!((dept_curve[0] - 1670.0000).abs() < 1e-4);
+    assert!((dept_curve[1] - 1669.8750).abs() < 1e-4);
+    assert!((dept_curve[2] - 1669.7500).abs() < 1e-4);
 
     // DT column 1
-    let dt_curve = las.curves.items.get("DT").unwrap();
-    assert_eq!(dt_curve.data.len(), 3);
-    assert!((dt_curve.data[0] - 123.45).abs() < 1e-4);
-    assert!((dt_curve.data[1] + 999.25).abs() < 1e-4); 
-    assert!((dt_curve.data[2] - 124.50).abs() < 1e-4);
+    let dt_curve = las.curve_data("DT").unwrap();
+    assert_eq!(dt_curve.len(), 3);
+    assert!((dt_curve[0] - 123.45).abs() < 1e-4);
+    // The ~Well NULL value is read as NaN.
+    assert!(dt_curve[1].is_nan());
+    assert!((dt_curve[2] - 124.50).abs() < 1e-4);
+}
+
+#[test]
+fn test_data_matrix_is_column_major() {
+    let file = File::open("sample.las").expect("Failed to open sample.las");
+    let las = parse_las_from_reader(BufReader::new(file)).expect("Failed to parse LAS");
+
+    assert_eq!(las.data.dim(), (3, 2));
+    // Fortran order: each curve is one contiguous column.
+    assert!(las.data.t().is_standard_layout());
+    assert_eq!(las.data.column(1).as_slice().unwrap().len(), 3);
+    assert!((las.data[[2, 1]] - 124.50).abs() < 1e-4);
+}
+
+#[test]
+fn test_arrow_export_is_zero_copy() {
+    use _lasio_rs::arrow_export::to_record_batch;
+    use arrow::array::{Array, Float64Array};
+    use std::sync::Arc;
+
+    let file = File::open("sample.las").expect("Failed to open sample.las");
+    let las = Arc::new(parse_las_from_reader(BufReader::new(file)).expect("Failed to parse LAS"));
+    let batch = to_record_batch(&las).expect("Failed to export to Arrow");
+
+    assert_eq!(batch.num_rows(), 3);
+    assert_eq!(batch.num_columns(), 2);
+    let field = batch.schema().field(1).clone();
+    assert_eq!(field.name(), "DT");
+    assert_eq!(field.metadata().get("unit").map(String::as_str), Some("US/M"));
+
+    let dt = batch.column(1).as_any().downcast_ref::<Float64Array>().unwrap();
+    assert_eq!(dt.values().as_ptr(), las.data.column(1).as_ptr());
+    assert!((dt.value(2) - 124.50).abs() < 1e-4);
+}
+
+#[test]
+fn test_parallel_ascii_parse_matches_rows() {
+    use _lasio_rs::reader::{parse_las_from_bytes, read_las_file};
+    use std::fmt::Write as _;
+
+    // Large enough to be split into several byte ranges.
+    let nrows = 60_000;
+    let mut text = String::from(
+        "~Version\n VERS. 2.0 :\n WRAP. NO :\n~Curve\n DEPT.M :\n GR.GAPI :\n RHOB.G/C3 :\n~A\n",
+    );
+    for i in 0..nrows {
+        if i % 10_000 == 0 {
+            text.push_str("# comment inside data\n\n");
+        }
+        writeln!(text, "{:.2} {} {:.3}", i as f64 * 0.5, i % 150, 2.0 + (i % 7) as f64 / 10.0).unwrap();
+    }
+
+    let las = parse_las_from_bytes(text.as_bytes()).expect("Failed to parse LAS");
+    assert_eq!(las.data.dim(), (nrows, 3));
+    for i in [0, 1, 29_999, 30_000, nrows - 1] {
+        assert!((las.data[[i, 0]] - i as f64 * 0.5).abs() < 1e-9);
+        assert_eq!(las.data[[i, 1]], (i % 150) as f64);
+    }
+
+    let path = std::env::temp_dir().join("lasio_rs_parallel_parse.las");
+    std::fs::write(&path, &text).unwrap();
+    let mapped = read_las_file(&path).expect("Failed to read mapped LAS");
+    std::fs::remove_file(&path).ok();
+    assert_eq!(mapped.data, las.data);
+}
+
+#[test]
+fn test_tokenizer_matches_std_parse() {
+    use _lasio_rs::tokenizer::{delimited_tokens, parse_f64, tokens};
+
+    for token in ["1670.0000", "-999.25", "+.5", "5.", "2.5E-3", "1.7976931348623157e308", "0.000000000000000000000001234", "nan"] {
+        let expected: f64 = token.parse().unwrap();
+        let parsed = parse_f64(token.as_bytes()).unwrap();
+        assert!(parsed.to_bits() == expected.to_bits() || (parsed.is_nan() && expected.is_nan()), "{}", token);
+    }
+    assert_eq!(parse_f64(b"1.2.3"), None);
+
+    let row: Vec<f64> = tokens(b"  1.5\tbad  3  4\r").map(|t| parse_f64(t).unwrap_or(f64::NAN)).collect();
+    assert_eq!(row.len(), 4);
+    assert_eq!(row[0], 1.5);
+    assert!(row[1].is_nan());
+    assert_eq!(row[2..], [3.0, 4.0]);
+    assert_eq!(delimited_tokens(b"1.5, ,3", true).collect::<Vec<_>>(), [&b"1.5"[..], b"", b"3"]);
+}
+
+#[test]
+fn test_ascii_chunks_bounded_blocks() {
+    use _lasio_rs::reader::ReadOptions;
+    use _lasio_rs::stream::AsciiChunks;
+    use std::io::Cursor;
+
+    let text = "~Version\n VERS. 2.0 :\n~Curve\n DEPT.M :\n GR.GAPI :\n RHOB.G/C3 :\n~A\n\
+                1 10 2.1\n2 20 2.2\n# comment\n3 30 2.3\n4 40 2.4\n5 50 2.5\n";
+    let options = ReadOptions { curves: Some(vec!["RHOB".to_string(), "DEPT".to_string()]), ..Default::default() };
+    let chunks = AsciiChunks::new(Cursor::new(text), 2, &options).expect("Failed to read header");
+    assert_eq!(chunks.curves().items.keys().collect::<Vec<_>>(), ["RHOB", "DEPT"]);
+
+    let blocks: Vec<_> = chunks.map(|block| block.unwrap()).collect();
+    assert_eq!(blocks.iter().map(|b| b.dim()).collect::<Vec<_>>(), [(2, 2), (2, 2), (1, 2)]);
+    assert!((blocks[1][[0, 0]] - 2.3).abs() < 1e-9);
+    assert_eq!(blocks[2][[0, 1]], 5.0);
+}
+
+#[test]
+fn test_read_selected_curves() {
+    use _lasio_rs::reader::{parse_las_from_bytes_with, ReadOptions};
+
+    let text = "~Curve\n DEPT.M :\n GR.GAPI :\n RHOB.G/C3 :\n NPHI.V/V :\n~A\n1 10 2.1 0.30\n2 20 2.2 0.31\n";
+    let options = ReadOptions { curves: Some(vec!["RHOB".to_string(), "DEPT".to_string()]), ..Default::default() };
+    let las = parse_las_from_bytes_with(text.as_bytes(), &options).expect("Failed to parse LAS");
+
+    assert_eq!(las.curves.items.keys().collect::<Vec<_>>(), ["RHOB", "DEPT"]);
+    assert_eq!(las.data.dim(), (2, 2));
+    assert!((las.curve_data("RHOB").unwrap()[1] - 2.2).abs() < 1e-9);
+    assert_eq!(las.curve_data("DEPT").unwrap()[0], 1.0);
+
+    let missing = ReadOptions { curves: Some(vec!["XX".to_string()]), ..Default::default() };
+    assert!(parse_las_from_bytes_with(text.as_bytes(), &missing).is_err());
+}
+
+#[test]
+fn test_windowed_reads() {
+    use _lasio_rs::index::IndexMode;
+    use _lasio_rs::reader::{parse_las_from_bytes_with, read_las_file_with, ReadOptions};
+    use std::fmt::Write as _;
+
+    // Decreasing depth, several index strides long.
+    let mut text = String::from("~Curve\n DEPT.M :\n GR.GAPI :\n~A\n");
+    for i in 0..5_000 {
+        writeln!(text, "{:.1} {}", 3000.0 - i as f64 * 0.5, i).unwrap();
+    }
+
+    let rows = ReadOptions { rows: Some(1_500..1_503), ..Default::default() };
+    let las = parse_las_from_bytes_with(text.as_bytes(), &rows).expect("Failed to parse LAS");
+    assert_eq!(las.curve_data("GR").unwrap().to_vec(), [1500.0, 1501.0, 1502.0]);
+
+    let path = std::env::temp_dir().join("lasio_rs_windowed.las");
+    std::fs::write(&path, &text).unwrap();
+    let depth = ReadOptions { depth_range: Some((2200.0, 2201.0)), index: IndexMode::Memory, ..Default::default() };
+    for _ in 0..2 {
+        // The second read reuses the cached index.
+        let las = read_las_file_with(&path, &depth).expect("Failed to read LAS");
+        assert_eq!(las.curve_data("DEPT").unwrap().to_vec(), [2201.0, 2200.5, 2200.0]);
+    }
+    std::fs::remove_file(&path).ok();
+}
+
+#[test]
+fn test_depth_range_with_unordered_depths() {
+    use _lasio_rs::index::DepthIndex;
+    use _lasio_rs::reader::{parse_las_from_bytes_with, ReadOptions};
+
+    let data = "1.0 10\n2.0 20\n3.0 30\n2.5 40\n1.5 50\n4.0 60\n";
+    let text = format!("~Curve\n DEPT.M :\n GR.GAPI :\n~A\n{}", data);
+    assert!(!DepthIndex::build(data.as_bytes(), 0, data.len()).monotonic);
+    assert!(DepthIndex::build(b"1.0 1\n1.0 2\n2.0 3\n", 0, 18).monotonic);
+
+    let options = ReadOptions { depth_range: Some((2.6, 1.4)), ..Default::default() };
+    let las = parse_las_from_bytes_with(text.as_bytes(), &options).expect("Failed to parse LAS");
+    assert_eq!(las.curve_data("GR").unwrap().to_vec(), [20.0, 40.0, 50.0]);
+
+    let wrapped = format!("~Version\n WRAP. YES :\n{}", text.replace(".0 ", ".0\n ").replace(".5 ", ".5\n "));
+    let las = parse_las_from_bytes_with(wrapped.as_bytes(), &options).expect("Failed to parse LAS");
+    assert_eq!(las.curve_data("GR").unwrap().to_vec(), [20.0, 40.0, 50.0]);
+}
+
+#[test]
+fn test_read_many_collects_errors() {
+    use _lasio_rs::batch::{read_many, read_many_unordered};
+    use _lasio_rs::reader::ReadOptions;
+    use _lasio_rs::LasError;
+    use std::path::PathBuf;
+
+    let paths = vec![PathBuf::from("sample.las"), PathBuf::from("missing.las"), PathBuf::from("sample.las")];
+    let results = read_many(&paths, &ReadOptions::default(), Some(2)).expect("Failed to build pool");
+    assert_eq!(results.len(), 3);
+    assert_eq!(results[0].as_ref().unwrap().data.dim(), (3, 2));
+    assert!(matches!(results[1], Err(LasError::Io(_))));
+    assert!(results[2].is_ok());
+
+    let mut done: Vec<usize> = read_many_unordered(paths, ReadOptions::default(), Some(2))
+        .expect("Failed to build pool")
+        .iter()
+        .map(|(i, _)| i)
+        .collect();
+    done.sort();
+    assert_eq!(done, [0, 1, 2]);
+}
+
+#[test]
+fn test_header_scan_stops_at_ascii() {
+    use _lasio_rs::catalog::{scan_headers, HeaderSummary};
+    use _lasio_rs::reader::read_las_header;
+    use std::path::PathBuf;
+
+    let las = read_las_header("sample.las").expect("Failed to read header");
+    assert_eq!(las.curves.items.len(), 2);
+    assert_eq!(las.data.dim(), (0, 2));
+
+    let paths = vec![PathBuf::from("sample.las"), PathBuf::from("missing.las")];
+    let rows = scan_headers(&paths, Some(2)).expect("Failed to build pool");
+    assert_eq!(rows[0], HeaderSummary::new(&paths[0], &las));
+    assert_eq!(rows[0].curves, ["DEPT", "DT"]);
+    assert_eq!(rows[0].null, -999.25);
+    assert!(rows[1].error.is_some());
+}
+
+#[cfg(unix)]
+#[test]
+fn test_expand_paths_keeps_unreadable_dirs() {
+    use _lasio_rs::catalog::{expand_paths, scan_headers};
+    use std::os::unix::fs::PermissionsExt;
+
+    let root = std::env::temp_dir().join(format!("lasio_rs_walk_{}", std::process::id()));
+    let locked = root.join("locked");
+    std::fs::create_dir_all(&locked).unwrap();
+    std::fs::copy("sample.las", root.join("a.las")).unwrap();
+    std::fs::copy("sample.las", locked.join("b.las")).unwrap();
+    std::fs::set_permissions(&locked, std::fs::Permissions::from_mode(0o000)).unwrap();
+
+    let paths = expand_paths(root.to_str().unwrap()).expect("an unreadable directory must not abort the walk");
+    let rows = scan_headers(&paths, Some(2)).unwrap();
+    assert_eq!(rows[0].path, root.join("a.las"));
+    assert!(rows[0].error.is_none());
+    // Without permission checks (as root) the locked file is simply read.
+    assert_eq!(rows.len(), 2);
+    assert!(rows[1].path.starts_with(&locked));
+    std::fs::set_permissions(&locked, std::fs::Permissions::from_mode(0o755)).unwrap();
+    std::fs::remove_dir_all(&root).ok();
+}
+
+#[cfg(unix)]
+#[test]
+fn test_expand_paths_skips_directory_symlink_loops() {
+    use _lasio_rs::catalog::expand_paths;
+
+    let root = std::env::temp_dir().join(format!("lasio_rs_loop_{}", std::process::id()));
+    let logs = root.join("logs");
+    std::fs::create_dir_all(&logs).unwrap();
+    std::fs::copy("sample.las", logs.join("a.las")).unwrap();
+    std::os::unix::fs::symlink("..", logs.join("current")).unwrap();
+
+    let paths = expand_paths(root.to_str().unwrap()).unwrap();
+    assert_eq!(paths, [logs.join("a.las")]);
+    std::fs::remove_dir_all(&root).ok();
+}
+
+#[test]
+fn test_write_round_trip() {
+    use _lasio_rs::reader::{parse_las_from_bytes_with, read_las_file, NullPolicy, ReadOptions};
+    use _lasio_rs::writer::{write_las, FloatFormat, LasVersion, WriteOptions};
+
+    let mut las = read_las_file("sample.las").expect("Failed to read LAS");
+    las.data[[1, 1]] = f64::NAN;
+
+    let options = WriteOptions { float_format: FloatFormat::parse("%.4f").unwrap(), null_value: Some(-9999.0), ..Default::default() };
+    let mut out = Vec::new();
+    write_las(&las, &mut out, &options).expect("Failed to write LAS");
+    let keep = ReadOptions { nulls: NullPolicy::Keep, ..Default::default() };
+    let written = parse_las_from_bytes_with(&out, &keep).expect("Failed to parse written LAS");
+    assert_eq!(written.curves.items.keys().collect::<Vec<_>>(), ["DEPT", "DT"]);
+    assert_eq!(written.data.dim(), las.data.dim());
+    assert_eq!(written.curve_data("DEPT").unwrap(), las.curve_data("DEPT").unwrap());
+    assert_eq!(written.data[[1, 1]], -9999.0);
+    assert_eq!(written.well.items["NULL"].value, "-9999.0000");
+
+    let wrapped = WriteOptions { wrap: true, ..Default::default() };
+    let mut out = Vec::new();
+    write_las(&las, &mut out, &wrapped).expect("Failed to write LAS");
+    let text = String::from_utf8(out).unwrap();
+    assert!(text.contains("WRAP") && text.contains("YES"));
+    let data = text.split("~A").nth(1).unwrap();
+    // The index value alone on one line, DT on the next.
+    assert_eq!(data.lines().skip(1).count(), 2 * las.data.nrows());
+    assert!(data.lines().all(|line| line.len() <= 80));
+
+    let invalid = WriteOptions { version: LasVersion::V3, wrap: true, ..Default::default() };
+    assert!(write_las(&las, Vec::new(), &invalid).is_err());
+}
+
+#[test]
+fn test_null_and_token_error_policies() {
+    use _lasio_rs::reader::{parse_las_from_bytes_with, NullPolicy, ReadOptions, TokenErrors};
+    use _lasio_rs::LasError;
+
+    let text = "~Well\n NULL. -999.25 :\n~Curve\n DEPT.M :\n GR.GAPI :\n RHOB.G/C3 :\n~A\n\
+                1 -999.25 2.1\n2 -9999 abc\n";
+
+    let las = parse_las_from_bytes_with(text.as_bytes(), &ReadOptions::default()).expect("Failed to parse LAS");
+    assert!(las.data[[0, 1]].is_nan());
+    assert_eq!(las.data[[1, 1]], -9999.0);
+    // The bad token does not shift RHOB out of its column.
+    assert!(las.data[[1, 2]].is_nan());
+
+    let keep = ReadOptions { nulls: NullPolicy::Keep, ..Default::default() };
+    let las = parse_las_from_bytes_with(text.as_bytes(), &keep).expect("Failed to parse LAS");
+    assert_eq!(las.data[[0, 1]], -999.25);
+
+    let extra = ReadOptions { nulls: NullPolicy::Values(vec![-9999.0]), ..Default::default() };
+    let las = parse_las_from_bytes_with(text.as_bytes(), &extra).expect("Failed to parse LAS");
+    assert!(las.data[[0, 1]].is_nan() && las.data[[1, 1]].is_nan());
+
+    let strict = ReadOptions { errors: TokenErrors::Raise, ..Default::default() };
+    match parse_las_from_bytes_with(text.as_bytes(), &strict) {
+        Err(LasError::InvalidValue { row, column, token }) => assert_eq!((row, column, token.as_str()), (1, 2, "abc")),
+        other => panic!("expected an invalid value error, got {:?}", other.map(|las| las.data)),
+    }
+}
+
+#[test]
+fn test_typed_columns() {
+    use _lasio_rs::arrow_export::to_record_batch;
+    use _lasio_rs::reader::{parse_las_from_bytes_with, ReadOptions};
+    use _lasio_rs::{Column, DType};
+    use arrow::array::Array;
+    use arrow::datatypes::DataType;
+    use std::collections::HashMap;
+    use std::sync::Arc;
+
+    let text = "~Version\n VERS. 3.0 :\n WRAP. NO :\n DLM . COMMA :\n~Well\n NULL. -999.25 :\n\
+                ~Log_Definition\n DEPT.M : Depth {F10.2}\n FACIES. : Facies code {I}\n LITH. : Lithology {S}\n GR.GAPI : Gamma ray\n\
+                ~Log_Data | Log_Definition\n\
+                100.0, 3, \"fine sand\", 45.5\n100.5, -999.25, shale, 80.25\n101.0, 3, \"fine sand\", -999.25\n";
+
+    let las = parse_las_from_bytes_with(text.as_bytes(), &ReadOptions::default()).expect("Failed to parse LAS");
+    assert_eq!(las.data.dim(), (3, 2));
+    assert_eq!(las.curve_data("GR").unwrap()[1], 80.25);
+    assert!(las.curve_data("GR").unwrap()[2].is_nan());
+    match &las.columns["FACIES"] {
+        Column::Int64 { values, valid } => {
+            assert_eq!((values[0], values[2]), (3, 3));
+            assert_eq!(valid, &vec![true, false, true]);
+        }
+        other => panic!("expected an int64 column, got {:?}", other.dtype()),
+    }
+    match &las.columns["LITH"] {
+        Column::Text(text) => {
+            assert_eq!((text.get(0), text.get(1), text.get(2)), (Some("fine sand"), Some("shale"), Some("fine sand")));
+            assert_eq!(text.values.len(), 2);
+        }
+        other => panic!("expected a text column, got {:?}", other.dtype()),
+    }
+
+    let batch = to_record_batch(&Arc::new(las)).expect("Failed to export");
+    let types: Vec<DataType> = batch.schema().fields().iter().map(|f| f.data_type().clone()).collect();
+    assert_eq!(types[0], DataType::Float64);
+    assert_eq!(types[1], DataType::Int64);
+    assert!(matches!(types[2], DataType::Dictionary(_, _)));
+    assert_eq!(batch.column(1).null_count(), 1);
+
+    let options = ReadOptions {
+        dtype: DType::Float32,
+        dtypes: HashMap::from([("FACIES".to_string(), DType::Float64)]),
+        ..Default::default()
+    };
+    let las = parse_las_from_bytes_with(text.as_bytes(), &options).expect("Failed to parse LAS");
+    assert_eq!(las.data.dim(), (3, 1));
+    assert!(las.curve_data("FACIES").unwrap()[1].is_nan());
+    assert!(matches!(&las.columns["GR"], Column::Float32(values) if values[1] == 80.25));
+    assert!(matches!(las.columns["LITH"], Column::Text(_)));
+}
+
+#[test]
+fn test_parse_cache() {
+    use _lasio_rs::cache::{self, CacheOptions, CacheValidation};
+    use _lasio_rs::reader::{read_las_file_with, ReadOptions};
+    use _lasio_rs::DType;
+    use std::collections::HashMap;
+
+    let dir = std::env::temp_dir().join("lasio_rs_parse_cache");
+    let path = std::env::temp_dir().join("lasio_rs_cached.las");
+    let text = "~Well\n NULL. -999.25 :\n~Curve\n DEPT.M :\n GR.GAPI :\n LITH. :\n~A\n\
+                1.0 10.5 sand\n1.5 -999.25 shale\n2.0 12.0 sand\n";
+    std::fs::write(&path, text).unwrap();
+    cache::clear(&dir).ok();
+
+    let options = ReadOptions {
+        dtypes: HashMap::from([("LITH".to_string(), DType::Text)]),
+        cache: Some(CacheOptions { validation: CacheValidation::Hash, ..CacheOptions::new(&dir) }),
+        ..Default::default()
+    };
+    let parsed = read_las_file_with(&path, &options).expect("Failed to read LAS");
+    let entries = || std::fs::read_dir(&dir).map_or(0, |d| d.count());
+    assert_eq!(entries(), 1);
+    let cached = read_las_file_with(&path, &options).expect("Failed to read cached LAS");
+    assert_eq!(cached.curves.items, parsed.curves.items);
+    assert_eq!(cached.well.items, parsed.well.items);
+    assert_eq!(format!("{:?}", cached.data), format!("{:?}", parsed.data));
+    assert_eq!(cached.columns, parsed.columns);
+
+    // Other options get their own entry; a changed file is parsed again.
+    let plain = ReadOptions { cache: options.cache.clone(), ..Default::default() };
+    read_las_file_with(&path, &plain).expect("Failed to read LAS");
+    assert_eq!(entries(), 2);
+    std::fs::write(&path, format!("{}2.5 13.0 silt\n", text)).unwrap();
+    let changed = read_las_file_with(&path, &options).expect("Failed to read LAS");
+    assert_eq!(changed.data.nrows(), 4);
+
+    // A zero budget evicts everything.
+    cache::evict(&dir, 0);
+    assert_eq!(entries(), 0);
+    std::fs::remove_file(&path).ok();
+}
+
+#[test]
+fn test_parse_cache_concurrent_stores() {
+    use _lasio_rs::batch::read_many;
+    use _lasio_rs::cache::{clear, CacheOptions};
+    use _lasio_rs::reader::ReadOptions;
+
+    let dir = std::env::temp_dir().join(format!("lasio_rs_cache_race_{}", std::process::id()));
+    let options = ReadOptions { cache: Some(CacheOptions::new(&dir)), ..Default::default() };
+    // The same file many times at once: every thread may store the entry.
+    let paths = vec![std::path::PathBuf::from("sample.las"); 32];
+    for read in read_many(&paths, &options, Some(8)).unwrap() {
+        assert_eq!(read.expect("Failed to read LAS").data.dim(), (3, 2));
+    }
+    let names: Vec<String> =
+        std::fs::read_dir(&dir).unwrap().map(|e| e.unwrap().file_name().to_string_lossy().into_owned()).collect();
+    assert_eq!(names.len(), 1, "{:?}", names);
+    assert!(names[0].ends_with(".lascache"));
+    for read in read_many(&paths[..2], &options, Some(2)).unwrap() {
+        assert_eq!(read.expect("Failed to read cached LAS").data.dim(), (3, 2));
+    }
+
+    // Temporary files left by a writer that died are swept by `clear`;
+    // other files in the directory are not touched.
+    std::fs::write(dir.join("0123.lascache.999.0.tmp"), b"partial").unwrap();
+    std::fs::write(dir.join("notes.tmp"), b"kept").unwrap();
+    clear(&dir).unwrap();
+    let names: Vec<String> =
+        std::fs::read_dir(&dir).unwrap().map(|e| e.unwrap().file_name().to_string_lossy().into_owned()).collect();
+    assert_eq!(names, ["notes.tmp"]);
+    std::fs::remove_dir_all(&dir).ok();
+}
+
+#[test]
+fn test_forged_compressed_sizes() {
+    use _lasio_rs::compression::decompress;
+    use std::io::Write;
+
+    let mut gzip = flate2::write::GzEncoder::new(Vec::new(), flate2::Compression::default());
+    gzip.write_all(b"~Version\n VERS. 2.0 :\n").unwrap();
+    let mut gzip = gzip.finish().unwrap();
+    // ISIZE, the last four bytes, claims a 4 GiB output.
+    let at = gzip.len() - 4;
+    gzip[at..].copy_from_slice(&u32::MAX.to_le_bytes());
+    assert!(decompress(&gzip).is_err());
+
+    // A truncated stream ending in a forged trailer.
+    let mut truncated = gzip[..10].to_vec();
+    truncated.extend_from_slice(&[0x00; 86]);
+    truncated.extend_from_slice(&u32::MAX.to_le_bytes());
+    assert_eq!(truncated.len(), 100);
+    assert!(decompress(&truncated).is_err());
+}
+
+#[test]
+fn test_compressed_inputs() {
+    use _lasio_rs::reader::{parse_las_from_bytes, read_las_file};
+    use _lasio_rs::stream::AsciiChunks;
+    use std::io::Write;
+
+    let text = std::fs::read("sample.las").expect("Failed to read sample.las");
+    let plain = parse_las_from_bytes(&text).expect("Failed to parse LAS");
+
+    let mut gzip = flate2::write::GzEncoder::new(Vec::new(), flate2::Compression::default());
+    gzip.write_all(&text).unwrap();
+    let gzip = gzip.finish().unwrap();
+    let zstd = zstd::stream::encode_all(&text[..], 0).unwrap();
+    let mut zip = zip::ZipWriter::new(std::io::Cursor::new(Vec::new()));
+    zip.start_file("readme.txt", Default::default()).unwrap();
+    zip.write_all(b"not a LAS file").unwrap();
+    zip.start_file("well/sample.LAS", Default::default()).unwrap();
+    zip.write_all(&text).unwrap();
+    let zip = zip.finish().unwrap().into_inner();
+
+    for bytes in [&gzip, &zstd, &zip] {
+        let las = parse_las_from_bytes(bytes).expect("Failed to parse compressed LAS");
+        assert_eq!(las.curves.items, plain.curves.items);
+        assert_eq!(format!("{:?}", las.data), format!("{:?}", plain.data));
+    }
+
+    let path = std::env::temp_dir().join("lasio_rs_compressed.las.gz");
+    std::fs::write(&path, &gzip).unwrap();
+    let las = read_las_file(&path).expect("Failed to read compressed LAS");
+    assert_eq!(las.data.dim(), plain.data.dim());
+    let rows: usize = AsciiChunks::open(&path, 2, &Default::default())
+        .expect("Failed to open compressed LAS")
+        .map(|block| block.expect("Failed to parse block").nrows())
+        .sum();
+    assert_eq!(rows, plain.data.nrows());
+    std::fs::remove_file(&path).ok();
+}
+
+#[test]
+fn test_wrapped_data() {
+    use _lasio_rs::reader::{parse_las_from_bytes, parse_las_from_bytes_with, read_las_file, ReadOptions};
+    use _lasio_rs::stream::AsciiChunks;
+    use _lasio_rs::writer::{write_las, WriteOptions};
+    use std::fmt::Write as _;
+
+    // Enough steps for the section to be split across many ranges.
+    let names = ["DEPT", "GR", "RHOB", "NPHI", "DT", "CALI", "SP"];
+    let mut header = String::from("~Curve\n");
+    for name in names {
+        writeln!(header, " {name}. :").unwrap();
+    }
+    let mut flat = format!("~Version\n VERS. 2.0 :\n WRAP. NO :\n{header}~A\n");
+    let mut wrapped = format!("~Version\n VERS. 2.0 :\n WRAP. YES :\n{header}~A\n");
+    for i in 0..20_000 {
+        let values: Vec<String> = (1..names.len()).map(|c| format!("{:.3}", i as f64 + c as f64 / 10.0)).collect();
+        let depth = 1000.0 + i as f64 * 0.5;
+        writeln!(flat, "{depth:.1} {}", values.join(" ")).unwrap();
+        writeln!(wrapped, "{depth:.1}\n {}\n {}", values[..4].join(" "), values[4..].join(" ")).unwrap();
+    }
+
+    let plain = parse_las_from_bytes(flat.as_bytes()).expect("Failed to parse LAS");
+    let las = parse_las_from_bytes(wrapped.as_bytes()).expect("Failed to parse wrapped LAS");
+    assert_eq!(las.data.dim(), (20_000, names.len()));
+    assert_eq!(format!("{:?}", las.data), format!("{:?}", plain.data));
+
+    let rows = ReadOptions { rows: Some(15_000..15_002), curves: Some(vec!["SP".to_string()]), ..Default::default() };
+    let window = parse_las_from_bytes_with(wrapped.as_bytes(), &rows).expect("Failed to parse wrapped LAS");
+    assert_eq!(window.curve_data("SP").unwrap().to_vec(), [15_000.6, 15_001.6]);
+    let depth = ReadOptions { depth_range: Some((1100.0, 1101.0)), ..Default::default() };
+    let window = parse_las_from_bytes_with(wrapped.as_bytes(), &depth).expect("Failed to parse wrapped LAS");
+    assert_eq!(window.curve_data("DEPT").unwrap().to_vec(), [1100.0, 1100.5, 1101.0]);
+
+    let mut out = Vec::new();
+    write_las(&plain, &mut out, &WriteOptions { wrap: true, ..Default::default() }).expect("Failed to write LAS");
+    let written = parse_las_from_bytes(&out).expect("Failed to parse written LAS");
+    assert_eq!(written.data.dim(), plain.data.dim());
+    assert_eq!(written.curve_data("NPHI").unwrap()[123], plain.curve_data("NPHI").unwrap()[123]);
+
+    let path = std::env::temp_dir().join("lasio_rs_wrapped.las");
+    std::fs::write(&path, &wrapped).unwrap();
+    assert_eq!(read_las_file(&path).expect("Failed to read wrapped LAS").data.dim(), plain.data.dim());
+    let blocks: Vec<_> = AsciiChunks::open(&path, 3_000, &Default::default())
+        .expect("Failed to open wrapped LAS")
+        .map(|block| block.expect("Failed to parse block"))
+        .collect();
+    assert!(blocks.iter().all(|block| block.dim() == (3_000, names.len()) || block.nrows() == 2_000));
+    assert_eq!(blocks[1][[0, 0]], plain.data[[3_000, 0]]);
+    std::fs::remove_file(&path).ok();
+}
+
+#[test]
+fn test_text_encodings() {
+    use _lasio_rs::reader::{parse_las_from_bytes, parse_las_from_bytes_with, read_las_header_with, ReadOptions};
+    use _lasio_rs::stream::AsciiChunks;
+    use _lasio_rs::TextEncoding;
+
+    let text = "~Well\n COMP. Compañía Petrolera: COMPANY\n~Curve\n DEPT.M : Profundidad\n LITH. : Litología {S}\n~A\n\
+                1.0 Arenisca\n2.0 Lutita\n";
+    let latin1: Vec<u8> = text.chars().map(|c| c as u32 as u8).collect();
+    assert!(std::str::from_utf8(&latin1).is_err());
+
+    let las = parse_las_from_bytes(&latin1).expect("Failed to parse Latin-1 LAS");
+    assert_eq!(las.well.items["COMP"].value, "Compañía Petrolera");
+    assert_eq!(las.curves.items["LITH"].descr, "Litología {S}");
+    assert_eq!(las.data.dim(), (2, 1));
+    let utf8 = parse_las_from_bytes(text.as_bytes()).expect("Failed to parse UTF-8 LAS");
+    assert_eq!(utf8.well.items["COMP"].value, "Compañía Petrolera");
+
+    let mut utf16 = vec![0xff, 0xfe];
+    utf16.extend(text.encode_utf16().flat_map(u16::to_le_bytes));
+    let las = parse_las_from_bytes(&utf16).expect("Failed to parse UTF-16 LAS");
+    assert_eq!(las.well.items["COMP"].value, "Compañía Petrolera");
+    assert_eq!(las.curve_data("DEPT").unwrap().to_vec(), [1.0, 2.0]);
+
+    let cp1252 = ReadOptions { encoding: TextEncoding::parse("1252").unwrap(), ..Default::default() };
+    let las = parse_las_from_bytes_with(&latin1, &cp1252).expect("Failed to parse Latin-1 LAS");
+    assert_eq!(las.curves.items["DEPT"].descr, "Profundidad");
+    assert!(TextEncoding::parse("klingon").is_err());
+
+    let path = std::env::temp_dir().join("lasio_rs_utf16.las");
+    std::fs::write(&path, &utf16).unwrap();
+    let header = read_las_header_with(&path, TextEncoding::Auto).expect("Failed to read UTF-16 header");
+    assert_eq!(header.well.items["COMP"].value, "Compañía Petrolera");
+    let options = ReadOptions { curves: Some(vec!["DEPT".to_string()]), ..Default::default() };
+    let blocks: Vec<_> = AsciiChunks::open(&path, 1, &options)
+        .expect("Failed to open UTF-16 LAS")
+        .map(|block| block.expect("Failed to parse block"))
+        .collect();
+    assert_eq!(blocks.len(), 2);
+    assert_eq!(blocks[1][[0, 0]], 2.0);
+    std::fs::remove_file(&path).ok();
+}
+
+#[test]
+fn test_synthetic_files() {
+    use _lasio_rs::reader::parse_las_from_bytes;
+    use _lasio_rs::synthetic::{synthetic_las, SyntheticSpec};
+
+    let spec = SyntheticSpec { rows: 2_000, curves: 12, null_density: 0.1, seed: 7, ..Default::default() };
+    let bytes = synthetic_las(&spec);
+    assert_eq!(bytes, synthetic_las(&spec));
+    assert_ne!(bytes, synthetic_las(&SyntheticSpec { seed: 8, ..spec }));
+
+    let las = parse_las_from_bytes(&bytes).expect("Failed to parse synthetic LAS");
+    assert_eq!(las.data.dim(), (2_000, 12));
+    let nulls = las.data.iter().filter(|v| v.is_nan()).count() as f64 / (2_000.0 * 11.0);
+    assert!((nulls - 0.1).abs() < 0.02);
+
+    let wrapped = parse_las_from_bytes(&synthetic_las(&SyntheticSpec { wrap: true, ..spec }))
+        .expect("Failed to parse wrapped synthetic LAS");
+    assert_eq!(format!("{:?}", wrapped.data), format!("{:?}", las.data));
+}
+
+#[test]
+fn test_resample_and_align() {
+    use _lasio_rs::reader::{parse_las_from_bytes, read_las_file};
+    use _lasio_rs::resample::{align, common_range, depth_grid, index_range, resample, Interpolation};
+
+    // DEPT 1670, 1669.875, 1669.75 with DT 123.45, NULL, 124.50.
+    let las = read_las_file("sample.las").expect("Failed to read LAS");
+    let range = index_range(&las).unwrap();
+    let grid = depth_grid(range, 0.0625, None, None).unwrap();
+    assert_eq!(grid.len(), 5);
+
+    let linear = resample(&las, &grid, Interpolation::Linear).unwrap();
+    assert_eq!(linear.curve_data("DEPT").unwrap().to_vec(), grid);
+    let dt = linear.curve_data("DT").unwrap();
+    assert_eq!(dt[0], 123.45);
+    // Next to the NULL sample nothing is interpolated.
+    assert!(dt[1].is_nan() && dt[2].is_nan() && dt[3].is_nan());
+    assert_eq!(dt[4], 124.50);
+    assert_eq!(linear.well.items["STEP"].value, "-0.0625");
+
+    let nearest = resample(&las, &grid, Interpolation::Nearest).unwrap();
+    assert_eq!(nearest.curve_data("DT").unwrap()[1], 123.45);
+
+    let other = parse_las_from_bytes(b"~Curve\n DEPT.M :\n GR.GAPI :\n~A\n1669.5 10\n1669.75 20\n1670.0 30\n")
+        .expect("Failed to parse LAS");
+    let wells = [&las, &other];
+    let grid = depth_grid(common_range(&wells).unwrap(), 0.25, None, None).unwrap();
+    assert_eq!(grid, [1669.5, 1669.75, 1670.0]);
+    let curves = vec!["DT".to_string(), "GR".to_string()];
+    let stacked = align(&wells, &curves, &grid, Interpolation::Linear).unwrap();
+    assert_eq!(stacked.dim(), (2, 3, 2));
+    // The first well does not reach 1669.5 and has no GR.
+    assert!(stacked[[0, 0, 0]].is_nan() && stacked[[0, 2, 1]].is_nan());
+    assert_eq!(stacked[[0, 2, 0]], 123.45);
+    assert_eq!(stacked[[1, 1, 1]], 20.0);
+    assert!(stacked[[1, 1, 0]].is_nan());
+}
+
+#[test]
+fn test_resample_align_and_merge_float32() {
+    use _lasio_rs::merge::{merge, Overlap};
+    use _lasio_rs::reader::{parse_las_from_bytes_with, ReadOptions};
+    use _lasio_rs::resample::{align, depth_grid, index_range, resample, Interpolation};
+    use _lasio_rs::{Column, DType};
+
+    let options = ReadOptions { dtype: DType::Float32, ..Default::default() };
+    let las = parse_las_from_bytes_with(b"~Curve\n DEPT.M :\n GR.GAPI :\n~A\n100.0 10\n100.5 20\n101.0 30\n", &options)
+        .expect("Failed to parse LAS");
+    assert!(matches!(las.columns["DEPT"], Column::Float32(_)));
+    assert_eq!(index_range(&las), Some((100.0, 101.0)));
+
+    let grid = depth_grid((100.0, 101.0), 0.25, None, None).unwrap();
+    let resampled = resample(&las, &grid, Interpolation::Linear).unwrap();
+    assert!(matches!(&resampled.columns["DEPT"], Column::Float32(values) if values.to_vec() == [100.0, 100.25, 100.5, 100.75, 101.0]));
+    assert!(matches!(&resampled.columns["GR"], Column::Float32(values) if values[1] == 15.0));
+    assert_eq!(resampled.well.items["STEP"].value, "0.25");
+
+    let stacked = align(&[&las], &["GR".to_string()], &grid, Interpolation::Linear).unwrap();
+    assert_eq!(stacked.iter().copied().collect::<Vec<_>>(), [10.0, 15.0, 20.0, 25.0, 30.0]);
+
+    let later = parse_las_from_bytes_with(b"~Curve\n DEPT.M :\n GR.GAPI :\n~A\n101.0 31\n101.5 41\n", &options)
+        .expect("Failed to parse LAS");
+    let merged = merge(&[&las, &later], Overlap::PreferFirst).unwrap();
+    assert_eq!(merged.curve_data("DEPT").unwrap().to_vec(), [100.0, 100.5, 101.0, 101.5]);
+    assert!(matches!(&merged.columns["GR"], Column::Float32(values) if values.to_vec() == [10.0, 20.0, 30.0, 41.0]));
+}
+
+#[test]
+fn test_merge_runs() {
+    use _lasio_rs::merge::{merge, Overlap};
+    use _lasio_rs::reader::parse_las_from_bytes;
+
+    let first = parse_las_from_bytes(b"~Well\n NULL. -999.25 :\n~Curve\n DEPT.M :\n GR.GAPI :\n~A\n100.0 10\n100.5 20\n101.0 30\n")
+        .expect("Failed to parse LAS");
+    let second = parse_las_from_bytes(
+        b"~Well\n NULL. -999.25 :\n WELL. W-1 :\n~Curve\n DEPT.M :\n GR.GAPI :\n RHOB.G/C3 :\n~A\n100.5 21 2.1\n101.0 -999.25 2.2\n101.5 41 2.3\n",
+    )
+    .expect("Failed to parse LAS");
+    let runs = [&first, &second];
+
+    let merged = merge(&runs, Overlap::PreferLast).unwrap();
+    assert_eq!(merged.curves.items.keys().collect::<Vec<_>>(), ["DEPT", "GR", "RHOB"]);
+    assert_eq!(merged.curve_data("DEPT").unwrap().to_vec(), [100.0, 100.5, 101.0, 101.5]);
+    // A NULL in the later run does not replace the earlier value.
+    assert_eq!(merged.curve_data("GR").unwrap().to_vec(), [10.0, 21.0, 30.0, 41.0]);
+    let rhob = merged.curve_data("RHOB").unwrap();
+    assert!(rhob[0].is_nan());
+    assert_eq!(rhob[3], 2.3);
+    assert_eq!(merged.well.items["STRT"].value, "100");
+    assert_eq!(merged.well.items["STOP"].value, "101.5");
+    assert_eq!(merged.well.items["STEP"].value, "0.5");
+    assert_eq!(merged.well.items["WELL"].value, "W-1");
+
+    let preferred = merge(&runs, Overlap::PreferFirst).unwrap();
+    assert_eq!(preferred.curve_data("GR").unwrap()[1], 20.0);
+    let averaged = merge(&runs, Overlap::Average).unwrap();
+    assert_eq!(averaged.curve_data("GR").unwrap().to_vec(), [10.0, 20.5, 30.0, 41.0]);
+    assert!(merge(&[], Overlap::PreferLast).is_err());
+}
+
+#[test]
+fn test_validate() {
+    use _lasio_rs::validate::{validate, validate_bytes, IssueKind};
+    use std::path::PathBuf;
+
+    let report = validate_bytes(
+        b"~Version\n VERS. 2.0 :\n WRAP. NO :\n~Well\n STRT.M 100.0 :\n STOP.M 103.0 :\n STEP.M 1.0 :\n NULL. -999.25 :\n\
+          ~Curve\n DEPT.M :\n GR.GAPI :\n GR.GAPI :\n~A\n100.0 10 11\n101.0 abc 12\n101.5 13\n101.0 14 15\n",
+    );
+    let found: Vec<(&str, Option<usize>)> = report.issues.iter().map(|i| (i.kind.name(), i.line)).collect();
+    assert_eq!(
+        found,
+        [
+            ("header_mismatch", Some(6)),
+            ("duplicate_mnemonic", Some(12)),
+            ("column_count", Some(14)),
+            ("invalid_value", Some(15)),
+            ("step_mismatch", Some(16)),
+            ("ragged_row", Some(16)),
+            ("non_monotonic_depth", Some(17)),
+        ]
+    );
+    assert_eq!(report.rows, 4);
+
+    let wrapped = validate_bytes(b"~Version\n WRAP. YES :\n~Curve\n DEPT.M :\n A. :\n B. :\n~A\n1.0\n 10 20\n2.0\n 30\n");
+    assert_eq!(wrapped.issues.iter().map(|i| i.kind).collect::<Vec<_>>(), [IssueKind::IncompleteRecord]);
+    assert_eq!(wrapped.rows, 2);
+
+    let reports = validate(&[PathBuf::from("sample.las"), PathBuf::from("missing.las")], Some(2)).unwrap();
+    assert!(reports[0].is_valid(), "{:?}", reports[0].issues);
+    assert_eq!(reports[0].rows, 3);
+    assert_eq!(reports[1].issues[0].kind, IssueKind::Unreadable);
+}
+
+#[test]
+fn test_read_stats() {
+    use _lasio_rs::reader::{read_las_file_with, ReadOptions};
+    use _lasio_rs::stats::{Phase, ReadStats};
+    use std::sync::Arc;
+
+    let options = ReadOptions { stats: Some(Arc::new(ReadStats::new())), ..Default::default() };
+    read_las_file_with("sample.las", &options).expect("Failed to read LAS");
+    let stats = options.stats.as_deref().unwrap();
+    let phases = stats.phases();
+    assert_eq!(
+        phases.iter().map(|p| p.phase).collect::<Vec<_>>(),
+        [Phase::Open, Phase::Decode, Phase::Headers, Phase::Split, Phase::Parse, Phase::Assemble]
+    );
+    assert_eq!(phases[0].bytes, std::fs::metadata("sample.las").unwrap().len() as usize);
+    assert_eq!(phases[4].rows, 3);
+    assert_eq!(phases[5].bytes, 3 * 2 * 8);
+    assert!(stats.chunks() >= 1);
+    assert!(stats.seconds() >= 0.0);
+}
+
+#[cfg(feature = "convert")]
+#[test]
+fn test_convert_streams_formats() {
+    use _lasio_rs::convert::{convert_file, output_path, Format};
+    use _lasio_rs::reader::ReadOptions;
+    use std::path::Path;
+
+    let mut csv = Vec::new();
+    let rows = convert_file(Path::new("sample.las"), &mut csv, Format::Csv, 2, &ReadOptions::default()).unwrap();
+    assert_eq!(rows, 3);
+    assert_eq!(String::from_utf8(csv).unwrap(), "DEPT,DT\n1670.0,123.45\n1669.875,\n1669.75,124.5\n");
+
+    let mut ndjson = Vec::new();
+    let options = ReadOptions { curves: Some(vec!["DT".to_string()]), ..Default::default() };
+    convert_file(Path::new("sample.las"), &mut ndjson, Format::Ndjson, 10, &options).unwrap();
+    assert_eq!(String::from_utf8(ndjson).unwrap(), "{\"DT\":123.45}\n{}\n{\"DT\":124.5}\n");
+
+    let mut ipc = Vec::new();
+    convert_file(Path::new("sample.las"), &mut ipc, Format::Arrow, 10, &ReadOptions::default()).unwrap();
+    assert!(ipc.starts_with(b"ARROW1"));
+
+    assert_eq!(Format::parse("jsonl").unwrap(), Format::Ndjson);
+    assert!(Format::parse("xlsx").is_err());
+    let out = output_path(Path::new("logs/a/well.LAS.gz"), Path::new("logs"), Path::new("out"), Format::Parquet);
+    assert_eq!(out, Path::new("out/a/well.parquet"));
+}
+
+#[cfg(feature = "convert")]
+#[test]
+fn test_convert_files_with_clashing_outputs() {
+    use _lasio_rs::convert::{convert_files, Format};
+    use _lasio_rs::reader::ReadOptions;
+    use std::io::Write;
+
+    let root = std::env::temp_dir().join(format!("lasio_rs_clash_{}", std::process::id()));
+    let (logs, out) = (root.join("logs"), root.join("out"));
+    std::fs::create_dir_all(&logs).unwrap();
+    std::fs::copy("sample.las", logs.join("a.las")).unwrap();
+    let mut gzip = flate2::write::GzEncoder::new(Vec::new(), flate2::Compression::default());
+    gzip.write_all(b"not a LAS file").unwrap();
+    std::fs::write(logs.join("a.las.gz"), gzip.finish().unwrap()).unwrap();
+
+    let paths = [logs.join("a.las"), logs.join("a.las"), logs.join("a.las.gz")];
+    let converted = convert_files(&paths, &out, Format::Csv, 10, &ReadOptions::default(), Some(2)).unwrap();
+    assert_eq!(converted.len(), 2);
+    assert_eq!(converted[0].output, Some(out.join("a.csv")));
+    assert_eq!(converted[0].rows, 3);
+    assert_eq!(converted[1].path, logs.join("a.las.gz"));
+    assert!(converted[1].output.is_none() && converted[1].error.is_some());
+    // The clashing input neither overwrote nor removed the first output.
+    assert!(std::fs::read_to_string(out.join("a.csv")).unwrap().starts_with("DEPT,DT\n"));
+    std::fs::remove_dir_all(&root).ok();
+}
+
+#[test]
+fn test_las2_titles_with_underscores() {
+    use _lasio_rs::reader::parse_las_from_bytes;
+
+    let text = "~Version_Information\n VERS. 2.0 :\n WRAP. NO :\n~Well_Information\n NULL. -999.25 :\n WELL. A-1 :\n\
+                ~Curve_Information\n DEPT.M :\n GR.GAPI :\n~Parameter_Information\n BHT.DEGC 35.0 :\n~Other_Information\n note\n\
+                ~ASCII_Log_Data\n100.0 45.5\n100.5 -999.25\n";
+    let las = parse_las_from_bytes(text.as_bytes()).expect("Failed to parse LAS");
+    assert_eq!(las.version.items["VERS"].value, "2.0");
+    assert_eq!(las.well.items["WELL"].value, "A-1");
+    assert_eq!(las.curves.items.keys().collect::<Vec<_>>(), ["DEPT", "GR"]);
+    assert_eq!(las.params.items["BHT"].value, "35.0");
+    assert_eq!(las.other.trim(), "note");
+    assert_eq!(las.data.dim(), (2, 2));
+
+    // The same titles in a LAS 3.0 file are still not groups, while a
+    // standard group (`Core_*`) is skipped in a LAS 2.0 file too.
+    let las3 = text.replace("VERS. 2.0", "VERS. 3.0").replace("~Other_Information\n note\n", "~Core_Parameter\n TOP.M 5 :\n");
+    let las = parse_las_from_bytes(las3.as_bytes()).expect("Failed to parse LAS");
+    assert_eq!(las.curves.items.len(), 2);
+    assert!(!las.params.items.contains_key("TOP"));
+    assert_eq!(las.data.dim(), (2, 2));
 }
@@ -0,0 +1,195 @@
+"""Assertions on the Python API; run with ``pytest tests/test_api.py``."""
+
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import lasio_rs
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample.las")
+
+
+def test_data_is_read_only_view():
+    las = lasio_rs.read(SAMPLE)
+    data = las.data
+    assert data.base is las._rust
+    assert data.flags.f_contiguous
+    assert not data.flags.writeable
+    with pytest.raises(ValueError):
+        data[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        data.setflags(write=True)
+
+    dt = las.curves["DT"].data
+    assert dt.base is las._rust
+    assert not dt.flags.writeable
+    assert np.shares_memory(dt, data)
+    with pytest.raises(ValueError):
+        dt[0] = 1.0
+
+    # Copies are ordinary writable arrays.
+    copy = data.copy()
+    copy[0, 0] = 1.0
+    assert las.data[0, 0] == 1670.0
+
+
+def test_section_items_mapping():
+    las = lasio_rs.read(SAMPLE)
+    assert isinstance(las.well, lasio_rs.SectionItems)
+    assert las.well.keys() == ["STRT", "STOP", "STEP", "NULL"]
+    assert list(las.well) == las.well.keys()
+    assert len(las.well) == 4
+    assert "NULL" in las.well and "WELL" not in las.well
+    assert [mnemonic for mnemonic, _ in las.well.items()] == las.well.keys()
+    assert [item.mnemonic for item in las.well.values()] == las.well.keys()
+    assert las.well.get("WELL") is None
+    assert las.well.get("WELL", "n/a") == "n/a"
+    with pytest.raises(KeyError):
+        las.well["WELL"]
+    with pytest.raises(KeyError):
+        las.curves["GR"]
+
+    null = las.well["NULL"]
+    assert isinstance(null, lasio_rs.HeaderItem)
+    assert (null.mnemonic, null.unit, null.value, null.descr) == ("NULL", "", "-999.25", "Null Value")
+    assert las.well["STRT"].unit == "M"
+    assert las.version["VERS"].value == "2.0"
+
+
+def test_curve_items_are_header_items_with_data_views():
+    las = lasio_rs.read(SAMPLE)
+    assert las.curves.keys() == ["DEPT", "DT"]
+    curve = las.curves["DT"]
+    assert isinstance(curve, lasio_rs.CurveItem)
+    assert isinstance(curve, lasio_rs.HeaderItem)
+    assert (curve.mnemonic, curve.unit, curve.descr) == ("DT", "US/M", "2  SONIC TRANSIT TIME")
+    assert len(curve) == 3
+    assert curve.data.base is las._rust
+    assert np.shares_memory(curve.data, las.data)
+    np.testing.assert_array_equal(curve.data, [123.45, np.nan, 124.50])
+    assert curve[0] == 123.45
+    np.testing.assert_array_equal(las["DT"], curve.data)
+    assert not hasattr(las, "json_headers")
+
+
+@pytest.fixture
+def slow_spawn(monkeypatch):
+    """Delay every async parse and record how many run at once."""
+    spawn = lasio_rs.las._rust_spawn_read
+    lock = threading.Lock()
+    counts = {"running": 0, "peak": 0}
+
+    def counting_spawn(path, done, *args):
+        with lock:
+            counts["running"] += 1
+            counts["peak"] = max(counts["peak"], counts["running"])
+
+        def finish(item):
+            time.sleep(0.05)
+            with lock:
+                counts["running"] -= 1
+            done(item)
+
+        spawn(path, finish, *args)
+
+    monkeypatch.setattr(lasio_rs.las, "_rust_spawn_read", counting_spawn)
+    yield counts
+    lasio_rs.set_async_limit(os.cpu_count() or 4)
+
+
+def test_read_many_async_keeps_order_and_failures():
+    missing = SAMPLE + ".missing"
+    items = asyncio.run(lasio_rs.read_many_async([SAMPLE, missing, SAMPLE], curves=["DT"]))
+    assert len(items) == 3
+    assert isinstance(items[0], lasio_rs.LASFile) and isinstance(items[2], lasio_rs.LASFile)
+    assert items[0].curves.keys() == ["DT"]
+    assert isinstance(items[1], OSError)
+
+    las = asyncio.run(lasio_rs.read_async(SAMPLE))
+    np.testing.assert_array_equal(las.data, lasio_rs.read(SAMPLE).data)
+    with pytest.raises(OSError):
+        asyncio.run(lasio_rs.read_async(missing))
+
+
+def test_async_limit_bounds_concurrent_parses(slow_spawn):
+    lasio_rs.set_async_limit(2)
+    items = asyncio.run(lasio_rs.read_many_async([SAMPLE] * 6))
+    assert all(isinstance(item, lasio_rs.LASFile) for item in items)
+    assert slow_spawn["peak"] == 2
+    with pytest.raises(ValueError):
+        lasio_rs.set_async_limit(0)
+
+
+def test_cancelled_read_keeps_its_slot(slow_spawn):
+    lasio_rs.set_async_limit(1)
+
+    async def main():
+        first = asyncio.ensure_future(lasio_rs.read_async(SAMPLE))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await lasio_rs.read_async(SAMPLE)
+
+    assert isinstance(asyncio.run(main()), lasio_rs.LASFile)
+    assert slow_spawn["peak"] == 1
+
+
+def test_async_reads_do_not_block_the_loop(slow_spawn):
+    async def main():
+        ticks = 0
+        reads = asyncio.ensure_future(lasio_rs.read_many_async([SAMPLE] * 4))
+        while not reads.done():
+            ticks += 1
+            await asyncio.sleep(0.005)
+        return ticks, reads.result()
+
+    ticks, items = asyncio.run(main())
+    assert ticks > 5
+    assert all(isinstance(item, lasio_rs.LASFile) for item in items)
+
+
+def test_read_async_accepts_in_memory_sources():
+    with open(SAMPLE, "rb") as f:
+        data = f.read()
+    expected = lasio_rs.read(SAMPLE, curves=["DT"]).data
+    for source in (data, memoryview(data), bytearray(data)):
+        las = asyncio.run(lasio_rs.read_async(source, curves=["DT"]))
+        np.testing.assert_array_equal(las.data, expected)
+    with open(SAMPLE, "rb") as f:
+        las = asyncio.run(lasio_rs.read_async(f))
+    assert las.curves.keys() == ["DEPT", "DT"]
+    with pytest.raises(ValueError):
+        asyncio.run(lasio_rs.read_async(data, cache="unused"))
+
+
+def test_to_df_with_duplicate_mnemonics_and_extra_columns():
+    pd = pytest.importorskip("pandas")
+    duplicated = lasio_rs.read(b"~Curve\n DEPT.M :\n GR.GAPI :\n GR.GAPI :\n~A\n100.0 10 11\n100.5 20 21\n")
+    df = duplicated.to_df()
+    assert list(df.columns) == duplicated.curves.keys()
+    assert len(df) == 2
+    np.testing.assert_array_equal(df["DEPT"], [100.0, 100.5])
+
+    extra = lasio_rs.read(b"~Curve\n DEPT.M :\n GR.GAPI :\n~A\n100.0 10 99\n100.5 20 99\n")
+    assert extra.data.shape == (2, 3)
+    df = extra.to_df()
+    assert list(df.columns) == ["DEPT", "GR"]
+    np.testing.assert_array_equal(df["GR"], [10.0, 20.0])
+    assert isinstance(df, pd.DataFrame)
+
+
+def test_merge_paths_then_read(tmp_path):
+    first = tmp_path / "run1.las"
+    second = tmp_path / "run2.las"
+    first.write_bytes(b"~Curve\n DEPT.M :\n GR.GAPI :\n~A\n100.0 10\n100.5 20\n")
+    second.write_bytes(b"~Curve\n DEPT.M :\n GR.GAPI :\n~A\n100.5 21\n101.0 30\n")
+    merged = lasio_rs.merge([first, lasio_rs.read(second)], overlap="prefer_first")
+    np.testing.assert_array_equal(merged["DEPT"], [100.0, 100.5, 101.0])
+    np.testing.assert_array_equal(merged["GR"], [10.0, 20.0, 30.0])
+    # merge() reads paths with read_many; read() is still the module function.
+    assert lasio_rs.read(first).data.shape == (2, 2)
+    with pytest.raises(OSError):
+        lasio_rs.merge([first, tmp_path / "missing.las"])